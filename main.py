@@ -18,11 +18,15 @@ from PyQt5.QtWidgets import (
 )
 from PyQt5.QtGui import QFont
 from PyQt5.QtCore import Qt, QThread, pyqtSignal, QTimer
+import math
 import time
 import tempfile
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
+import numpy as np
 from PIL import Image
-from moviepy.editor import VideoFileClip, concatenate_videoclips
-from natsort import natsorted
+from natsort import natsort_keygen
 
 class DiskScanWorker(QThread):
     progress_signal = pyqtSignal(str)
@@ -40,9 +44,18 @@ class DiskScanWorker(QThread):
         self.total_size = 0
         self.total_count = 0
 
+    STATUS_INTERVAL = 0.5  # 全碟掃描每秒走訪上萬個資料夾，狀態文字最多每秒更新兩次
+    _last_status_ts = 0.0
+
     def stop(self):
         self._is_running = False
 
+    def _emit_scan_status(self, message):
+        now = time.monotonic()
+        if now - self._last_status_ts >= self.STATUS_INTERVAL:
+            self._last_status_ts = now
+            self.progress_signal.emit(message)
+
     def run(self):
         # Scan common caches
         if self.scan_common:
@@ -94,7 +107,7 @@ class DiskScanWorker(QThread):
                 if "$Recycle.Bin" in root or "System Volume Information" in root:
                     continue
                     
-                self.progress_signal.emit(f"掃描大型檔案: {root}")
+                self._emit_scan_status(f"掃描大型檔案: {root}")
                 for file_name in files:
                     file_path = os.path.join(root, file_name)
                     try:
@@ -122,7 +135,7 @@ class DiskScanWorker(QThread):
                 if not self._is_running: break
                 item_path = os.path.join(start_path, item)
                 if os.path.isdir(item_path):
-                    self.progress_signal.emit(f"分析資料夾: {item}")
+                    self._emit_scan_status(f"分析資料夾: {item}")
                     size = self.calculate_folder_size(item_path)
                     if size > 10 * 1024 * 1024:  # Only report folders > 10MB
                         self.item_found_signal.emit({
@@ -192,13 +205,18 @@ class DiskScanWorker(QThread):
         return candidates
 
 from utils import (
-    resize_with_padding, resize_image, Config,
+    resize_with_padding, resize_image, resize_images, iter_resized_images, is_padding_strategy, save_gif,
+    write_gif, optimize_gif, build_file_palette, iter_gif_frames, get_gif_resample_filter, fit_gif_size,
+    compose_grid, get_image_size, convert_image_file, get_image_backends, can_stream_concat, concat_videos_copy,
+    concat_videos_nvenc, concat_videos_qsv, concat_videos_reencode, can_hw_encode, Config,
+    iter_sampled_frames, iter_clip_frames, compress_image_file, scan_file_sizes, write_gif_ffmpeg,
     DragDropListWidget, ImagePreviewGrid, ImageViewerDialog,
     add_watermark, convert_word_to_pdf, convert_pdf_to_word,
     merge_pdfs, get_pdf_info, check_dependencies, get_config_manager,
     convert_image_to_pdf, detect_file_type, ensure_unlocked_pdf,
     PasswordRequiredError, WrongPasswordProvided
 )
+from utils.video_utils import probe_video_info
 from utils.doc_converter import add_text_watermark_to_pdf, add_image_watermark_to_pdf
 from utils.md2docx_converter import MarkdownToDocxConverter
 from utils.modern_style import ModernStyle
@@ -206,6 +224,30 @@ from utils.task_manager import TaskManager, TaskQueueDialog
 from utils.pdf_worker import PDFToolsWorker
 
 
+# 自然排序鍵函數只需建立一次，各排序處共用
+_NAT_KEY = natsort_keygen()
+
+
+class ThrottledProgressMixin:
+    """
+    批次工作執行緒的進度節流
+
+    逐檔更新進度時，最多每 PROGRESS_INTERVAL 秒跨執行緒發出一次訊號，
+    數千個檔案的批次不會塞滿 GUI 事件佇列；100% 一律發出
+    """
+    PROGRESS_INTERVAL = 0.05  # 約 20 Hz
+    _last_progress_ts = 0.0
+
+    def _emit_progress(self, pct, message=None):
+        now = time.monotonic()
+        if pct < 100 and now - self._last_progress_ts < self.PROGRESS_INTERVAL:
+            return
+        self._last_progress_ts = now
+        if message is not None:
+            self.status.emit(message)
+        self.progress.emit(pct)
+
+
 class PasswordPromptCancelled(Exception):
     """User cancelled PDF password entry."""
 
@@ -225,155 +267,177 @@ class VideoMergeWorker(QThread):
         self.is_cancelled = False
 
     def run(self):
+        temp_path = None
         try:
-            self.status.emit("正在載入影片檔案...")
-            self.progress.emit(5)
-
-            clips = []
-            total_files = len(self.files)
-
-            for i, file in enumerate(self.files):
-                if self.is_cancelled:
-                    self.cleanup_clips(clips)
-                    self.finished.emit(False, "操作已取消")
-                    return
-
-                self.status.emit(f"載入影片 {i+1}/{total_files}...")
-                clip = VideoFileClip(file)
-                clips.append(clip)
-                progress_pct = 5 + int((i + 1) / total_files * 25)
-                self.progress.emit(progress_pct)
+            # 合併全部交由 ffmpeg：格式一致時直接複製串流，否則重新編碼；
+            # 影片資訊以 PyAV（或 ffmpeg 檔頭）讀取，不再以 MoviePy 逐一開啟
+            self.status.emit("正在檢查影片格式...")
+            self.progress.emit(2)
+
+            # 先寫入輸出目錄中的暫存檔，完成後再以 os.replace 一次取代，
+            # 取消或失敗時不會留下殘缺的輸出檔
+            base, ext = os.path.splitext(os.path.basename(self.output_path))
+            fd, temp_path = tempfile.mkstemp(prefix=f".{base}.", suffix=ext,
+                                             dir=os.path.dirname(os.path.abspath(self.output_path)))
+            os.close(fd)
+
+            def is_cancelled():
+                return self.is_cancelled
+
+            # 只在百分比改變時才發出訊號，整次合併最多跨執行緒送出約 90 次
+            last_pct = -1
+
+            def on_ffmpeg_progress(fraction):
+                nonlocal last_pct
+                pct = 5 + int(fraction * 90)
+                if pct != last_pct:
+                    last_pct = pct
+                    self.progress.emit(pct)
+
+            merged = False
+            if can_stream_concat(self.files):
+                self.status.emit("影片格式一致，正在直接串接...")
+                self.progress.emit(5)
+                merged = concat_videos_copy(self.files, temp_path, is_cancelled, on_ffmpeg_progress)
+            stream_copied = merged
+
+            # 需要重新編碼時優先使用硬體編碼：ffmpeg NVENC（CUDA 解碼）> Intel QSV > CPU 編碼
+            if not merged and not self.is_cancelled and can_hw_encode("h264_nvenc"):
+                self.status.emit("正在以 NVENC 硬體編碼合併影片...")
+                self.progress.emit(5)
+                merged = concat_videos_nvenc(self.files, temp_path, is_cancelled, on_ffmpeg_progress)
+
+            if not merged and not self.is_cancelled and can_hw_encode("h264_qsv"):
+                self.status.emit("正在以 Intel QSV 硬體編碼合併影片...")
+                self.progress.emit(5)
+                merged = concat_videos_qsv(self.files, temp_path, is_cancelled, on_ffmpeg_progress)
+
+            if not merged and not self.is_cancelled:
+                self.status.emit("正在重新編碼合併影片...")
+                self.progress.emit(5)
+                merged = concat_videos_reencode(self.files, temp_path, is_cancelled, on_ffmpeg_progress)
 
             if self.is_cancelled:
-                self.cleanup_clips(clips)
                 self.finished.emit(False, "操作已取消")
-                return
-
-            self.status.emit("正在合併影片...")
-            self.progress.emit(35)
-
-            final = concatenate_videoclips(clips, method="compose")
-
-            if self.is_cancelled:
-                self.cleanup_clips(clips)
-                final.close()
-                self.finished.emit(False, "操作已取消")
-                return
-
-            self.status.emit("正在輸出影片檔案...")
-
-            # 使用 logger 來追蹤進度
-            def progress_callback(current_frame, total_frames):
-                if self.is_cancelled:
-                    return
-                if total_frames > 0:
-                    progress_pct = 35 + int((current_frame / total_frames) * 60)
-                    self.progress.emit(min(progress_pct, 95))
-
-            final.write_videofile(
-                self.output_path,
-                codec=Config.VIDEO_CODEC,
-                audio_codec=Config.AUDIO_CODEC,
-                logger=None,  # 禁用 moviepy 的內建日誌
-                verbose=False
-            )
-
-            self.cleanup_clips(clips)
-            final.close()
-
-            if self.is_cancelled:
-                self.finished.emit(False, "操作已取消")
-            else:
+            elif merged:
+                os.replace(temp_path, self.output_path)
                 self.progress.emit(100)
-                self.finished.emit(True, f"影片合併完成！\n{self.output_path}")
+                message = f"影片合併完成！\n{self.output_path}"
+                if not stream_copied:
+                    # 重新編碼比直接串接慢得多，提示使用者原因
+                    message += "\n（影片的編碼、解析度或音訊格式不一致，已重新編碼）"
+                self.finished.emit(True, message)
+            else:
+                self.finished.emit(False, "合併失敗：ffmpeg 無法處理這些影片")
 
         except Exception as e:
             self.finished.emit(False, f"合併失敗：{str(e)}")
-
-    def cleanup_clips(self, clips):
-        """清理影片片段"""
-        for clip in clips:
-            try:
-                clip.close()
-            except:
-                pass
+        finally:
+            if temp_path and os.path.exists(temp_path):
+                try:
+                    os.remove(temp_path)
+                except OSError:
+                    pass
 
     def cancel(self):
         """取消操作"""
         self.is_cancelled = True
 
 
-class GifCreationWorker(QThread):
+class ImageSaveWorker(QThread):
+    """圖片儲存工作執行緒（PNG/JPEG 編碼不阻塞介面）"""
+    finished = pyqtSignal(bool, str)
+
+    def __init__(self, image, output_path):
+        super().__init__()
+        self.image = image
+        self.output_path = output_path
+
+    def run(self):
+        try:
+            ext = os.path.splitext(self.output_path)[1].lower()
+            if ext in ('.jpg', '.jpeg'):
+                # 漸進式 JPEG + 最佳化 Huffman 表，4:2:0 色度取樣
+                self.image.save(self.output_path, optimize=True, progressive=True, subsampling="4:2:0")
+            else:
+                self.image.save(self.output_path)
+            self.finished.emit(True, f"拼接完成！\n{self.output_path}")
+        except Exception as e:
+            self.finished.emit(False, f"儲存失敗：{str(e)}")
+
+
+class GifCreationWorker(ThrottledProgressMixin, QThread):
     """GIF 建立工作執行緒"""
     progress = pyqtSignal(int)
     status = pyqtSignal(str)
     finished = pyqtSignal(bool, str)
 
-    def __init__(self, files, output_path, duration, strategy):
+    def __init__(self, files, output_path, duration, strategy, resample=None):
         super().__init__()
         self.files = files
         self.output_path = output_path
         self.duration = duration
         self.strategy = strategy
+        self.resample = resample
         self.is_cancelled = False
 
     def run(self):
         try:
             total = len(self.files)
-            self.status.emit(f"正在載入 {total} 個圖片...")
-            self.progress.emit(5)
-
-            # 載入圖片
-            images = []
-            for i, file in enumerate(self.files):
-                if self.is_cancelled:
-                    self.finished.emit(False, "操作已取消")
-                    return
 
-                self.status.emit(f"載入圖片 {i+1}/{total}...")
-                images.append(Image.open(file))
-                progress_pct = 5 + int((i + 1) / total * 30)
-                self.progress.emit(progress_pct)
+            # 計算統一尺寸（只讀檔頭，不解碼）
+            self.status.emit("計算圖片尺寸...")
+            self.progress.emit(5)
+            sizes = {tuple(get_image_size(f)) for f in self.files}
+            min_w, min_h = map(min, zip(*sizes))
+            frame_w, frame_h = fit_gif_size((min_w, min_h))
+            if (frame_w, frame_h) != (min_w, min_h):
+                self.status.emit(f"影格縮小為 {frame_w}x{frame_h}")
+            elif len(sizes) == 1:
+                # 連拍、螢幕截圖等尺寸一致的圖片，逐張處理時會略過縮放
+                self.status.emit(f"所有圖片皆為 {min_w}x{min_h}，略過縮放")
 
             if self.is_cancelled:
                 self.finished.emit(False, "操作已取消")
                 return
 
-            # 計算統一尺寸
-            self.status.emit("計算圖片尺寸...")
-            self.progress.emit(40)
-
-            min_w = min(img.width for img in images)
-            min_h = min(img.height for img in images)
-
-            # 調整大小
-            frames = []
-            for i, img in enumerate(images):
-                if self.is_cancelled:
-                    self.finished.emit(False, "操作已取消")
-                    return
-
-                self.status.emit(f"處理圖片 {i+1}/{total}...")
-                resized = resize_image(img, (min_w, min_h), self.strategy)
-                frames.append(resized)
-                progress_pct = 40 + int((i + 1) / total * 40)
-                self.progress.emit(progress_pct)
+            def tracked_frames(frames):
+                for i, frame in enumerate(frames):
+                    if self.is_cancelled:
+                        frames.close()
+                        return
+                    self._emit_progress(15 + int((i + 1) / total * 80), f"處理圖片 {i+1}/{total}...")
+                    yield frame
+
+            # 優先交給 ffmpeg 編碼：逐張縮放後直接送出 RGB 影格，調色盤由 ffmpeg 建立
+            encoded = False
+            if Config.GIF_USE_FFMPEG:
+                resample = self.resample
+                if resample is None:
+                    resample = get_gif_resample_filter(Config.GIF_RESAMPLE_FAST)
+                frames = iter_resized_images(self.files, (frame_w, frame_h), self.strategy, resample=resample)
+                encoded = write_gif_ffmpeg(tracked_frames(frames), self.output_path, self.duration)
+
+            if not encoded and not self.is_cancelled:
+                # 以縮圖建立共用調色盤
+                self.status.emit("建立共用調色盤...")
+                self.progress.emit(10)
+                palette = build_file_palette(self.files)
+
+                # 逐張載入、縮放、量化並直接寫出，不同時保留所有原圖與影格
+                frames = iter_gif_frames(self.files, (frame_w, frame_h), self.strategy,
+                                         palette, resample=self.resample)
+                write_gif(tracked_frames(frames), self.output_path, self.duration)
 
             if self.is_cancelled:
+                if os.path.exists(self.output_path):
+                    os.remove(self.output_path)
                 self.finished.emit(False, "操作已取消")
                 return
 
-            # 儲存 GIF
-            self.status.emit("正在儲存 GIF...")
-            self.progress.emit(85)
-
-            frames[0].save(
-                self.output_path,
-                save_all=True,
-                append_images=frames[1:],
-                duration=self.duration,
-                loop=0
-            )
+            if Config.GIF_USE_GIFSICLE:
+                self.status.emit("以 gifsicle 最佳化檔案大小...")
+                optimize_gif(self.output_path)
 
             self.progress.emit(100)
             self.finished.emit(True, f"GIF 建立完成！\n{self.output_path}")
@@ -386,17 +450,19 @@ class GifCreationWorker(QThread):
         self.is_cancelled = True
 
 
-class ImageConversionWorker(QThread):
+class ImageConversionWorker(ThrottledProgressMixin, QThread):
     """圖片格式轉換工作執行緒"""
     progress = pyqtSignal(int)
     status = pyqtSignal(str)
     finished = pyqtSignal(bool, str)
 
-    def __init__(self, files, output_format, output_folder):
+    def __init__(self, files, output_format, output_folder, workers=None, max_size=None):
         super().__init__()
         self.files = files
         self.output_format = output_format
         self.output_folder = output_folder
+        self.workers = workers  # 並行數，None 表示 CPU 核心數加上 Config.CONVERT_IO_WORKERS
+        self.max_size = max_size  # 輸出尺寸上限 (width, height)，None 表示維持原尺寸
         self.is_cancelled = False
 
     def run(self):
@@ -408,30 +474,49 @@ class ImageConversionWorker(QThread):
             if self.output_folder and not os.path.exists(self.output_folder):
                 os.makedirs(self.output_folder)
 
-            for i, file in enumerate(self.files):
-                if self.is_cancelled:
-                    self.finished.emit(False, f"操作已取消（已轉換 {success_count}/{total}）")
-                    return
-
-                try:
-                    self.status.emit(f"轉換 {i+1}/{total}: {os.path.basename(file)}")
-
-                    img = Image.open(file)
-                    base = os.path.splitext(os.path.basename(file))[0]
+            # 每個檔案各自獨立編碼並行處理。Pillow 編解碼時會釋放 GIL，少量檔案以執行緒
+            # 處理即可，省去子行程啟動與匯入模組的成本；大批次才改用多行程。
+            # 並行數比核心數多 CONVERT_IO_WORKERS，某個檔案等待磁碟讀寫時其他檔案仍在編解碼
+            workers = max(1, min(total, self.workers or (os.cpu_count() or 1) + Config.CONVERT_IO_WORKERS))
+            executor = ProcessPoolExecutor if total >= Config.CONVERT_PROCESS_MIN_FILES else ThreadPoolExecutor
+            # 不使用 with：離開 with 時會 shutdown(wait=True) 等待執行中的檔案，
+            # 取消後 QThread 仍會多跑一段時間，介面卻已允許再次啟動
+            pool = executor(max_workers=workers)
+            try:
+                futures = {
+                    pool.submit(convert_image_file, file, self.output_format, self.output_folder,
+                                self.max_size): file
+                    for file in self.files
+                }
+
+                # 以逾時等待取代阻塞的 as_completed，單一大檔轉換中也能即時回應取消
+                pending = set(futures)
+                done_count = 0
+                while pending and not self.is_cancelled:
+                    done, pending = wait(pending, timeout=0.2, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        done_count += 1
+                        file = futures[future]
 
-                    if self.output_folder:
-                        save_path = os.path.join(self.output_folder, f"{base}.{self.output_format}")
-                    else:
-                        save_path = os.path.join(os.path.dirname(file), f"{base}.{self.output_format}")
+                        try:
+                            ok, error = future.result()
+                        except Exception as e:
+                            ok, error = False, str(e)
 
-                    img.save(save_path, format=self.output_format.upper())
-                    success_count += 1
+                        if ok:
+                            success_count += 1
+                        else:
+                            print(f"轉換失敗：{file} - {error}")
 
-                except Exception as e:
-                    print(f"轉換失敗：{file} - {e}")
+                        progress_pct = int(done_count / total * 100)
+                        self._emit_progress(progress_pct, f"轉換 {done_count}/{total}: {os.path.basename(file)}")
+            finally:
+                # 取消時捨棄尚未開始的檔案且不等待執行中的檔案，執行緒隨即結束
+                pool.shutdown(wait=not self.is_cancelled, cancel_futures=True)
 
-                progress_pct = int((i + 1) / total * 100)
-                self.progress.emit(progress_pct)
+            if self.is_cancelled:
+                self.finished.emit(False, f"操作已取消（已轉換 {success_count}/{total}）")
+                return
 
             if success_count > 0:
                 self.finished.emit(True, f"成功轉換 {success_count}/{total} 個檔案！")
@@ -446,7 +531,7 @@ class ImageConversionWorker(QThread):
         self.is_cancelled = True
 
 
-class VideoToGifWorker(QThread):
+class VideoToGifWorker(ThrottledProgressMixin, QThread):
     """影片轉 GIF 工作執行緒"""
     progress = pyqtSignal(int)
     status = pyqtSignal(str)
@@ -475,149 +560,125 @@ class VideoToGifWorker(QThread):
         except Exception as e:
             self.finished.emit(False, f"轉換失敗：{str(e)}")
 
+    def _collect_frames(self, source, expected_frames, on_frame):
+        """
+        將逐張產出的影格存入同一個 (N, h, w, 3) 陣列，不必為每幀保留 PIL Image（每像素 4 bytes）
+
+        陣列依估計幀數配置，實際幀數超過時加倍擴充；取消時停止讀取並關閉來源
+
+        Returns:
+            np.ndarray: 已取得的影格，沒有影格時為空陣列
+        """
+        frames = None
+        count = 0
+        try:
+            for pil_image in source:
+                if self.is_cancelled:
+                    break
+                if frames is None:
+                    frames = np.empty((expected_frames + 1, pil_image.height, pil_image.width, 3), dtype=np.uint8)
+                elif count == len(frames):
+                    frames = np.concatenate([frames, np.empty_like(frames)])
+                size = (frames.shape[2], frames.shape[1])
+                if pil_image.size != size:
+                    pil_image = pil_image.resize(size, Image.Resampling.LANCZOS)
+                frames[count] = np.asarray(pil_image.convert("RGB"))
+                count += 1
+                on_frame(count)
+        finally:
+            source.close()
+        if frames is None:
+            return np.empty((0, 0, 0, 3), dtype=np.uint8)
+        return frames[:count]
+
     def _run_continuous_mode(self):
         """連續模式：截取時間範圍，生成流暢動畫"""
         self.status.emit("正在載入影片...")
         self.progress.emit(5)
 
-        clip = VideoFileClip(self.video_path)
-
-        if self.is_cancelled:
-            clip.close()
-            self.finished.emit(False, "操作已取消")
+        # 只讀取檔頭取得長度，不以 MoviePy 開啟整部影片
+        info = probe_video_info(self.video_path)
+        if not info:
+            self.finished.emit(False, "無法讀取影片資訊")
             return
 
         # 截取時間範圍
-        duration = clip.duration
+        duration = info["duration"]
         start = max(0, self.start_time)
         end = min(duration, self.end_time) if self.end_time > 0 else duration
 
         if start >= end:
-            clip.close()
             self.finished.emit(False, "起始時間必須小於結束時間")
             return
 
         self.status.emit(f"截取片段：{start:.1f}s - {end:.1f}s")
         self.progress.emit(15)
 
-        subclip = clip.subclip(start, end)
+        # 逐幀解碼時直接縮放為 RGB（PyAV 的 swscale 或 ffmpeg 的 scale 濾鏡），
+        # 不經過 MoviePy 逐幀呼叫的 resize
+        expected_frames = max(1, math.ceil((end - start) * self.fps))
+        frames = self._collect_frames(
+            iter_clip_frames(self.video_path, start, end, self.fps, self.resize_width), expected_frames,
+            lambda count: self._emit_progress(15 + int(min(count / expected_frames, 1.0) * 65),
+                                              f"已擷取 {count}/{expected_frames} 幀")
+        )
+        total_frames = len(frames)
 
         if self.is_cancelled:
-            subclip.close()
-            clip.close()
             self.finished.emit(False, "操作已取消")
             return
 
-        # 調整大小
-        if self.resize_width and self.resize_width > 0:
-            self.status.emit("調整影片尺寸...")
-            self.progress.emit(25)
-            subclip = subclip.resize(width=self.resize_width)
-
-        if self.is_cancelled:
-            subclip.close()
-            clip.close()
-            self.finished.emit(False, "操作已取消")
+        if total_frames == 0:
+            self.finished.emit(False, "無法從影片擷取影格")
             return
 
         # 轉換為 GIF
         self.status.emit("正在生成 GIF（可能需要一些時間）...")
-        self.progress.emit(40)
-
-        subclip.write_gif(
-            self.output_path,
-            fps=self.fps,
-            program='ffmpeg',
-            opt='nq',
-            logger=None
-        )
+        self.progress.emit(85)
+
+        frame_duration = max(1, round(1000 / self.fps))
+        if not (Config.GIF_USE_FFMPEG and write_gif_ffmpeg(frames, self.output_path, frame_duration)):
+            save_gif(frames, self.output_path, frame_duration)
 
         self.progress.emit(100)
-        clip.close()
 
-        if self.is_cancelled:
-            self.finished.emit(False, "操作已取消")
-        else:
-            file_size = os.path.getsize(self.output_path) / (1024 * 1024)
-            self.finished.emit(True, f"GIF 生成完成！\n{self.output_path}\n檔案大小：{file_size:.2f} MB")
+        file_size = os.path.getsize(self.output_path) / (1024 * 1024)
+        self.finished.emit(True, f"GIF 生成完成！\n{self.output_path}\n檔案大小：{file_size:.2f} MB")
 
     def _run_sampling_mode(self):
         """採樣模式：每隔 N 秒取一幀"""
         self.status.emit("正在載入影片...")
         self.progress.emit(5)
 
-        clip = VideoFileClip(self.video_path)
+        # 取樣點為 0、N、2N…秒，只用來估計總幀數顯示進度
+        info = probe_video_info(self.video_path)
+        duration = info["duration"] if info else 0
+        expected_frames = max(1, math.ceil(duration / self.sample_interval))
+        self.status.emit(f"將從影片中採樣約 {expected_frames} 幀...")
+        self.progress.emit(10)
+
+        # 依序產出所有取樣影格（PyAV 或單一 ffmpeg 行程），不必每個取樣點重新開檔解碼
+        frames = self._collect_frames(
+            iter_sampled_frames(self.video_path, self.sample_interval, self.resize_width), expected_frames,
+            lambda count: self._emit_progress(10 + int(min(count / expected_frames, 1.0) * 70),
+                                              f"已採樣 {count} 幀（{(count - 1) * self.sample_interval:.1f}秒）")
+        )
+        total_frames = len(frames)
 
         if self.is_cancelled:
-            clip.close()
             self.finished.emit(False, "操作已取消")
             return
 
-        duration = clip.duration
-
-        # 計算採樣點
-        sample_times = []
-        current_time = 0
-        while current_time < duration:
-            sample_times.append(current_time)
-            current_time += self.sample_interval
-
-        total_frames = len(sample_times)
-        self.status.emit(f"將從影片中採樣 {total_frames} 幀...")
-        self.progress.emit(10)
-
         if total_frames == 0:
-            clip.close()
             self.finished.emit(False, "採樣間隔過大，無法產生幀")
             return
 
-        # 逐一採樣
-        frames = []
-        for i, sample_time in enumerate(sample_times):
-            if self.is_cancelled:
-                clip.close()
-                self.finished.emit(False, "操作已取消")
-                return
-
-            self.status.emit(f"採樣第 {i+1}/{total_frames} 幀（{sample_time:.1f}秒）...")
-
-            # 取得該時間點的幀
-            frame = clip.get_frame(sample_time)
-
-            # 轉換為 PIL Image
-            from PIL import Image as PILImage
-            import numpy as np
-            pil_image = PILImage.fromarray(np.uint8(frame))
-
-            # 調整大小
-            if self.resize_width and self.resize_width > 0:
-                aspect_ratio = pil_image.height / pil_image.width
-                new_height = int(self.resize_width * aspect_ratio)
-                pil_image = pil_image.resize((self.resize_width, new_height), PILImage.Resampling.LANCZOS)
-
-            frames.append(pil_image)
-
-            progress = 10 + int((i + 1) / total_frames * 70)
-            self.progress.emit(progress)
-
-        clip.close()
-
-        if self.is_cancelled:
-            self.finished.emit(False, "操作已取消")
-            return
-
         # 儲存為 GIF
         self.status.emit("正在儲存 GIF...")
         self.progress.emit(85)
 
-        frames[0].save(
-            self.output_path,
-            save_all=True,
-            append_images=frames[1:],
-            duration=self.frame_duration,
-            loop=0,
-            optimize=True
-        )
+        if not (Config.GIF_USE_FFMPEG and write_gif_ffmpeg(frames, self.output_path, self.frame_duration)):
+            save_gif(frames, self.output_path, self.frame_duration)
 
         self.progress.emit(100)
 
@@ -632,19 +693,21 @@ class VideoToGifWorker(QThread):
         self.is_cancelled = True
 
 
-class ImageCompressionWorker(QThread):
+class ImageCompressionWorker(ThrottledProgressMixin, QThread):
     """圖片壓縮工作執行緒"""
     progress = pyqtSignal(int)
     status = pyqtSignal(str)
     stats = pyqtSignal(str)  # 壓縮統計資訊
     finished = pyqtSignal(bool, str)
+    STATS_BATCH = 32  # 每完成幾個檔案更新一次累計統計
 
-    def __init__(self, files, quality, output_format, output_folder):
+    def __init__(self, files, quality, output_format, output_folder, workers=None):
         super().__init__()
         self.files = files
         self.quality = quality
         self.output_format = output_format
         self.output_folder = output_folder
+        self.workers = workers  # 並行數，None 表示 CPU 核心數加上 Config.CONVERT_IO_WORKERS
         self.is_cancelled = False
 
     def run(self):
@@ -658,66 +721,59 @@ class ImageCompressionWorker(QThread):
             if self.output_folder and not os.path.exists(self.output_folder):
                 os.makedirs(self.output_folder)
 
-            for i, file in enumerate(self.files):
-                if self.is_cancelled:
-                    self.finished.emit(False, f"操作已取消（已壓縮 {success_count}/{total}）")
-                    return
-
-                try:
-                    self.status.emit(f"壓縮 {i+1}/{total}: {os.path.basename(file)}")
-
-                    # 獲取原始檔案大小
-                    orig_size = os.path.getsize(file)
-                    original_size += orig_size
-
-                    img = Image.open(file)
-
-                    # 如果是 PNG 且目標是 JPG，需要轉換模式
-                    if self.output_format.lower() in ['jpg', 'jpeg'] and img.mode in ('RGBA', 'LA', 'P'):
-                        # 創建白色背景
-                        background = Image.new('RGB', img.size, (255, 255, 255))
-                        if img.mode == 'P':
-                            img = img.convert('RGBA')
-                        background.paste(img, mask=img.split()[-1] if img.mode == 'RGBA' else None)
-                        img = background
-
-                    base = os.path.splitext(os.path.basename(file))[0]
-
-                    if self.output_folder:
-                        save_path = os.path.join(self.output_folder, f"{base}_compressed.{self.output_format}")
-                    else:
-                        save_path = os.path.join(os.path.dirname(file), f"{base}_compressed.{self.output_format}")
-
-                    # 壓縮保存
-                    if self.output_format.lower() in ['jpg', 'jpeg']:
-                        img.save(save_path, format='JPEG', quality=self.quality, optimize=True)
-                    elif self.output_format.lower() == 'png':
-                        img.save(save_path, format='PNG', optimize=True, compress_level=9)
-                    elif self.output_format.lower() == 'webp':
-                        img.save(save_path, format='WEBP', quality=self.quality)
-                    else:
-                        img.save(save_path, quality=self.quality, optimize=True)
-
-                    # 獲取壓縮後檔案大小
-                    comp_size = os.path.getsize(save_path)
-                    compressed_size += comp_size
-
-                    success_count += 1
-
-                    # 計算節省百分比
-                    if orig_size > 0:
-                        saved_percent = ((orig_size - comp_size) / orig_size) * 100
-                        self.stats.emit(
-                            f"原始：{orig_size/1024:.1f} KB → "
-                            f"壓縮：{comp_size/1024:.1f} KB "
-                            f"（節省 {saved_percent:.1f}%）"
-                        )
+            # 與格式轉換相同：少量檔案以執行緒並行，大批次才改用多行程，並行數比核心數多 CONVERT_IO_WORKERS
+            workers = max(1, min(total, self.workers or (os.cpu_count() or 1) + Config.CONVERT_IO_WORKERS))
+            executor = ProcessPoolExecutor if total >= Config.CONVERT_PROCESS_MIN_FILES else ThreadPoolExecutor
+            # 原始大小每個資料夾只 scandir 一次，不在每個工作中逐檔 stat
+            orig_sizes = scan_file_sizes(self.files)
+            # 與格式轉換相同不使用 with，取消時不必等待執行中的檔案
+            pool = executor(max_workers=workers)
+            try:
+                futures = {
+                    pool.submit(compress_image_file, file, self.quality, self.output_format,
+                                self.output_folder, orig_sizes.get(file)): file
+                    for file in self.files
+                }
+
+                # 以逾時等待取代阻塞的 as_completed，單一大檔壓縮中也能即時回應取消
+                pending = set(futures)
+                done_count = 0
+                while pending and not self.is_cancelled:
+                    done, pending = wait(pending, timeout=0.2, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        done_count += 1
+                        file = futures[future]
 
-                except Exception as e:
-                    print(f"壓縮失敗：{file} - {e}")
+                        try:
+                            ok, orig_size, comp_size, error = future.result()
+                        except Exception as e:
+                            ok, orig_size, comp_size, error = False, 0, 0, str(e)
+
+                        if ok:
+                            success_count += 1
+                            original_size += orig_size
+                            compressed_size += comp_size
+                        else:
+                            print(f"壓縮失敗：{file} - {error}")
+
+                        # 統計改為每 STATS_BATCH 個檔案（及最後一個）發出一次累計值，不再逐檔格式化字串
+                        if original_size > 0 and (done_count % self.STATS_BATCH == 0 or done_count == total):
+                            saved_percent = (original_size - compressed_size) / original_size * 100
+                            self.stats.emit(
+                                f"已壓縮 {success_count} 個：原始 {original_size/(1024*1024):.2f} MB → "
+                                f"壓縮 {compressed_size/(1024*1024):.2f} MB "
+                                f"（節省 {saved_percent:.1f}%）"
+                            )
+
+                        progress_pct = int(done_count / total * 100)
+                        self._emit_progress(progress_pct, f"壓縮 {done_count}/{total}: {os.path.basename(file)}")
+            finally:
+                # 取消時捨棄尚未開始的檔案且不等待執行中的檔案，執行緒隨即結束
+                pool.shutdown(wait=not self.is_cancelled, cancel_futures=True)
 
-                progress_pct = int((i + 1) / total * 100)
-                self.progress.emit(progress_pct)
+            if self.is_cancelled:
+                self.finished.emit(False, f"操作已取消（已壓縮 {success_count}/{total}）")
+                return
 
             if success_count > 0:
                 total_saved = original_size - compressed_size
@@ -759,6 +815,8 @@ class VideoCompressionWorker(QThread):
 
     def run(self):
         try:
+            from moviepy.editor import VideoFileClip
+
             total = len(self.files)
             success_count = 0
             original_size = 0
@@ -954,7 +1012,7 @@ class MarkdownToolsWorker(QThread):
         self.is_cancelled = True
 
 
-class BatchRenameWorker(QThread):
+class BatchRenameWorker(ThrottledProgressMixin, QThread):
     """批次重新命名工作執行緒"""
     progress = pyqtSignal(int)
     status = pyqtSignal(str)
@@ -972,7 +1030,7 @@ class BatchRenameWorker(QThread):
             success_count = 0
             
             # 排序檔案以確保編號順序
-            sorted_files = natsorted(self.files)
+            sorted_files = sorted(self.files, key=_NAT_KEY)
 
             prefix = self.rules.get('prefix', '')
             suffix = self.rules.get('suffix', '')
@@ -1026,9 +1084,7 @@ class BatchRenameWorker(QThread):
                 except Exception as e:
                     print(f"Rename failed: {file_path} -> {new_path}: {e}")
 
-                progress = int((i + 1) / total * 100)
-                self.progress.emit(progress)
-                self.status.emit(f"已重新命名 {i+1}/{total}: {final_name}")
+                self._emit_progress(int((i + 1) / total * 100), f"已重新命名 {i+1}/{total}: {final_name}")
 
             self.finished.emit(True, f"成功重新命名 {success_count}/{total} 個檔案")
 
@@ -1039,7 +1095,7 @@ class BatchRenameWorker(QThread):
         self.is_cancelled = True
 
 
-class ImageEditWorker(QThread):
+class ImageEditWorker(ThrottledProgressMixin, QThread):
     """圖片編輯工作執行緒"""
     progress = pyqtSignal(int)
     status = pyqtSignal(str)
@@ -1065,11 +1121,10 @@ class ImageEditWorker(QThread):
                     self.finished.emit(False, "操作已取消")
                     return
 
-                self.status.emit(f"處理圖片 {i+1}/{total}...")
-                
                 try:
-                    img = Image.open(file_path)
-                    
+                    with Image.open(file_path) as img:
+                        img.load()
+
                     # 應用操作
                     for op in self.operations:
                         if op['type'] == 'rotate':
@@ -1096,7 +1151,7 @@ class ImageEditWorker(QThread):
                 except Exception as e:
                     print(f"Edit failed {file_path}: {e}")
 
-                self.progress.emit(int((i + 1) / total * 100))
+                self._emit_progress(int((i + 1) / total * 100), f"處理圖片 {i+1}/{total}...")
 
             self.finished.emit(True, f"成功編輯 {success_count}/{total} 張圖片")
 
@@ -1116,6 +1171,9 @@ class MediaToolkit(QMainWindow):
         # 載入配置管理器
         self.config = get_config_manager()
         self._pdf_password_cache = {}
+        self._last_merge = None
+        self._tile_cache = OrderedDict()  # (路徑, 修改時間, 格子尺寸, 補白) -> 已縮放圖片
+        self._tile_cache_bytes = 0
         self._loading_preferences = False
         self._save_timer = QTimer(self)
         self._save_timer.setSingleShot(True)
@@ -1123,7 +1181,7 @@ class MediaToolkit(QMainWindow):
 
         # 從配置載入設定
         self.current_theme = self.config.get('theme', 'light')
-        self._group_boxes = []
+        self._applied_stylesheet = None
         self.setWindowTitle("📦 MediaToolkit v6.0 - 多媒體與文檔處理工具套件")
 
         # 從配置恢復視窗大小和位置
@@ -1133,6 +1191,7 @@ class MediaToolkit(QMainWindow):
         # 工作執行緒
         self.video_worker = None
         self.gif_worker = None
+        self.merge_save_worker = None
         self.convert_worker = None
         self.video_to_gif_worker = None
         self.compress_worker = None
@@ -1147,6 +1206,7 @@ class MediaToolkit(QMainWindow):
 
         # 時間追蹤
         self.operation_start_time = None
+        self._time_label_updates = {}  # 標籤 -> 上次更新時間 (time.monotonic)
 
         self.doc_deps = check_dependencies()
         self._init_ui()
@@ -1320,6 +1380,13 @@ class MediaToolkit(QMainWindow):
             lambda: self._on_numeric_pref_changed(self.edit_duration, 'image.gif_duration', 50, Config.DEFAULT_GIF_DURATION)
         )
         gif_layout.addWidget(self.edit_duration)
+        gif_layout.addWidget(QLabel("縮放品質:"))
+        self.combo_gif_resample = QComboBox()
+        self.combo_gif_resample.addItems(Config.GIF_RESAMPLE_OPTIONS)
+        self.combo_gif_resample.currentTextChanged.connect(
+            lambda text: self._on_combo_pref_changed('image.gif_resample', text)
+        )
+        gif_layout.addWidget(self.combo_gif_resample)
         gif_layout.addStretch()
         p_layout.addLayout(gif_layout)
         
@@ -1361,10 +1428,10 @@ class MediaToolkit(QMainWindow):
 
         # 操作按鈕
         action_layout = QHBoxLayout()
-        btn_merge = QPushButton("🖼️ 拼接圖片")
-        btn_merge.clicked.connect(self.merge_images)
-        btn_merge.setMinimumHeight(44)
-        action_layout.addWidget(btn_merge)
+        self.btn_merge_image = QPushButton("🖼️ 拼接圖片")
+        self.btn_merge_image.clicked.connect(self.merge_images)
+        self.btn_merge_image.setMinimumHeight(44)
+        action_layout.addWidget(self.btn_merge_image)
 
         self.btn_create_gif = QPushButton("🎞️ 生成 GIF")
         self.btn_create_gif.clicked.connect(self.create_gif)
@@ -1512,6 +1579,19 @@ class MediaToolkit(QMainWindow):
         btn_browse.clicked.connect(self.browse_output_folder)
         folder_layout.addWidget(btn_browse)
         s_layout.addLayout(folder_layout)
+
+        edge_layout = QHBoxLayout()
+        edge_layout.addWidget(QLabel("最長邊上限:"))
+        self.edit_convert_max_edge = QLineEdit(str(Config.DEFAULT_CONVERT_MAX_EDGE))
+        self.edit_convert_max_edge.setMaximumWidth(80)
+        self.edit_convert_max_edge.editingFinished.connect(
+            lambda: self._on_numeric_pref_changed(self.edit_convert_max_edge, 'convert.max_edge', 0,
+                                                  Config.DEFAULT_CONVERT_MAX_EDGE)
+        )
+        edge_layout.addWidget(self.edit_convert_max_edge)
+        edge_layout.addWidget(QLabel("像素（0 表示維持原尺寸）"))
+        edge_layout.addStretch()
+        s_layout.addLayout(edge_layout)
         
         settings.setLayout(s_layout)
         layout.addWidget(settings)
@@ -2452,8 +2532,8 @@ class MediaToolkit(QMainWindow):
     def _create_group_box(self, title):
         """創建群組框"""
         group = QGroupBox(title)
-        self._group_boxes.append(group)
-        group.setStyleSheet(ModernStyle.get_card_style(self.current_theme))
+        # 卡片樣式由主視窗樣式表的 QGroupBox[card="true"] 套用，切換主題時不必逐一更新
+        group.setProperty("card", True)
         return group
 
     def _remember_folder(self, config_key, file_path):
@@ -2474,11 +2554,11 @@ class MediaToolkit(QMainWindow):
 
     def _apply_theme(self, theme):
         """套用主題"""
-        stylesheet = ModernStyle.get_dark_stylesheet() if theme == "dark" else ModernStyle.get_light_stylesheet()
+        stylesheet = ModernStyle.get_window_stylesheet("dark" if theme == "dark" else "light")
+        if stylesheet is self._applied_stylesheet:
+            return
+        self._applied_stylesheet = stylesheet
         self.setStyleSheet(stylesheet)
-        card_style = ModernStyle.get_card_style(theme)
-        for group in self._group_boxes:
-            group.setStyleSheet(card_style)
 
     # === 配置管理方法 ===
     def _restore_window_geometry(self):
@@ -2497,11 +2577,13 @@ class MediaToolkit(QMainWindow):
 
     def _save_window_geometry(self):
         """保存視窗大小與位置"""
-        self.config.set('window.width', self.width(), auto_save=False)
-        self.config.set('window.height', self.height(), auto_save=False)
-        self.config.set('window.x', self.x(), auto_save=False)
-        self.config.set('window.y', self.y(), auto_save=False)
-        self.config.set('window.maximized', self.isMaximized(), auto_save=False)
+        self.config.set_many({
+            'window.width': self.width(),
+            'window.height': self.height(),
+            'window.x': self.x(),
+            'window.y': self.y(),
+            'window.maximized': self.isMaximized(),
+        }, auto_save=False)
         self._request_config_save()
 
     def _load_parameters(self):
@@ -2518,11 +2600,18 @@ class MediaToolkit(QMainWindow):
         if index >= 0:
             self.combo_strategy.setCurrentIndex(index)
 
+        gif_resample = self.config.get('image.gif_resample', Config.GIF_RESAMPLE_FAST)
+        index = self.combo_gif_resample.findText(gif_resample)
+        if index >= 0:
+            self.combo_gif_resample.setCurrentIndex(index)
+
         # 影片輸出參數
         self.edit_output_video.setText(self.config.get('video.output_name', 'merged_video.mp4'))
 
         # 圖片轉檔參數
         self.edit_output_folder.setText(self.config.get('convert.output_folder', 'converted_images'))
+        self.edit_convert_max_edge.setText(
+            str(self.config.get('convert.max_edge', Config.DEFAULT_CONVERT_MAX_EDGE)))
 
         fmt = self.config.get('convert.output_format', 'PNG')
         index = self.combo_output_format.findText(fmt)
@@ -2541,13 +2630,18 @@ class MediaToolkit(QMainWindow):
     def _save_parameters(self):
         """保存參數設置"""
         try:
-            self._update_config_value('image.grid_cols', int(self.edit_cols.text()))
-            self._update_config_value('image.grid_rows', int(self.edit_rows.text()))
-            self._update_config_value('image.gif_duration', int(self.edit_duration.text()))
-            self._update_config_value('image.resize_strategy', self.combo_strategy.currentText())
-            self._update_config_value('video.output_name', self.edit_output_video.text())
-            self._update_config_value('convert.output_folder', self.edit_output_folder.text())
-            self._update_config_value('convert.output_format', self.combo_output_format.currentText())
+            self.config.set_many({
+                'image.grid_cols': int(self.edit_cols.text()),
+                'image.grid_rows': int(self.edit_rows.text()),
+                'image.gif_duration': int(self.edit_duration.text()),
+                'image.resize_strategy': self.combo_strategy.currentText(),
+                'image.gif_resample': self.combo_gif_resample.currentText(),
+                'video.output_name': self.edit_output_video.text(),
+                'convert.output_folder': self.edit_output_folder.text(),
+                'convert.output_format': self.combo_output_format.currentText(),
+                'convert.max_edge': int(self.edit_convert_max_edge.text()),
+            }, auto_save=False)
+            self._request_config_save()
         except Exception:
             pass
 
@@ -2587,7 +2681,7 @@ class MediaToolkit(QMainWindow):
         self._show_pref_status("Preferences updated")
 
     def _manual_save_preferences(self):
-        if self.config.save_config():
+        if self.config.save_config(force=True):
             self._show_pref_status("Preferences saved")
 
     def _reset_preferences(self):
@@ -2614,26 +2708,30 @@ class MediaToolkit(QMainWindow):
         """關閉視窗時保存配置"""
         self._save_window_geometry()
         self._save_parameters()
+        self._save_timer.stop()
         self.config.save_config()
+        self._tile_cache.clear()
+        self._tile_cache_bytes = 0
         event.accept()
 
     # === 輔助方法 ===
     def _format_time(self, seconds):
         """格式化時間顯示"""
-        if seconds < 60:
-            return f"{int(seconds)} 秒"
-        elif seconds < 3600:
-            mins = int(seconds / 60)
-            secs = int(seconds % 60)
-            return f"{mins} 分 {secs} 秒"
-        else:
-            hours = int(seconds / 3600)
-            mins = int((seconds % 3600) / 60)
+        hours, rem = divmod(int(seconds), 3600)
+        mins, secs = divmod(rem, 60)
+        if hours:
             return f"{hours} 小時 {mins} 分"
+        if mins:
+            return f"{mins} 分 {secs} 秒"
+        return f"{secs} 秒"
 
     def _update_time_label(self, label, progress):
-        """更新時間標籤"""
+        """更新時間標籤（顯示精度為秒，每個標籤最多每秒更新一次；完成時一律更新）"""
         if self.operation_start_time and progress > 0:
+            now = time.monotonic()
+            if progress < 100 and now - self._time_label_updates.get(label, 0.0) < 1.0:
+                return
+            self._time_label_updates[label] = now
             elapsed = time.time() - self.operation_start_time
             if progress < 100:
                 estimated_total = elapsed / (progress / 100)
@@ -2900,27 +2998,52 @@ class MediaToolkit(QMainWindow):
         except:
             return None
         
-        images = [Image.open(p) for p in files]
-        min_w = min(img.width for img in images)
-        min_h = min(img.height for img in images)
-        gap = Config.DEFAULT_IMAGE_GAP
-        merged_w = cols * min_w + (cols + 1) * gap
-        merged_h = rows * min_h + (rows + 1) * gap
-        merged = Image.new("RGB", (merged_w, merged_h), Config.DEFAULT_BG_COLOR)
-        
         strategy = self.combo_strategy.currentText()
-        idx = 0
-        for row in range(rows):
-            for col in range(cols):
-                if idx >= len(images):
-                    break
-                resized = resize_image(images[idx], (min_w, min_h), strategy)
-                x = gap + col * (min_w + gap)
-                y = gap + row * (min_h + gap)
-                merged.paste(resized, (x, y))
-                idx += 1
+
+        # 檔案、修改時間與網格設定都相同時直接沿用上次的結果（例如取消儲存後再按一次）
+        mtimes = tuple(os.stat(p).st_mtime_ns for p in files)
+        key = (tuple(files), mtimes, rows, cols, strategy)
+        if self._last_merge and self._last_merge[0] == key:
+            return self._last_merge[1]
+
+        # 尺寸只讀檔頭；放入網格的圖片逐張解碼、縮放並寫入畫布，
+        # 同時只保留執行緒池視窗內的幾張，不必一次解碼全部圖片
+        min_w, min_h = map(min, zip(*(get_image_size(p) for p in files)))
+        count = rows * cols
+        tiles = self._cached_tiles(files[:count], mtimes[:count], (min_w, min_h),
+                                   is_padding_strategy(strategy))
+        merged = compose_grid(tiles, rows, cols, (min_w, min_h),
+                              Config.DEFAULT_IMAGE_GAP, Config.DEFAULT_BG_COLOR)
+        self._last_merge = (key, merged)
         return merged
 
+    def _cached_tiles(self, files, mtimes, cell_size, pad):
+        """
+        依序產出已縮放的網格圖片，沿用快取中相同檔案與設定的結果
+
+        只調整行列數時格子尺寸不變，已縮放過的圖片不必重新解碼；
+        快取以 Config.MERGE_TILE_CACHE_MB 為上限，超過時移除最久未使用的項目
+        """
+        keys = [(p, mtime, cell_size, pad) for p, mtime in zip(files, mtimes)]
+        cached = {k: self._tile_cache[k] for k in keys if k in self._tile_cache}
+        for k in cached:
+            self._tile_cache.move_to_end(k)
+        fresh = iter_resized_images([k[0] for k in keys if k not in cached], cell_size, pad)
+
+        limit = Config.MERGE_TILE_CACHE_MB * 1024 * 1024
+        for k in keys:
+            tile = cached.get(k)
+            if tile is None:
+                tile = next(fresh)
+                size = tile.width * tile.height * len(tile.getbands())
+                if k not in self._tile_cache and size <= limit:
+                    self._tile_cache[k] = tile
+                    self._tile_cache_bytes += size
+                    while self._tile_cache_bytes > limit:
+                        _, old = self._tile_cache.popitem(last=False)
+                        self._tile_cache_bytes -= old.width * old.height * len(old.getbands())
+            yield tile
+
     def merge_images(self):
         merged = self.generate_merged_image()
         if not merged:
@@ -2928,8 +3051,18 @@ class MediaToolkit(QMainWindow):
             return
         path, _ = QFileDialog.getSaveFileName(self, "儲存圖片", "", Config.get_save_image_filter())
         if path:
-            merged.save(path)
-            self.show_info(f"拼接完成！\n{path}")
+            self.btn_merge_image.setEnabled(False)
+            self.merge_save_worker = ImageSaveWorker(merged, path)
+            self.merge_save_worker.finished.connect(self._on_merge_save_finished)
+            self.merge_save_worker.start()
+
+    def _on_merge_save_finished(self, success, message):
+        """拼接圖片儲存完成"""
+        self.btn_merge_image.setEnabled(True)
+        if success:
+            self.show_info(message)
+        else:
+            self.show_error(message)
 
     def create_gif(self):
         """GIF 建立 - 使用工作執行緒"""
@@ -2950,7 +3083,8 @@ class MediaToolkit(QMainWindow):
             return
 
         # 初始化工作執行緒
-        self.gif_worker = GifCreationWorker(files, path, duration, strategy)
+        resample = get_gif_resample_filter(self.combo_gif_resample.currentText())
+        self.gif_worker = GifCreationWorker(files, path, duration, strategy, resample)
         self.gif_worker.progress.connect(self._on_gif_progress)
         self.gif_worker.status.connect(self._on_gif_status)
         self.gif_worker.finished.connect(self._on_gif_finished)
@@ -3009,7 +3143,7 @@ class MediaToolkit(QMainWindow):
             self.show_warning("請輸入輸出檔名")
             return
 
-        files = natsorted(files)
+        files = sorted(files, key=_NAT_KEY)
 
         # 初始化工作執行緒
         self.video_worker = VideoMergeWorker(files, output)
@@ -3067,11 +3201,21 @@ class MediaToolkit(QMainWindow):
             self.show_warning("請先選擇圖片")
             return
 
+        # 轉換進行中（包含取消後尚在結束）時不重新建立執行緒，避免仍在執行的 QThread 被回收
+        if self.convert_worker and self.convert_worker.isRunning():
+            self.show_warning("格式轉換進行中，請等待目前的轉換結束")
+            return
+
         fmt = self.combo_output_format.currentText().lower()
         folder = self.edit_output_folder.text()
+        try:
+            max_edge = int(self.edit_convert_max_edge.text())
+        except ValueError:
+            max_edge = Config.DEFAULT_CONVERT_MAX_EDGE
+        max_size = (max_edge, max_edge) if max_edge > 0 else None
 
         # 初始化工作執行緒
-        self.convert_worker = ImageConversionWorker(files, fmt, folder)
+        self.convert_worker = ImageConversionWorker(files, fmt, folder, max_size=max_size)
         self.convert_worker.progress.connect(self._on_convert_progress)
         self.convert_worker.status.connect(self._on_convert_status)
         self.convert_worker.finished.connect(self._on_convert_finished)
@@ -3136,7 +3280,7 @@ class MediaToolkit(QMainWindow):
 
     def _word_to_pdf(self):
         word = self.word_input.text()
-        if not word or not os.path.exists(word):
+        if not word or not os.path.isfile(word):
             self.show_warning("請選擇有效的 Word 文件")
             return
         pdf, _ = QFileDialog.getSaveFileName(self, "儲存 PDF", "", "PDF (*.pdf)")
@@ -3148,7 +3292,7 @@ class MediaToolkit(QMainWindow):
 
     def _pdf_to_word(self):
         pdf = self.pdf_input.text()
-        if not pdf or not os.path.exists(pdf):
+        if not pdf or not os.path.isfile(pdf):
             self.show_warning("請選擇有效的 PDF 文件")
             return
         word, _ = QFileDialog.getSaveFileName(self, "儲存 Word", "", "Word (*.docx)")
@@ -3515,6 +3659,11 @@ class MediaToolkit(QMainWindow):
             self.show_warning("請先選擇圖片")
             return
 
+        # 壓縮進行中（包含取消後尚在結束）時不重新建立執行緒，避免仍在執行的 QThread 被回收
+        if self.compress_worker and self.compress_worker.isRunning():
+            self.show_warning("圖片壓縮進行中，請等待目前的壓縮結束")
+            return
+
         quality = self.compress_quality_slider.value()
         output_format = self.compress_format.currentText()
         output_folder = self.compress_output_folder.text()
@@ -3584,6 +3733,7 @@ class MediaToolkit(QMainWindow):
             "<p>• 圖片處理：拼接、GIF、浮水印、批次編輯</p>"
             "<p>• 影片處理：合併、格式轉換</p>"
             "<p>• 文檔處理：Word↔PDF、PDF 合併</p>"
+            f"<p>• 影像加速：{'、'.join(get_image_backends()) or '未安裝（見 README「安裝方式」）'}</p>"
             "<br>"
             "<p style='color:#5B9BD5; font-weight:bold;'>© 2025 Dof Liu AI工作室</p>"
             "<p style='color:#607D8B; font-size:9pt;'>All Rights Reserved.</p>")
@@ -3939,6 +4089,12 @@ class MediaToolkit(QMainWindow):
         return f"{size_bytes} B"
 
     def scanCleanupCandidates(self):
+        # 掃描進行中時不重新建立執行緒，避免仍在執行的 QThread 被回收而中止程式
+        worker = getattr(self, 'worker', None)
+        if worker is not None and worker.isRunning():
+            self.statusBar().showMessage("掃描進行中，請等待目前的掃描完成", 4000)
+            return
+
         self.cleanupTree.clear()
         self.cleanup_candidates_map = {}
         
@@ -4445,8 +4601,12 @@ class MediaToolkit(QMainWindow):
 
     def _apply_theme(self, theme=None):
         """應用主題 (強制淺色模式)"""
-        # 強制使用淺色模式
-        self.setStyleSheet(ModernStyle.get_light_stylesheet())
+        # 強制使用淺色模式；樣式表已快取，未變更時略過重新套用
+        stylesheet = ModernStyle.get_window_stylesheet("light")
+        if stylesheet is self._applied_stylesheet:
+            return
+        self._applied_stylesheet = stylesheet
+        self.setStyleSheet(stylesheet)
                 
     def _toggle_theme(self):
         """切換主題 (已停用)"""
@@ -4807,4 +4967,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # 打包成執行檔時，ProcessPoolExecutor 的子行程需要此呼叫
+    multiprocessing.freeze_support()
     main()
@@ -5,13 +5,17 @@ MediaToolkit MCP Server
 """
 
 import os
+import io
 import sys
+import mmap
+import asyncio
 import tempfile
 import base64
 import subprocess
 import platform
 import traceback
 import logging
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
 from typing import Optional, List, Tuple, Union
@@ -29,8 +33,16 @@ from utils import (
     convert_word_to_pdf,
     convert_pdf_to_word,
     merge_pdfs,
-    resize_image,
-    extract_page
+    iter_resized_images,
+    write_gif,
+    optimize_gif,
+    build_file_palette,
+    iter_gif_frames,
+    fit_gif_size,
+    compose_grid,
+    get_image_size,
+    extract_page,
+    Config
 )
 from utils.doc_converter import check_dependencies
 from PIL import Image
@@ -42,6 +54,15 @@ MAX_IMAGE_SIZE = 50 * 1024 * 1024  # 50MB
 MAX_PDFS_COUNT = 10  # 最多合併 10 個 PDF
 MAX_IMAGES_COUNT = 20  # 最多處理 20 張圖片
 MAX_COMPRESS_COUNT = 50 # 最多壓縮 50 張圖片
+MAX_IO_WORKERS = min(32, (os.cpu_count() or 1) * 4)  # 批次檔案操作的並行上限
+MMAP_MIN_SIZE = 256 * 1024  # 小於此大小的圖片不使用 mmap 讀取
+
+# 順時針旋轉角度 -> 無損 transpose 操作
+RIGHT_ANGLE_TRANSPOSE = {
+    90: Image.ROTATE_270,
+    180: Image.ROTATE_180,
+    270: Image.ROTATE_90,
+}
 
 # 創建 MCP Server
 server = Server("media-toolkit")
@@ -60,21 +81,66 @@ def validate_file_size(file_path: str, max_size: int, file_type: str) -> None:
         )
 
 
-def save_base64_file(base64_data: str, suffix: str) -> str:
-    """保存 base64 編碼的檔案到臨時位置"""
+def decode_base64_data(base64_data: str) -> bytes:
+    """解碼 base64 字串 (可含 data URL 前綴與換行)"""
+    # 移除可能的 data URL 前綴
+    if ',' in base64_data:
+        base64_data = base64_data.split(',', 1)[1]
+
+    # 清理 base64 字符串（移除換行符和空白字符）
+    base64_data = base64_data.strip().replace('\n', '').replace('\r', '').replace(' ', '')
+
+    # 解碼
+    file_data = base64.b64decode(base64_data)
+
+    if len(file_data) == 0:
+        raise ValueError("Base64 解碼後檔案為空")
+
+    return file_data
+
+
+def read_base64_image_data(base64_data: str, label: str) -> bytes:
+    """解碼 base64 圖片資料並檢查大小限制 (與 validate_file_size 相同規則)"""
     try:
-        # 移除可能的 data URL 前綴
-        if ',' in base64_data:
-            base64_data = base64_data.split(',', 1)[1]
+        file_data = decode_base64_data(base64_data)
+    except base64.binascii.Error as e:
+        raise ValueError(f"Base64 解碼失敗: {str(e)}. 請確認資料格式正確")
+
+    size = len(file_data)
+    if size > MAX_IMAGE_SIZE:
+        raise ValueError(
+            f"{label} 檔案過大: {size / (1024*1024):.2f}MB "
+            f"(限制: {MAX_IMAGE_SIZE / (1024*1024):.0f}MB)"
+        )
+    return file_data
+
+
+def image_from_base64(base64_data: str, label: str) -> Image.Image:
+    """
+    將 base64 圖片直接解碼為記憶體中的 Image，不經過臨時檔案
+    會套用與檔案輸入相同的大小限制與格式驗證
+    """
+    file_data = read_base64_image_data(base64_data, label)
+    size = len(file_data)
 
-        # 清理 base64 字符串（移除換行符和空白字符）
-        base64_data = base64_data.strip().replace('\n', '').replace('\r', '').replace(' ', '')
+    buf = io.BytesIO(file_data)
+    try:
+        with Image.open(buf) as img:
+            img.verify()
+        buf.seek(0)
+        img = Image.open(buf)
+        img.load()
+        return img
+    except Image.UnidentifiedImageError:
+        raise ValueError(f"無法識別的圖片格式 (檔案大小: {size} bytes)")
+    except Exception as e:
+        raise ValueError(f"圖片驗證失敗: {str(e)} (檔案大小: {size} bytes)")
 
-        # 解碼
-        file_data = base64.b64decode(base64_data)
 
-        if len(file_data) == 0:
-            raise ValueError("Base64 解碼後檔案為空")
+def save_base64_file(base64_data: str, suffix: str) -> str:
+    """保存 base64 編碼的檔案到臨時位置"""
+    try:
+        file_data = decode_base64_data(base64_data)
 
         # 保存到臨時檔案
         temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=suffix)
@@ -98,9 +164,58 @@ def save_base64_file(base64_data: str, suffix: str) -> str:
 
 
 def file_to_base64(file_path: str) -> str:
-    """將檔案轉換為 base64"""
+    """將檔案轉換為 base64 (以 mmap 直接編碼，不先讀入整份 bytes)"""
+    with open(file_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return ""
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return base64.b64encode(mm).decode('ascii')
+
+
+def buffer_to_base64(buf: io.BytesIO) -> str:
+    """將 BytesIO 內容轉換為 base64 (透過 getbuffer 避免複製)"""
+    view = buf.getbuffer()
+    try:
+        return base64.b64encode(view).decode('ascii')
+    finally:
+        view.release()
+
+
+@contextmanager
+def image_source(file_path: str):
+    """
+    取得可交給 Image.open 的來源
+    大於 MMAP_MIN_SIZE 的檔案以唯讀 mmap 映射，讓多次讀取共用同一段 page cache；
+    小檔案的 mmap 成本高於收益，直接使用路徑
+    """
+    if os.path.getsize(file_path) < MMAP_MIN_SIZE:
+        yield file_path
+        return
+
     with open(file_path, 'rb') as f:
-        return base64.b64encode(f.read()).decode('utf-8')
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            yield mm
+
+
+def load_image(file_path: str, draft_size=None) -> Image.Image:
+    """
+    開啟並完整解碼圖片 (解碼完成後不再持有檔案)
+
+    指定 draft_size 時，JPEG 以 draft 縮小解碼（結果不小於 draft_size）
+    """
+    with image_source(file_path) as source:
+        img = Image.open(source)
+        if draft_size is not None:
+            img.draft(img.mode, draft_size)
+        img.load()
+    return img
+
+
+def load_grid_source(source, draft_size=None) -> Image.Image:
+    """載入拼接來源：記憶體中的圖片直接使用，路徑則縮小解碼"""
+    if isinstance(source, Image.Image):
+        return source
+    return load_image(source, draft_size)
 
 
 def validate_image_file(file_path: str) -> tuple[bool, str]:
@@ -118,14 +233,17 @@ def validate_image_file(file_path: str) -> tuple[bool, str]:
         if file_size == 0:
             return False, f"檔案大小為 0: {file_path}"
 
-        # 嘗試用 PIL 打開圖片
-        with Image.open(file_path) as img:
-            # 驗證圖片格式
-            img.verify()
+        with image_source(file_path) as source:
+            # 嘗試用 PIL 打開圖片
+            with Image.open(source) as img:
+                # 驗證圖片格式
+                img.verify()
 
-        # 再次打開以確保可以讀取
-        with Image.open(file_path) as img:
-            img.load()
+            # 再次打開以確保可以讀取 (mmap 來源直接倒回開頭，不重新開檔)
+            if source is not file_path:
+                source.seek(0)
+            with Image.open(source) as img:
+                img.load()
 
         return True, ""
 
@@ -221,6 +339,58 @@ def resolve_file_input(data: Optional[str], path: Optional[str], temp_suffix: st
     raise ValueError("必須提供檔案數據 (base64) 或檔案路徑 (path)")
 
 
+async def run_in_threads(func, items: list) -> list:
+    """
+    以 asyncio.to_thread 並行執行彼此獨立的檔案操作
+    結果依輸入順序返回；個別失敗以 Exception 物件表示
+    """
+    semaphore = asyncio.Semaphore(MAX_IO_WORKERS)
+
+    async def run_one(item):
+        async with semaphore:
+            return await asyncio.to_thread(func, item)
+
+    return await asyncio.gather(*(run_one(item) for item in items), return_exceptions=True)
+
+
+def list_dir_names(base_dir: str) -> Optional[set]:
+    """
+    一次列出目錄中的檔名 (以 os.path.normcase 正規化)
+    無法列出時返回 None，呼叫端改以逐一 stat 判斷
+    """
+    try:
+        with os.scandir(base_dir or ".") as entries:
+            return {os.path.normcase(entry.name) for entry in entries}
+    except OSError:
+        return None
+
+
+def get_unique_output_path(base_dir: str, stem: str, ext: str, existing: Optional[set] = None) -> str:
+    """
+    取得不覆蓋既有檔案的輸出路徑: stem.ext, stem_1.ext, stem_2.ext ...
+
+    existing 為 list_dir_names() 的結果；同一目錄需多次取名時可重複傳入，
+    選中的檔名會加入集合以避免後續呼叫取到相同名稱
+    """
+    if existing is None:
+        existing = list_dir_names(base_dir)
+
+    def is_taken(name: str) -> bool:
+        if existing is None:
+            return os.path.lexists(os.path.join(base_dir, name))
+        return os.path.normcase(name) in existing
+
+    name = f"{stem}{ext}"
+    counter = 1
+    while is_taken(name):
+        name = f"{stem}_{counter}{ext}"
+        counter += 1
+
+    if existing is not None:
+        existing.add(os.path.normcase(name))
+    return os.path.join(base_dir, name)
+
+
 @server.list_tools()
 async def list_tools() -> list[Tool]:
     """列出所有可用工具"""
@@ -920,24 +1090,17 @@ async def handle_merge_images(arguments: dict) -> list[TextContent | ImageConten
         # 指定了 rows，自動算 cols
         cols = math.ceil(total_count / rows)
 
-    working_paths = [] # (path, is_temp)
+    working_sources = [] # (path 或記憶體中的 Image, is_memory)
 
     try:
         # 步驟1：收集並驗證所有圖片
         
-        # Base64
+        # Base64 (直接在記憶體中解碼，不寫入臨時檔案)
         for i, img_data in enumerate(image_files_data):
             try:
-                img_path = save_base64_file(img_data, f"_{i}.jpg")
-                validate_file_size(img_path, MAX_IMAGE_SIZE, f"圖片 (Base64 #{i+1})")
-                is_valid, error = validate_image_file(img_path)
-                if not is_valid:
-                    raise ValueError(error)
-                working_paths.append((img_path, True))
+                img = image_from_base64(img_data, f"圖片 (Base64 #{i+1})")
+                working_sources.append((img, True))
             except Exception as e:
-                # 清理已保存的
-                for p, t in working_paths:
-                    if t and os.path.exists(p): os.unlink(p)
                 return [TextContent(type="text", text=f"❌ 圖片處理失敗: {str(e)}")]
 
         # Paths
@@ -950,61 +1113,40 @@ async def handle_merge_images(arguments: dict) -> list[TextContent | ImageConten
                 is_valid, error = validate_image_file(clean_path)
                 if not is_valid:
                     raise ValueError(error)
-                working_paths.append((clean_path, False))
+                working_sources.append((clean_path, False))
             except Exception as e:
-                # 清理
-                for p, t in working_paths:
-                    if t and os.path.exists(p): os.unlink(p)
                 return [TextContent(type="text", text=f"❌ 圖片處理失敗: {str(e)}")]
 
-        # 步驟2：打開所有圖片
-        images = []
-        final_image_paths = [p[0] for p in working_paths]
-        
-        for i, p in enumerate(final_image_paths):
+        # 步驟2：讀取檔頭尺寸並同時求最小寬高，只解碼實際放入網格的圖片
+        if not working_sources:
+             return [TextContent(type="text", text="沒有有效的圖片可處理")]
+
+        min_w = min_h = float("inf")
+        for source, is_memory in working_sources:
             try:
-                img = Image.open(p)
-                images.append(img)
+                w, h = source.size if is_memory else get_image_size(source)
             except Exception as e:
-                for p, t in working_paths:
-                    if t and os.path.exists(p): os.unlink(p)
-                return [TextContent(type="text", text=f"❌ 無法打開圖片: {p}\n錯誤: {str(e)}")]
-        
-        if not images:
-             return [TextContent(type="text", text="沒有有效的圖片可處理")]
+                return [TextContent(type="text", text=f"❌ 無法打開圖片: {source}\n錯誤: {str(e)}")]
+            min_w, min_h = min(min_w, w), min(min_h, h)
 
-        min_w = min(img.width for img in images)
-        min_h = min(img.height for img in images)
-        
         # 確保最小尺寸不過小
         min_w = max(min_w, 100)
         min_h = max(min_h, 100)
 
         gap = 10
-        merged_w = cols * min_w + (cols + 1) * gap
-        merged_h = rows * min_h + (rows + 1) * gap
-        merged = Image.new("RGB", (merged_w, merged_h), (255, 255, 255))
-
-        idx = 0
-        for row in range(rows):
-            for col in range(cols):
-                if idx >= len(images):
-                    break
-                resized = resize_image(images[idx], (min_w, min_h), strategy)
-                x = gap + col * (min_w + gap)
-                y = gap + row * (min_h + gap)
-                merged.paste(resized, (x, y))
-                idx += 1
+        # 放入網格的圖片以執行緒池並行解碼與縮放，逐格寫入畫布
+        grid_sources = [source for source, _ in working_sources[:rows * cols]]
+        try:
+            tiles = iter_resized_images(grid_sources, (min_w, min_h), strategy, load_grid_source)
+            merged = compose_grid(tiles, rows, cols, (min_w, min_h), gap)
+        except Exception as e:
+            return [TextContent(type="text", text=f"❌ 無法打開圖片\n錯誤: {str(e)}")]
 
         # 決定輸出路徑
-        local_inputs = [p for p, t in working_paths if not t]
+        local_inputs = [p for p, is_memory in working_sources if not is_memory]
         if local_inputs:
             base_dir = os.path.dirname(local_inputs[0])
-            output_path = os.path.join(base_dir, "merged_grid.png")
-            counter = 1
-            while os.path.exists(output_path):
-                output_path = os.path.join(base_dir, f"merged_grid_{counter}.png")
-                counter += 1
+            output_path = get_unique_output_path(base_dir, "merged_grid", ".png")
             output_is_temp = False
         else:
             output_path = tempfile.NamedTemporaryFile(delete=False, suffix=".png").name
@@ -1024,10 +1166,9 @@ async def handle_merge_images(arguments: dict) -> list[TextContent | ImageConten
             thumbnail = merged.copy()
             thumbnail.thumbnail((1024, 1024))
             
-            import io
             thumb_buf = io.BytesIO()
             thumbnail.save(thumb_buf, format="PNG")
-            img_base64 = base64.b64encode(thumb_buf.getvalue()).decode('utf-8')
+            img_base64 = buffer_to_base64(thumb_buf)
         else:
             # 臨時檔案則回傳完整內容
             img_base64 = file_to_base64(output_path)
@@ -1040,17 +1181,12 @@ async def handle_merge_images(arguments: dict) -> list[TextContent | ImageConten
         ))
 
         # 清理臨時檔案
-        for p, t in working_paths:
-            if t: os.unlink(p)
-        
         if output_is_temp:
             os.unlink(output_path)
 
         return content
 
     except Exception as e:
-        for p, t in working_paths:
-            if t and os.path.exists(p): os.unlink(p)
         raise e
 
 
@@ -1071,22 +1207,17 @@ async def handle_create_gif(arguments: dict) -> list[TextContent | ImageContent]
             text=f"圖片過多：{total_count} 張（限制：{MAX_IMAGES_COUNT} 張）"
         )]
 
-    working_paths = [] # (path, is_temp)
+    working_sources = [] # (path 或記憶體中的 Image, is_memory)
 
     try:
          # 步驟1：收集並驗證所有圖片
         
-        # Base64
+        # Base64 (直接在記憶體中解碼，不寫入臨時檔案)
         for i, img_data in enumerate(image_files_data):
             try:
-                img_path = save_base64_file(img_data, f"_{i}.jpg")
-                validate_file_size(img_path, MAX_IMAGE_SIZE, f"圖片 (Base64 #{i+1})")
-                is_valid, error = validate_image_file(img_path)
-                if not is_valid: raise ValueError(error)
-                working_paths.append((img_path, True))
+                img = image_from_base64(img_data, f"圖片 (Base64 #{i+1})")
+                working_sources.append((img, True))
             except Exception as e:
-                for p, t in working_paths:
-                    if t and os.path.exists(p): os.unlink(p)
                 return [TextContent(type="text", text=f"❌ 圖片處理失敗: {str(e)}")]
 
         # Paths
@@ -1097,47 +1228,38 @@ async def handle_create_gif(arguments: dict) -> list[TextContent | ImageContent]
                 validate_file_size(clean_path, MAX_IMAGE_SIZE, f"圖片 (Path #{i+1})")
                 is_valid, error = validate_image_file(clean_path)
                 if not is_valid: raise ValueError(error)
-                working_paths.append((clean_path, False))
+                working_sources.append((clean_path, False))
             except Exception as e:
-                for p, t in working_paths:
-                    if t and os.path.exists(p): os.unlink(p)
                 return [TextContent(type="text", text=f"❌ 圖片處理失敗: {str(e)}")]
 
-        # 步驟2：載入圖片
-        final_image_paths = [p[0] for p in working_paths]
-        images = [Image.open(p) for p in final_image_paths]
-
-        if not images:
+        # 步驟2：由檔頭計算統一大小，再載入圖片
+        if not working_sources:
              return [TextContent(type="text", text="沒有有效的圖片可處理")]
 
-        # 統一大小
-        min_w = min(img.width for img in images)
-        min_h = min(img.height for img in images)
-        frames = [resize_image(img, (min_w, min_h), "直接縮放") for img in images]
+        min_w = min_h = float("inf")
+        for src, is_memory in working_sources:
+            w, h = src.size if is_memory else get_image_size(src)
+            min_w, min_h = min(min_w, w), min(min_h, h)
+        frame_size = fit_gif_size((min_w, min_h))
+
+        # 逐張載入、縮放並量化後直接寫出，不同時保留所有原圖與影格
+        sources = [src for src, is_memory in working_sources]
 
         # 決定輸出路徑
-        local_inputs = [p for p, t in working_paths if not t]
+        local_inputs = [p for p, is_memory in working_sources if not is_memory]
         if local_inputs:
             base_dir = os.path.dirname(local_inputs[0])
-            output_path = os.path.join(base_dir, "created.gif")
-            counter = 1
-            while os.path.exists(output_path):
-                output_path = os.path.join(base_dir, f"created_{counter}.gif")
-                counter += 1
+            output_path = get_unique_output_path(base_dir, "created", ".gif")
             output_is_temp = False
         else:
             output_path = tempfile.NamedTemporaryFile(delete=False, suffix=".gif").name
             output_is_temp = True
 
         # 保存 GIF
-        frames[0].save(
-            output_path,
-            save_all=True,
-            append_images=frames[1:],
-            duration=duration,
-            loop=0,
-            optimize=True
-        )
+        palette = build_file_palette(sources)
+        write_gif(iter_gif_frames(sources, frame_size, False, palette), output_path, duration)
+        if Config.GIF_USE_GIFSICLE:
+            optimize_gif(output_path)
 
         content = []
         msg = f"成功創建 GIF！共 {total_count} 幀"
@@ -1146,14 +1268,14 @@ async def handle_create_gif(arguments: dict) -> list[TextContent | ImageContent]
             msg += f"\n檔案已儲存至: {output_path}"
             msg += "\n(為了效能，以下僅顯示第一幀預覽)"
 
-            # 生成第一幀縮圖
-            thumbnail = frames[0].copy()
+            # 生成第一幀縮圖（由輸出檔讀取第一幀）
+            with Image.open(output_path) as gif:
+                thumbnail = gif.convert("RGB")
             thumbnail.thumbnail((512, 512))
             
-            import io
             thumb_buf = io.BytesIO()
             thumbnail.save(thumb_buf, format="PNG")
-            img_base64 = base64.b64encode(thumb_buf.getvalue()).decode('utf-8')
+            img_base64 = buffer_to_base64(thumb_buf)
         else:
             # 臨時檔案
             img_base64 = file_to_base64(output_path)
@@ -1166,17 +1288,12 @@ async def handle_create_gif(arguments: dict) -> list[TextContent | ImageContent]
         ))
 
         # 清理
-        for p, t in working_paths:
-            if t: os.unlink(p)
-            
         if output_is_temp:
             os.unlink(output_path)
 
         return content
 
     except Exception as e:
-        for p, t in working_paths:
-            if t and os.path.exists(p): os.unlink(p)
         raise e
 
 
@@ -1195,19 +1312,16 @@ async def handle_compress_images(arguments: dict) -> list[TextContent]:
             text=f"圖片過多：{total_count} 張（限制：50 張）"
         )]
 
-    working_paths = [] # (path, is_temp)
+    working_sources = [] # (path 或解碼後的 bytes, is_memory)
     compressed_results = []
 
     try:
-        # Base64
+        # Base64 (保留在記憶體中，不寫入臨時檔案)
         for i, img_data in enumerate(image_files_data):
             try:
-                img_path = save_base64_file(img_data, f"_{i}.jpg")
-                validate_file_size(img_path, MAX_IMAGE_SIZE, f"圖片 (Base64 #{i+1})")
-                working_paths.append((img_path, True))
+                file_data = read_base64_image_data(img_data, f"圖片 (Base64 #{i+1})")
+                working_sources.append((file_data, True))
             except Exception as e:
-                for p, t in working_paths:
-                    if t and os.path.exists(p): os.unlink(p)
                 return [TextContent(type="text", text=f"❌ 圖片處理失敗: {str(e)}")]
         
         # Paths
@@ -1216,10 +1330,8 @@ async def handle_compress_images(arguments: dict) -> list[TextContent]:
                 clean_path = path.strip('"').strip("'")
                 if not os.path.exists(clean_path): raise ValueError(f"檔案不存在: {clean_path}")
                 validate_file_size(clean_path, MAX_IMAGE_SIZE, f"圖片 (Path #{i+1})")
-                working_paths.append((clean_path, False))
+                working_sources.append((clean_path, False))
             except Exception as e:
-                for p, t in working_paths:
-                    if t and os.path.exists(p): os.unlink(p)
                 return [TextContent(type="text", text=f"❌ 圖片處理失敗: {str(e)}")]
 
         # 處理所有圖片
@@ -1247,10 +1359,15 @@ async def handle_compress_images(arguments: dict) -> list[TextContent]:
         content = []
         details = []
         
-        for p, t in working_paths:
+        for p, t in working_sources:
             try:
-                img = Image.open(p)
-                orig_size = os.path.getsize(p)
+                if t:
+                    img = Image.open(io.BytesIO(p))
+                    img.load()
+                    orig_size = len(p)
+                else:
+                    img = load_image(p)
+                    orig_size = os.path.getsize(p)
                 total_original_size += orig_size
                 
                 # 轉換模式
@@ -1278,14 +1395,13 @@ async def handle_compress_images(arguments: dict) -> list[TextContent]:
                     details.append(f"• {os.path.basename(p)} -> {os.path.basename(out_path)} ({new_size/1024:.1f} KB)")
                 else:
                     # Base64 輸入：回傳 Base64
-                    import io
                     buf = io.BytesIO()
                     # PIL save 需要 format
                     pil_format = 'JPEG' if output_format.lower() in ['jpg', 'jpeg'] else output_format.upper()
                     img.save(buf, format=pil_format, quality=quality, optimize=True)
-                    compressed_data = base64.b64encode(buf.getvalue()).decode('utf-8')
+                    compressed_data = buffer_to_base64(buf)
                     
-                    new_size = len(buf.getvalue())
+                    new_size = buf.getbuffer().nbytes
                     total_compressed_size += new_size
                     processed_count += 1
                     
@@ -1302,10 +1418,6 @@ async def handle_compress_images(arguments: dict) -> list[TextContent]:
             except Exception as e:
                 details.append(f"• 處理失敗: {str(e)}")
         
-        # 清理
-        for p, t in working_paths:
-            if t: os.unlink(p)
-            
         ratio = 0
         if total_original_size > 0:
             ratio = (1 - total_compressed_size / total_original_size) * 100
@@ -1320,14 +1432,6 @@ async def handle_compress_images(arguments: dict) -> list[TextContent]:
         return content
 
     except Exception as e:
-        for p, t in working_paths:
-            if t and os.path.exists(p): os.unlink(p)
-        raise e
-
-
-    except Exception as e:
-        for p, t in working_paths:
-            if t and os.path.exists(p): os.unlink(p)
         raise e
 
 
@@ -1352,6 +1456,12 @@ async def handle_batch_rename(arguments: dict) -> list[TextContent]:
     errors = []
 
     try:
+        # 步驟1：依序規劃新檔名（檢查衝突需要依輸入順序進行）
+        plan = []  # (file_path, new_path, original_filename, new_filename)
+        planned_targets = set()
+        vacated = set()  # 先前已規劃改名而騰出的原始路徑
+        chained = False
+
         for i, file_path in enumerate(file_paths):
             if not os.path.exists(file_path):
                 errors.append(f"{file_path} 不存在")
@@ -1391,19 +1501,44 @@ async def handle_batch_rename(arguments: dict) -> list[TextContent]:
 
             new_filename = base_new_name + ext
             new_path = os.path.join(directory, new_filename)
+            target_key = os.path.normcase(os.path.abspath(new_path))
+
+            # 檢查是否存在（含本批次中已規劃的目標）
+            if new_path != file_path:
+                taken = os.path.exists(new_path) and target_key not in vacated
+                if taken or target_key in planned_targets:
+                    errors.append(f"目標檔案已存在: {new_filename}")
+                    continue
+                if target_key in vacated:
+                    chained = True
+                vacated.add(os.path.normcase(os.path.abspath(file_path)))
+
+            planned_targets.add(target_key)
+            plan.append((file_path, new_path, original_filename, new_filename))
+
+        def rename_one(item):
+            file_path, new_path, original_filename, new_filename = item
+            os.rename(file_path, new_path)
+            return f"{original_filename} -> {new_filename}"
+
+        # 步驟2：執行重命名
+        # 若某個目標名稱是本批次先前檔案騰出的原始名稱，執行順序會影響結果，維持逐一處理
+        if chained:
+            results = []
+            for item in plan:
+                try:
+                    results.append(rename_one(item))
+                except Exception as e:
+                    results.append(e)
+        else:
+            results = await run_in_threads(rename_one, plan)
 
-            # 檢查是否存在
-            if os.path.exists(new_path) and new_path != file_path:
-                errors.append(f"目標檔案已存在: {new_filename}")
-                continue
-
-            # 執行重命名
-            try:
-                os.rename(file_path, new_path)
-                renamed_list.append(f"{original_filename} -> {new_filename}")
+        for item, result in zip(plan, results):
+            if isinstance(result, Exception):
+                errors.append(f"{item[2]} 失敗: {str(result)}")
+            else:
+                renamed_list.append(result)
                 success_count += 1
-            except Exception as e:
-                errors.append(f"{original_filename} 失敗: {str(e)}")
 
         result_msg = f"✅ 成功重新命名 {success_count} 個檔案"
         if renamed_list:
@@ -1436,49 +1571,63 @@ async def handle_batch_edit_images(arguments: dict) -> list[TextContent]:
     success_count = 0
     saved_paths = []
     errors = []
+    dir_listings = {}
 
+    # 先依序決定輸出路徑，避免並行處理時取到相同檔名
+    jobs = []  # (file_path, output_path)
     for file_path in image_paths:
         if not os.path.exists(file_path):
             errors.append(f"{file_path} 不存在")
             continue
-        
-        try:
-            with Image.open(file_path) as img:
-                # 處理
-                processed = img
-                
-                # 旋轉 (PIL rotate 是逆時針)
-                if rotate != 0:
-                    processed = processed.rotate(-rotate, expand=True)
-                
-                # 翻轉
-                if flip_h:
-                    processed = processed.transpose(Image.FLIP_LEFT_RIGHT)
-                if flip_v:
-                    processed = processed.transpose(Image.FLIP_TOP_BOTTOM)
-                
-                # 決定儲存路徑
-                if save_as_copy:
-                    directory = os.path.dirname(file_path)
-                    filename = os.path.basename(file_path)
-                    name, ext = os.path.splitext(filename)
-                    output_path = os.path.join(directory, f"{name}_edited{ext}")
-                    
-                    # 避免覆蓋現有
-                    counter = 1
-                    while os.path.exists(output_path):
-                        output_path = os.path.join(directory, f"{name}_edited_{counter}{ext}")
-                        counter += 1
-                else:
-                    output_path = file_path
 
-                # 儲存
-                processed.save(output_path)
-                saved_paths.append(os.path.basename(output_path))
-                success_count += 1
-                
-        except Exception as e:
-            errors.append(f"{os.path.basename(file_path)}: {str(e)}")
+        if save_as_copy:
+            directory = os.path.dirname(file_path)
+            filename = os.path.basename(file_path)
+            name, ext = os.path.splitext(filename)
+
+            # 避免覆蓋現有 (同目錄只列一次檔名)
+            if directory not in dir_listings:
+                dir_listings[directory] = list_dir_names(directory)
+            output_path = get_unique_output_path(
+                directory, f"{name}_edited", ext, dir_listings[directory]
+            )
+        else:
+            output_path = file_path
+
+        jobs.append((file_path, output_path))
+
+    def edit_one(job):
+        file_path, output_path = job
+        with load_image(file_path) as img:
+            # 處理
+            processed = img
+
+            # 旋轉 (rotate 為順時針角度；90 的倍數直接 transpose，無需重採樣)
+            angle = rotate % 360
+            if angle in RIGHT_ANGLE_TRANSPOSE:
+                processed = processed.transpose(RIGHT_ANGLE_TRANSPOSE[angle])
+            elif angle != 0:
+                # PIL rotate 是逆時針
+                processed = processed.rotate(-rotate, expand=True, resample=Image.BICUBIC)
+
+            # 翻轉
+            if flip_h:
+                processed = processed.transpose(Image.FLIP_LEFT_RIGHT)
+            if flip_v:
+                processed = processed.transpose(Image.FLIP_TOP_BOTTOM)
+
+            # 儲存
+            processed.save(output_path)
+        return os.path.basename(output_path)
+
+    results = await run_in_threads(edit_one, jobs)
+
+    for (file_path, _), result in zip(jobs, results):
+        if isinstance(result, Exception):
+            errors.append(f"{os.path.basename(file_path)}: {str(result)}")
+        else:
+            saved_paths.append(result)
+            success_count += 1
 
     result_msg = f"✅ 成功編輯 {success_count} 張圖片"
     if saved_paths:
@@ -1512,15 +1661,9 @@ async def handle_extract_pdf_page(arguments: dict) -> list[TextContent | Embedde
     # 決定輸出路徑
     base_dir = os.path.dirname(clean_path)
     base_name = os.path.splitext(os.path.basename(clean_path))[0]
-    output_filename = f"{base_name}_page_{page_number}.pdf"
-    output_path = os.path.join(base_dir, output_filename)
-    
+
     # 避免覆蓋
-    counter = 1
-    while os.path.exists(output_path):
-        output_filename = f"{base_name}_page_{page_number}_{counter}.pdf"
-        output_path = os.path.join(base_dir, output_filename)
-        counter += 1
+    output_path = get_unique_output_path(base_dir, f"{base_name}_page_{page_number}", ".pdf")
 
     try:
         if output_format.lower() != 'pdf':
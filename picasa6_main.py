@@ -515,18 +515,27 @@ class ImageTool(QMainWindow):
             return
 
         paths = [self.filesList.item(i).text() for i in range(count)]
+        strategy = self.comboStrategy.currentText()
         try:
-            images = [Image.open(p) for p in paths]
+            # 第一輪只讀檔頭取得尺寸，不解碼也不保留開啟的檔案
+            sizes = []
+            for p in paths:
+                with Image.open(p) as img:
+                    sizes.append(img.size)
+            target_size = (min(w for w, h in sizes), min(h for w, h in sizes))
+
+            # 第二輪逐張解碼後立即縮放並關閉原圖，記憶體只保留縮小後的影格；
+            # JPEG 以 draft 在解碼時直接縮小（結果不小於目標尺寸）
+            frames = []
+            for p in paths:
+                with Image.open(p) as img:
+                    img.draft(img.mode, target_size)
+                    img.load()
+                    frames.append(resize_image(img, target_size, strategy))
         except Exception as e:
             QMessageBox.critical(self, "錯誤", f"圖片讀取失敗：{e}")
             return
 
-        min_width = min(img.width for img in images)
-        min_height = min(img.height for img in images)
-        target_size = (min_width, min_height)
-        strategy = self.comboStrategy.currentText()
-        frames = [resize_image(img, target_size, strategy) for img in images]
-
         options = QFileDialog.Options()
         save_path, _ = QFileDialog.getSaveFileName(
             self, "儲存 GIF 動畫", "", "GIF (*.gif)", options=options
@@ -577,7 +586,9 @@ class ImageTool(QMainWindow):
 
         try:
             QMessageBox.information(self, "進度", "開始合併影片，這可能需要一些時間...")
-            final_clip = concatenate_videoclips(clips, method="compose")
+            # 尺寸與 fps 全部相同時依序串接即可，"compose" 會把每一幀重新貼到畫布上
+            same_geometry = all(c.size == clips[0].size and c.fps == clips[0].fps for c in clips)
+            final_clip = concatenate_videoclips(clips, method="chain" if same_geometry else "compose")
             final_clip.write_videofile(output_filename, codec="libx264", audio_codec="aac")
             QMessageBox.information(self, "完成", f"影片成功合併並儲存至\n{output_filename}")
         except Exception as e:
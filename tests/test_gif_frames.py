@@ -0,0 +1,121 @@
+"""
+測試 GIF 影格共用調色盤與寫出
+"""
+import unittest
+import sys
+import os
+import tempfile
+from unittest.mock import patch
+import numpy as np
+from PIL import Image
+
+# 將父目錄加入路徑以便導入模組
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.config import Config
+from utils.image_utils import build_file_palette, fit_gif_size, iter_gif_frames, save_gif, write_gif
+from utils.video_utils import get_ffmpeg_binary, write_gif_ffmpeg
+
+
+class TestGifFrames(unittest.TestCase):
+    """測試 iter_gif_frames 與 write_gif"""
+
+    def setUp(self):
+        """建立不同尺寸與顏色的測試影格"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.images = [
+            Image.new('RGB', (200, 150), color=(255, 0, 0)),
+            Image.new('RGB', (160, 120), color=(0, 255, 0)),
+            Image.new('RGB', (220, 180), color=(0, 0, 255)),
+        ]
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_frames_share_palette(self):
+        """測試所有影格只量化一次至同一份調色盤，且順序與尺寸正確"""
+        palette = build_file_palette(self.images)
+        frames = list(iter_gif_frames(self.images, (160, 120), False, palette))
+
+        self.assertEqual(len(frames), 3)
+        for frame in frames:
+            self.assertEqual(frame.mode, 'P')
+            self.assertEqual(frame.size, (160, 120))
+            self.assertEqual(frame.getpalette(), palette.getpalette())
+        colors = [frame.convert('RGB').getpixel((80, 60)) for frame in frames]
+        self.assertEqual(colors, [(255, 0, 0), (0, 255, 0), (0, 0, 255)])
+
+    def test_without_dither(self):
+        """測試關閉抖色時仍能正確量化"""
+        palette = build_file_palette(self.images)
+        with patch.object(Config, 'GIF_DITHER', False):
+            frames = list(iter_gif_frames(self.images, (160, 120), True, palette))
+        self.assertEqual(frames[1].convert('RGB').getpixel((80, 60)), (0, 255, 0))
+
+    def test_write_gif(self):
+        """測試寫出多影格 GIF"""
+        palette = build_file_palette(self.images)
+        path = os.path.join(self.temp_dir.name, 'out.gif')
+        self.assertTrue(write_gif(iter_gif_frames(self.images, (160, 120), False, palette), path, 100))
+        with Image.open(path) as gif:
+            self.assertEqual(gif.n_frames, 3)
+            self.assertEqual(gif.size, (160, 120))
+
+    def test_write_gif_merges_duplicate_frames(self):
+        """測試相同影格併入前一張的顯示時間，寫出結果與原影格一致"""
+        palette = build_file_palette(self.images)
+        frames = list(iter_gif_frames(self.images, (160, 120), False, palette))
+        frames.insert(1, frames[0].copy())
+        path = os.path.join(self.temp_dir.name, 'dup.gif')
+        self.assertTrue(write_gif(frames, path, 100))
+        with Image.open(path) as gif:
+            self.assertEqual(gif.n_frames, 3)
+            self.assertEqual(gif.info['loop'], 0)
+            self.assertEqual(gif.info['duration'], 200)
+            gif.seek(2)
+            self.assertEqual(gif.convert('RGB').getpixel((80, 60)), (0, 0, 255))
+
+    def test_save_gif_from_array(self):
+        """測試直接以 (N, h, w, 3) 陣列儲存 GIF"""
+        frames = np.zeros((3, 60, 80, 3), dtype=np.uint8)
+        frames[0, ..., 0] = 255
+        frames[1, ..., 1] = 255
+        frames[2, ..., 2] = 255
+        path = os.path.join(self.temp_dir.name, 'array.gif')
+        save_gif(frames, path, 100)
+        with Image.open(path) as gif:
+            self.assertEqual(gif.n_frames, 3)
+            self.assertEqual(gif.size, (80, 60))
+            gif.seek(1)
+            self.assertEqual(gif.convert('RGB').getpixel((40, 30)), (0, 255, 0))
+
+    @unittest.skipUnless(get_ffmpeg_binary(), "需要 ffmpeg")
+    def test_write_gif_ffmpeg(self):
+        """測試以 ffmpeg 編碼 GIF，尺寸不一致時回傳 False 交由 Pillow 處理"""
+        path = os.path.join(self.temp_dir.name, 'ffmpeg.gif')
+        frames = [image.resize((160, 120)) for image in self.images]
+        self.assertTrue(write_gif_ffmpeg(frames, path, 200))
+        with Image.open(path) as gif:
+            self.assertEqual(gif.n_frames, 3)
+            self.assertEqual(gif.size, (160, 120))
+            self.assertEqual(gif.info['duration'], 200)
+            gif.seek(2)
+            self.assertEqual(gif.convert('RGB').getpixel((80, 60)), (0, 0, 255))
+        self.assertFalse(write_gif_ffmpeg(self.images, path, 200))
+
+    def test_fit_gif_size(self):
+        """測試影格尺寸等比例限制在最長邊以內"""
+        self.assertEqual(fit_gif_size((4000, 3000), 480), (480, 360))
+        self.assertEqual(fit_gif_size((300, 1200), 480), (120, 480))
+        self.assertEqual(fit_gif_size((160, 120), 480), (160, 120))
+        self.assertEqual(fit_gif_size((4000, 3000), 0), (4000, 3000))
+
+    def test_write_gif_empty(self):
+        """測試沒有影格時不寫出檔案"""
+        path = os.path.join(self.temp_dir.name, 'empty.gif')
+        self.assertFalse(write_gif(iter([]), path, 100))
+        self.assertFalse(os.path.exists(path))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+"""
+測試單一圖片壓縮
+"""
+import unittest
+import sys
+import os
+import tempfile
+from PIL import Image
+
+# 將父目錄加入路徑以便導入模組
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.image_utils import compress_image_file, scan_file_sizes
+
+
+class TestImageCompress(unittest.TestCase):
+    """測試 compress_image_file 與 scan_file_sizes"""
+
+    def setUp(self):
+        """建立含透明度的測試圖片"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.out_dir = os.path.join(self.temp_dir.name, 'out')
+        os.makedirs(self.out_dir)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _save(self, filename, image):
+        path = os.path.join(self.temp_dir.name, filename)
+        image.save(path)
+        return path
+
+    def test_transparent_to_jpeg(self):
+        """測試 RGBA 與 LA 轉 JPEG 時，透明區域以白色填滿"""
+        for name, image in [
+            ('rgba.png', Image.new('RGBA', (64, 48), (255, 0, 0, 0))),
+            ('la.png', Image.new('LA', (64, 48), (0, 0))),
+        ]:
+            with self.subTest(name=name):
+                path = self._save(name, image)
+                ok, orig_size, comp_size, error = compress_image_file(path, 85, 'jpg', self.out_dir)
+                self.assertTrue(ok, error)
+                self.assertEqual(orig_size, os.path.getsize(path))
+                save_path = os.path.join(self.out_dir, f"{os.path.splitext(name)[0]}_compressed.jpg")
+                self.assertEqual(comp_size, os.path.getsize(save_path))
+                with Image.open(save_path) as result:
+                    self.assertEqual(result.mode, 'RGB')
+                    self.assertGreater(min(result.getpixel((32, 24))), 250)
+
+    def test_scan_file_sizes(self):
+        """測試一次掃描資料夾取得大小，並可傳入壓縮函式；不存在的檔案略過"""
+        paths = [
+            self._save('a.png', Image.new('RGB', (40, 30), (10, 20, 30))),
+            self._save('b.bmp', Image.new('RGB', (20, 10), (200, 0, 0))),
+        ]
+        missing = os.path.join(self.temp_dir.name, 'missing.png')
+        sizes = scan_file_sizes(paths + [missing])
+        self.assertEqual(sizes, {path: os.path.getsize(path) for path in paths})
+
+        for path in paths:
+            ext = os.path.splitext(path)[1][1:]
+            with self.subTest(ext=ext):
+                ok, orig_size, comp_size, error = compress_image_file(path, 80, ext, self.out_dir, sizes[path])
+                self.assertTrue(ok, error)
+                self.assertEqual(orig_size, sizes[path])
+                save_path = os.path.join(self.out_dir, f"{os.path.splitext(os.path.basename(path))[0]}_compressed.{ext}")
+                self.assertEqual(comp_size, os.path.getsize(save_path))
+
+    def test_same_folder_and_failure(self):
+        """測試未指定輸出資料夾時存回原資料夾，無效檔案回傳失敗"""
+        path = self._save('plain.png', Image.new('RGB', (32, 32), (0, 128, 255)))
+        ok, _, _, _ = compress_image_file(path, 80, 'webp')
+        self.assertTrue(ok)
+        self.assertTrue(os.path.exists(os.path.join(self.temp_dir.name, 'plain_compressed.webp')))
+
+        bad = os.path.join(self.temp_dir.name, 'bad.png')
+        with open(bad, 'wb') as f:
+            f.write(b'not an image')
+        ok, _, _, error = compress_image_file(bad, 80, 'jpg')
+        self.assertFalse(ok)
+        self.assertTrue(error)
+
+
+if __name__ == '__main__':
+    unittest.main()
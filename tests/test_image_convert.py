@@ -0,0 +1,159 @@
+"""
+測試單一圖片格式轉換
+"""
+import unittest
+import sys
+import os
+import tempfile
+from unittest.mock import patch
+from PIL import Image, JpegImagePlugin
+
+# 將父目錄加入路徑以便導入模組
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import image_utils
+from utils.config import Config
+from utils.image_utils import convert_image_file
+
+# libjpeg-turbo 的常數值；未安裝 PyTurboJPEG 時以這些值補上，測試仍可涵蓋 TurboJPEG 分支
+_TURBO_CONSTANTS = {'TJFLAG_PROGRESSIVE': 16384, 'TJPF_BGR': 1, 'TJPF_GRAY': 6,
+                    'TJSAMP_420': 2, 'TJSAMP_GRAY': 3}
+
+
+class FakeTurboJPEG:
+    """模擬 TurboJPEG：以 Pillow 讀取檔頭，記錄編碼參數並回傳固定內容"""
+
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.encode_kwargs = None
+
+    def decode_header(self, data):
+        import io
+        with Image.open(io.BytesIO(data)) as img:
+            subsample = _TURBO_CONSTANTS['TJSAMP_GRAY'] if img.mode == 'L' else _TURBO_CONSTANTS['TJSAMP_420']
+            return img.width, img.height, subsample, 0
+
+    def decode(self, data, pixel_format=None):
+        if self.fail:
+            raise OSError("Unsupported color conversion request")
+        return data
+
+    def encode(self, pixels, **kwargs):
+        self.encode_kwargs = kwargs
+        return b'turbo-encoded'
+
+
+class TestImageConvert(unittest.TestCase):
+    """測試 convert_image_file"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_alpha_and_palette_to_jpeg(self):
+        """測試含透明度與調色盤的圖片可轉為 JPEG，透明區域為白色"""
+        for name, image in [
+            ('rgba.png', Image.new('RGBA', (40, 30), (255, 0, 0, 0))),
+            ('palette.gif', Image.new('P', (40, 30), 0)),
+        ]:
+            with self.subTest(name=name):
+                path = os.path.join(self.temp_dir.name, name)
+                image.save(path)
+                ok, error = convert_image_file(path, 'jpg')
+                self.assertTrue(ok, error)
+                with Image.open(os.path.splitext(path)[0] + '.jpg') as result:
+                    self.assertEqual(result.mode, 'RGB')
+                    self.assertEqual(result.size, (40, 30))
+
+        with Image.open(os.path.join(self.temp_dir.name, 'rgba.jpg')) as result:
+            self.assertGreater(min(result.getpixel((20, 15))), 250)
+
+    def test_max_size(self):
+        """測試指定尺寸上限時保持比例縮小，JPEG 先以 draft 在解碼時縮小"""
+        original_draft = JpegImagePlugin.JpegImageFile.draft
+        decoded_sizes = []
+
+        def draft(img, mode, size):
+            result = original_draft(img, mode, size)
+            decoded_sizes.append(img.size)
+            return result
+
+        path = os.path.join(self.temp_dir.name, 'large.jpg')
+        Image.new('RGB', (1600, 800), (0, 0, 255)).save(path)
+        with patch.object(JpegImagePlugin.JpegImageFile, 'draft', draft):
+            ok, error = convert_image_file(path, 'png', max_size=(200, 200))
+        self.assertTrue(ok, error)
+        # libjpeg 以 1/4 比例解碼（仍不小於目標尺寸），再由 thumbnail 縮至目標
+        # （thumbnail 內部會再呼叫一次 draft，此時已無法再縮小）
+        self.assertEqual(decoded_sizes[0], (400, 200))
+        with Image.open(os.path.join(self.temp_dir.name, 'large.png')) as result:
+            self.assertEqual(result.size, (200, 100))
+
+        # 未超過上限時維持原尺寸
+        ok, error = convert_image_file(path, 'webp', max_size=(2000, 2000))
+        self.assertTrue(ok, error)
+        with Image.open(os.path.join(self.temp_dir.name, 'large.webp')) as result:
+            self.assertEqual(result.size, (1600, 800))
+
+
+class TestTurboJpegConvert(unittest.TestCase):
+    """測試 JPEG 轉 JPEG 的 TurboJPEG 分支"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.out_dir = os.path.join(self.temp_dir.name, 'out')
+        os.makedirs(self.out_dir)
+        for name, value in _TURBO_CONSTANTS.items():
+            if not hasattr(image_utils, name):
+                patcher = patch.object(image_utils, name, value, create=True)
+                patcher.start()
+                self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _convert(self, turbo, image, name='source.jpg'):
+        path = os.path.join(self.temp_dir.name, name)
+        image.save(path)
+        with patch.object(image_utils, '_get_turbo_jpeg', return_value=turbo):
+            ok, error = convert_image_file(path, 'jpg', self.out_dir)
+        self.assertTrue(ok, error)
+        return os.path.join(self.out_dir, name)
+
+    def test_progressive_flag(self):
+        """測試設定要求漸進式時以 TJFLAG_PROGRESSIVE 編碼"""
+        turbo = FakeTurboJPEG()
+        out = self._convert(turbo, Image.new('RGB', (32, 24), (255, 0, 0)))
+        with open(out, 'rb') as f:
+            self.assertEqual(f.read(), b'turbo-encoded')
+        self.assertEqual(turbo.encode_kwargs['flags'], image_utils.TJFLAG_PROGRESSIVE)
+        self.assertEqual(turbo.encode_kwargs['jpeg_subsample'], image_utils.TJSAMP_420)
+
+    def test_grayscale_stays_single_channel(self):
+        """測試灰階來源以單通道編碼"""
+        turbo = FakeTurboJPEG()
+        self._convert(turbo, Image.new('L', (32, 24), 128))
+        self.assertEqual(turbo.encode_kwargs['pixel_format'], image_utils.TJPF_GRAY)
+        self.assertEqual(turbo.encode_kwargs['jpeg_subsample'], image_utils.TJSAMP_GRAY)
+
+    def test_turbo_failure_falls_back_to_pillow(self):
+        """測試 libjpeg-turbo 無法解碼（例如 CMYK）時改以 Pillow 轉換"""
+        out = self._convert(FakeTurboJPEG(fail=True), Image.new('CMYK', (32, 24), (0, 255, 255, 0)))
+        with Image.open(out) as result:
+            self.assertEqual(result.mode, 'CMYK')
+            self.assertTrue(result.info.get('progressive'))
+
+    def test_unsupported_options_use_pillow(self):
+        """測試只要求 optimize 時 TurboJPEG 無法對應，改由 Pillow 編碼"""
+        turbo = FakeTurboJPEG()
+        with patch.dict(Config.CONVERT_SAVE_OPTIONS, {'JPEG': {'optimize': True}}):
+            out = self._convert(turbo, Image.new('RGB', (32, 24), (0, 0, 255)))
+        self.assertIsNone(turbo.encode_kwargs)
+        with Image.open(out) as result:
+            self.assertEqual(result.format, 'JPEG')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+"""
+測試逐張縮放與網格拼接
+"""
+import unittest
+import sys
+import os
+import tempfile
+from PIL import Image
+
+# 將父目錄加入路徑以便導入模組
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.image_utils import iter_resized_images, compose_grid
+
+
+class TestImageGrid(unittest.TestCase):
+    """測試 iter_resized_images 與 compose_grid"""
+
+    def setUp(self):
+        """建立不同尺寸的測試圖片，其中一張存成 JPEG 檔"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.jpeg_path = os.path.join(self.temp_dir.name, 'large.jpg')
+        Image.new('RGB', (1600, 1200), color=(0, 0, 255)).save(self.jpeg_path, quality=95)
+        self.sources = [
+            Image.new('RGB', (200, 150), color=(255, 0, 0)),
+            Image.new('RGBA', (100, 100), color=(0, 255, 0, 255)),
+            self.jpeg_path,
+        ]
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_iter_resized_images_order_and_size(self):
+        """測試縮放結果順序與輸入相同，且皆為目標尺寸"""
+        tiles = list(iter_resized_images(self.sources, (80, 60), False))
+        self.assertEqual([tile.size for tile in tiles], [(80, 60)] * 3)
+        self.assertEqual(tiles[0].convert('RGB').getpixel((40, 30)), (255, 0, 0))
+        self.assertGreater(tiles[2].convert('RGB').getpixel((40, 30))[2], 200)
+
+    def test_iter_resized_images_padding(self):
+        """測試保持比例補白的縮放"""
+        tiles = list(iter_resized_images(self.sources[1:2], (80, 60), True))
+        self.assertEqual(tiles[0].size, (80, 60))
+        self.assertEqual(tiles[0].getpixel((0, 30)), (255, 255, 255))
+        self.assertEqual(tiles[0].getpixel((40, 30)), (0, 255, 0))
+
+    def test_iter_resized_images_padding_jpeg(self):
+        """測試 JPEG 以較小的 draft 比例解碼後，補白結果仍正確"""
+        tiles = list(iter_resized_images([self.jpeg_path], (80, 80), True))
+        self.assertEqual(tiles[0].size, (80, 80))
+        self.assertEqual(tiles[0].getpixel((40, 2)), (255, 255, 255))
+        self.assertGreater(tiles[0].getpixel((40, 40))[2], 200)
+
+    def test_compose_grid_from_generator(self):
+        """測試 compose_grid 可直接接收逐張產出的圖片"""
+        tiles = iter_resized_images(self.sources, (80, 60), False)
+        merged = compose_grid(tiles, 2, 2, (80, 60), 10, (0, 0, 0))
+        self.assertEqual(merged.size, (2 * 80 + 3 * 10, 2 * 60 + 3 * 10))
+        self.assertEqual(merged.getpixel((50, 40)), (255, 0, 0))
+        self.assertEqual(merged.getpixel((140, 40)), (0, 255, 0))
+        # 第四格沒有圖片，保留背景色
+        self.assertEqual(merged.getpixel((140, 110)), (0, 0, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+"""
+測試只讀取檔頭的圖片尺寸解析
+"""
+import unittest
+import sys
+import os
+import tempfile
+from PIL import Image
+
+# 將父目錄加入路徑以便導入模組
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.image_utils import get_image_size
+
+
+class TestImageHeader(unittest.TestCase):
+    """測試 get_image_size"""
+
+    def setUp(self):
+        """建立測試用的圖片"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.image = Image.new('RGB', (321, 123), color=(10, 20, 30))
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _save(self, filename, **kwargs):
+        path = os.path.join(self.temp_dir.name, filename)
+        self.image.save(path, **kwargs)
+        return path
+
+    def test_png_size(self):
+        """測試 PNG 由 IHDR 取得尺寸"""
+        path = self._save('test.png')
+        self.assertEqual(tuple(get_image_size(path)), (321, 123))
+
+    def test_jpeg_size(self):
+        """測試 JPEG 由 SOF 標記取得尺寸"""
+        path = self._save('test.jpg', quality=90)
+        self.assertEqual(get_image_size(path), (321, 123))
+
+    def test_progressive_jpeg_size(self):
+        """測試漸進式 JPEG"""
+        path = self._save('test_progressive.jpg', progressive=True)
+        self.assertEqual(get_image_size(path), (321, 123))
+
+    def test_gif_size(self):
+        """測試 GIF 由邏輯畫面描述取得尺寸"""
+        path = self._save('test.gif')
+        self.assertEqual(get_image_size(path), (321, 123))
+
+    def test_bmp_size(self):
+        """測試 BMP 由 BITMAPINFOHEADER 取得尺寸"""
+        path = self._save('test.bmp')
+        self.assertEqual(get_image_size(path), (321, 123))
+
+    def test_webp_size(self):
+        """測試 WebP 有損、無損與含透明 (VP8X) 格式"""
+        for name, image, kwargs in [
+            ('lossy.webp', self.image, {}),
+            ('lossless.webp', self.image, {'lossless': True}),
+            ('alpha.webp', self.image.convert('RGBA'), {}),
+        ]:
+            with self.subTest(name=name):
+                path = os.path.join(self.temp_dir.name, name)
+                image.save(path, **kwargs)
+                self.assertEqual(tuple(get_image_size(path)), (321, 123))
+
+    def test_other_format_fallback(self):
+        """測試其他格式交由 PIL 解析"""
+        path = self._save('test.tiff')
+        self.assertEqual(get_image_size(path), (321, 123))
+
+
+if __name__ == '__main__':
+    unittest.main()
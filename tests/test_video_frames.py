@@ -0,0 +1,119 @@
+"""
+測試影片片段逐幀擷取
+"""
+import unittest
+import sys
+import os
+import random
+import subprocess
+import tempfile
+import threading
+from unittest.mock import patch
+
+# 將父目錄加入路徑以便導入模組
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import video_utils
+from utils.video_utils import get_ffmpeg_binary, iter_clip_frames, iter_sampled_frames
+
+
+@unittest.skipUnless(get_ffmpeg_binary(), "需要 ffmpeg")
+class TestClipFrames(unittest.TestCase):
+    """測試 iter_clip_frames"""
+
+    @classmethod
+    def setUpClass(cls):
+        """以 ffmpeg 產生 4 秒、25 fps、320x240 的測試影片"""
+        cls.temp_dir = tempfile.TemporaryDirectory()
+        cls.video_path = os.path.join(cls.temp_dir.name, 'clip.mp4')
+        subprocess.run(
+            [get_ffmpeg_binary(), '-hide_banner', '-loglevel', 'error', '-y',
+             '-f', 'lavfi', '-i', 'testsrc=duration=4:size=320x240:rate=25',
+             '-pix_fmt', 'yuv420p', cls.video_path],
+            check=True
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.temp_dir.cleanup()
+
+    def _check_frames(self):
+        frames = list(iter_clip_frames(self.video_path, 1, 3, 10, 160))
+        self.assertEqual(len(frames), 20)
+        self.assertTrue(all(frame.size == (160, 120) and frame.mode == 'RGB' for frame in frames))
+
+        # 輸出 fps 高於影片時重複影格補足時間點
+        self.assertEqual(len(list(iter_clip_frames(self.video_path, 0, 1, 50))), 50)
+
+    def test_pyav(self):
+        """測試 PyAV 在行程內解碼與縮放"""
+        if not video_utils.HAS_PYAV:
+            self.skipTest("需要 PyAV")
+        self._check_frames()
+
+    def test_ffmpeg(self):
+        """測試未安裝 PyAV 時改以 ffmpeg 的 fps 與 scale 濾鏡處理"""
+        with patch.object(video_utils, 'HAS_PYAV', False):
+            self._check_frames()
+
+
+@unittest.skipUnless(get_ffmpeg_binary(), "需要 ffmpeg")
+class TestCorruptVideoFrames(unittest.TestCase):
+    """測試損毀影片輸出大量 stderr 時 ffmpeg 路徑不會卡住"""
+
+    @classmethod
+    def setUpClass(cls):
+        """產生 40 秒的 H.264 串流並隨機破壞部分位元組，解碼時會輸出超過 64 KB 的錯誤訊息"""
+        cls.temp_dir = tempfile.TemporaryDirectory()
+        raw_path = os.path.join(cls.temp_dir.name, 'corrupt.h264')
+        cls.video_path = os.path.join(cls.temp_dir.name, 'corrupt.mkv')
+        ffmpeg = get_ffmpeg_binary()
+        subprocess.run(
+            [ffmpeg, '-hide_banner', '-loglevel', 'error', '-y',
+             '-f', 'lavfi', '-i', 'testsrc2=duration=40:size=160x120:rate=50',
+             '-c:v', 'libx264', '-preset', 'ultrafast', '-f', 'h264', raw_path],
+            check=True
+        )
+        with open(raw_path, 'rb') as f:
+            data = bytearray(f.read())
+        rng = random.Random(0)
+        for _ in range(len(data) // 200):
+            data[rng.randrange(1000, len(data))] = rng.randrange(256)
+        with open(raw_path, 'wb') as f:
+            f.write(data)
+        # 封裝進 mkv 讓串流帶有時間戳，-ss / -t 才能定位
+        subprocess.run(
+            [ffmpeg, '-hide_banner', '-loglevel', 'quiet', '-y', '-r', '50', '-i', raw_path,
+             '-c', 'copy', cls.video_path],
+            check=True
+        )
+        result = subprocess.run(
+            [ffmpeg, '-hide_banner', '-loglevel', 'error', '-nostats', '-i', cls.video_path,
+             '-f', 'null', '-'],
+            capture_output=True
+        )
+        cls.stderr_size = len(result.stderr)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.temp_dir.cleanup()
+
+    def _collect(self, frames):
+        """在背景執行緒讀完所有影格，逾時視為 ffmpeg 卡在寫入 stderr"""
+        result = []
+        thread = threading.Thread(target=lambda: result.extend(frames), daemon=True)
+        thread.start()
+        thread.join(30)
+        self.assertFalse(thread.is_alive(), "ffmpeg 卡住未結束")
+        return result
+
+    def test_large_stderr(self):
+        """測試 stderr 超過管線緩衝區大小時仍能讀完影格"""
+        self.assertGreater(self.stderr_size, 64 * 1024)
+        with patch.object(video_utils, 'HAS_PYAV', False):
+            self.assertTrue(self._collect(iter_clip_frames(self.video_path, 0, 30, 5, 80)))
+            self.assertTrue(self._collect(iter_sampled_frames(self.video_path, 1, 80)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,17 @@
 """
 工具函數模組
 """
-from .image_utils import resize_with_padding, resize_image, get_resample_filter
+from .image_utils import (
+    resize_with_padding, resize_image, resize_images, iter_resized_images, get_resample_filter,
+    get_gif_resample_filter, fit_gif_size, is_padding_strategy, compose_grid, quantize_frames, save_gif, write_gif,
+    optimize_gif, build_file_palette, iter_gif_frames, get_image_size, convert_image_file,
+    compress_image_file, scan_file_sizes, get_image_backends
+)
+from .video_utils import (
+    get_ffmpeg_binary, has_encoder, can_stream_concat, concat_videos_copy, concat_videos_nvenc,
+    concat_videos_qsv, concat_videos_reencode, can_hw_encode,
+    iter_sampled_frames, iter_clip_frames, write_gif_ffmpeg
+)
 from .config import Config
 from .modern_style import ModernStyle
 from .drag_drop import DragDropListWidget
@@ -20,7 +30,35 @@ from .config_manager import ConfigManager, get_config_manager
 __all__ = [
     'resize_with_padding',
     'resize_image',
+    'resize_images',
+    'iter_resized_images',
     'get_resample_filter',
+    'get_gif_resample_filter',
+    'fit_gif_size',
+    'is_padding_strategy',
+    'compose_grid',
+    'quantize_frames',
+    'save_gif',
+    'write_gif',
+    'optimize_gif',
+    'build_file_palette',
+    'iter_gif_frames',
+    'get_image_size',
+    'get_image_backends',
+    'convert_image_file',
+    'compress_image_file',
+    'scan_file_sizes',
+    'get_ffmpeg_binary',
+    'can_stream_concat',
+    'concat_videos_copy',
+    'concat_videos_nvenc',
+    'concat_videos_qsv',
+    'concat_videos_reencode',
+    'can_hw_encode',
+    'iter_sampled_frames',
+    'iter_clip_frames',
+    'write_gif_ffmpeg',
+    'has_encoder',
     'Config',
     'ModernStyle',
     'DragDropListWidget',
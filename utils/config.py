@@ -15,7 +15,16 @@ class Config:
     DEFAULT_GRID_COLS = 2
     DEFAULT_GRID_ROWS = 2
     DEFAULT_IMAGE_GAP = 15
+    MERGE_TILE_CACHE_MB = 256  # 拼接時已縮放圖片的快取上限，調整行列數重新拼接時不必重新解碼
     DEFAULT_GIF_DURATION = 500  # 毫秒
+    GIF_PALETTE_COLORS = 256  # GIF 共用調色盤顏色數，降低可縮小檔案但會增加色階
+    # 以 ffmpeg 的 palettegen/paletteuse 編碼 GIF（找不到 ffmpeg 時仍用 Pillow）。螢幕錄影、動畫等色塊為主的內容
+    # 較快且檔案約小一半；照片類內容調色盤較細、檔案反而較大且慢數倍，因此預設關閉
+    GIF_USE_FFMPEG = False
+    GIF_USE_GIFSICLE = False  # 已安裝 gifsicle 時於寫出後再以 -O3 最佳化，通常可再縮小 30% 以上
+    GIF_GIFSICLE_LOSSY = 30  # gifsicle --lossy 強度（需 1.92 以上），0 表示只做無損最佳化
+    GIF_MAX_EDGE = 1280  # GIF 影格最長邊上限（像素），超過時等比例縮小，0 表示維持原尺寸
+    GIF_DITHER = True  # 量化時以 Floyd-Steinberg 抖色；關閉後量化約快 5 倍，但漸層可能出現色帶
     DEFAULT_BG_COLOR = (255, 255, 255)  # 白色
 
     # 縮放策略
@@ -23,8 +32,22 @@ class Config:
     RESIZE_STRATEGY_PADDING = "保持比例補白"
     RESIZE_STRATEGIES = [RESIZE_STRATEGY_DIRECT, RESIZE_STRATEGY_PADDING]
 
+    # GIF 縮放品質（影格會量化為調色盤，快速模式通常看不出差異）
+    GIF_RESAMPLE_FAST = "快速 (Bilinear)"
+    GIF_RESAMPLE_QUALITY = "高品質 (Lanczos)"
+    GIF_RESAMPLE_OPTIONS = [GIF_RESAMPLE_FAST, GIF_RESAMPLE_QUALITY]
+
     # 支援的圖片格式
     SUPPORTED_IMAGE_FORMATS = ['JPG', 'PNG', 'WEBP', 'BMP', 'GIF']
+    CONVERT_PROCESS_MIN_FILES = 16  # 格式轉換與壓縮的檔案數達此值才改用多行程，較少時以執行緒並行
+    CONVERT_IO_WORKERS = 1  # 格式轉換與壓縮時比 CPU 核心數多開的並行數，讀寫磁碟與編解碼可重疊
+    DEFAULT_CONVERT_MAX_EDGE = 0  # 格式轉換時輸出的最長邊上限（像素），超過時等比例縮小，0 表示維持原尺寸
+    # 格式轉換時各格式的儲存參數（直接傳給 PIL Image.save）
+    CONVERT_SAVE_OPTIONS = {
+        'JPEG': {'optimize': True, 'progressive': True},
+        'PNG': {'optimize': True},
+        'WEBP': {'method': 4, 'quality': 85},  # method 0~6，越大越慢但檔案越小
+    }
     IMAGE_FILE_FILTER = "Image Files (*.jpg *.jpeg *.png *.bmp *.gif *.webp)"
 
     # 支援的影片格式
@@ -34,6 +57,7 @@ class Config:
     # 影片編碼設定
     VIDEO_CODEC = "libx264"
     AUDIO_CODEC = "aac"
+    FFMPEG_PRESET = "veryfast"  # x264 編碼速度：ultrafast ~ veryslow，越快檔案越大
 
     # UI 文字
     UI_TEXT = {
@@ -23,6 +23,8 @@ class ConfigManager:
         self.config_file = os.path.join(self.config_dir, "config.json")
         self.default_config = self._get_default_config()
         self.config = self.load_config()
+        # 記憶體中的設定是否有尚未寫入檔案的變更；尚無設定檔時需寫出一次
+        self._dirty = not os.path.exists(self.config_file)
 
     def _get_config_dir(self):
         """取得配置目錄路徑"""
@@ -57,6 +59,7 @@ class ConfigManager:
                 "grid_rows": 3,
                 "resize_strategy": "直接縮放",
                 "gif_duration": 500,
+                "gif_resample": "快速 (Bilinear)",
                 "last_folder": ""
             },
 
@@ -70,6 +73,7 @@ class ConfigManager:
             "convert": {
                 "output_format": "PNG",
                 "output_folder": "converted_images",
+                "max_edge": 0,
                 "last_folder": ""
             },
 
@@ -125,11 +129,14 @@ class ConfigManager:
 
         return merged
 
-    def save_config(self):
-        """保存配置文件"""
+    def save_config(self, force=False):
+        """保存配置文件（沒有變更時略過寫檔，force=True 則一律寫出）"""
+        if not self._dirty and not force:
+            return True
         try:
             with open(self.config_file, 'w', encoding='utf-8') as f:
                 json.dump(self.config, f, indent=2, ensure_ascii=False)
+            self._dirty = False
             logger.info(f"✓ 配置已保存: {self.config_file}")
             return True
         except Exception as e:
@@ -153,6 +160,28 @@ class ConfigManager:
 
     def set(self, key, value, auto_save=True):
         """設定配置值（支援點號路徑）"""
+        self._set_value(key, value)
+
+        # 自動保存
+        if auto_save:
+            self.save_config()
+
+    def set_many(self, values, auto_save=True):
+        """
+        一次設定多個配置值，最多只寫檔一次
+
+        Args:
+            values: {點號路徑: 值} 的字典
+            auto_save: 是否在設定後保存
+        """
+        for key, value in values.items():
+            self._set_value(key, value)
+
+        if auto_save:
+            self.save_config()
+
+    def _set_value(self, key, value):
+        """設定單一配置值，值有變動時標記為待保存"""
         keys = key.split('.')
         config = self.config
 
@@ -163,11 +192,9 @@ class ConfigManager:
             config = config[k]
 
         # 設定值
-        config[keys[-1]] = value
-
-        # 自動保存
-        if auto_save:
-            self.save_config()
+        if keys[-1] not in config or config[keys[-1]] != value:
+            config[keys[-1]] = value
+            self._dirty = True
 
     def add_recent_file(self, file_path, file_type="image"):
         """添加最近使用的文件"""
@@ -186,6 +213,7 @@ class ConfigManager:
 
         # 限制數量
         self.config["recent"]["files"] = recent[:max_items]
+        self._dirty = True
         self.save_config()
 
     def get_recent_files(self, file_type=None):
@@ -200,12 +228,13 @@ class ConfigManager:
     def clear_recent(self):
         """清空最近使用記錄"""
         self.config["recent"]["files"] = []
+        self._dirty = True
         self.save_config()
 
     def reset_to_default(self):
         """重置為預設配置"""
         self.config = self._get_default_config()
-        self.save_config()
+        self.save_config(force=True)
         logger.info("✓ 配置已重置為預設值")
 
 
@@ -3,12 +3,14 @@
 支援 Word ↔ PDF 雙向轉換和 PDF 合併
 """
 import os
+import importlib.util
 import platform
 import subprocess
 import shutil
 import shutil
 import tempfile
 import logging
+from contextlib import ExitStack
 
 # 設定 logger
 logger = logging.getLogger(__name__)
@@ -22,20 +24,17 @@ except ImportError:
     HAS_PYPDF = False
     logger.warning("警告: pypdf 未安裝，PDF 功能將受限")
 
-# Word 轉 PDF
-try:
-    import docx2pdf
-    HAS_DOCX2PDF = True
-except ImportError:
-    HAS_DOCX2PDF = False
+# pikepdf (QPDF)：頁面以物件參照方式複製，不需重新解析內容串流；只在擷取頁面時才匯入
+HAS_PIKEPDF = importlib.util.find_spec("pikepdf") is not None
+
+# Word 轉 PDF、PDF 轉 Word：兩者匯入時會連帶載入大量套件（pdf2docx 需 PyMuPDF 與 OpenCV，
+# docx2pdf 在 Windows 上需 pywin32），啟動時只確認是否安裝，實際轉換時才匯入
+HAS_DOCX2PDF = importlib.util.find_spec("docx2pdf") is not None
+if not HAS_DOCX2PDF:
     logger.warning("警告: docx2pdf 未安裝，Word 轉 PDF 功能將受限")
 
-# PDF 轉 Word
-try:
-    from pdf2docx import Converter
-    HAS_PDF2DOCX = True
-except ImportError:
-    HAS_PDF2DOCX = False
+HAS_PDF2DOCX = importlib.util.find_spec("pdf2docx") is not None
+if not HAS_PDF2DOCX:
     logger.warning("警告: pdf2docx 未安裝，PDF 轉 Word 功能將受限")
 
 # ReportLab (PDF 生成)
@@ -62,6 +61,7 @@ def check_dependencies():
     """檢查依賴項是否已安裝"""
     return {
         'pypdf': HAS_PYPDF,
+        'pikepdf': HAS_PIKEPDF,
         'docx2pdf': HAS_DOCX2PDF,
         'pdf2docx': HAS_PDF2DOCX,
         'reportlab': HAS_REPORTLAB,
@@ -218,6 +218,7 @@ def convert_word_to_pdf(word_path, pdf_path):
     # 方法1: 使用 docx2pdf
     try:
         logger.info("使用 docx2pdf 轉換...")
+        import docx2pdf
         docx2pdf.convert(word_path, pdf_path)
         if os.path.exists(pdf_path) and os.path.getsize(pdf_path) > 0:
             logger.info("轉換成功!")
@@ -284,6 +285,7 @@ def convert_pdf_to_word(pdf_path, word_path, password=None):
         source_pdf, temp_pdf = ensure_unlocked_pdf(pdf_path, password=password)
         logger.info(f"開始轉換: {pdf_path} -> {word_path}")
 
+        from pdf2docx import Converter
         cv = Converter(source_pdf)
         cv.convert(word_path, start=0, end=None)
         cv.close()
@@ -338,7 +340,10 @@ def merge_pdfs(pdf_files, output_path, add_toc=False, add_page_numbers=False):
         if add_toc or add_page_numbers:
             return _merge_pdfs_with_extras(pdf_files, output_path, add_toc, add_page_numbers)
 
-        # 簡單合併
+        # 簡單合併：優先使用 pikepdf，頁面以物件參照附加，不經 Python 逐一重建物件
+        if HAS_PIKEPDF:
+            return _merge_pdfs_pikepdf(pdf_files, output_path)
+
         merger = pypdf.PdfWriter()
 
         for pdf_file in pdf_files:
@@ -365,6 +370,31 @@ def merge_pdfs(pdf_files, output_path, add_toc=False, add_page_numbers=False):
         return False
 
 
+def _merge_pdfs_pikepdf(pdf_files, output_path):
+    """以 pikepdf 合併 PDF；來源檔須保持開啟至寫出完成"""
+    import pikepdf
+
+    with ExitStack() as stack:
+        merged = stack.enter_context(pikepdf.new())
+        for pdf_file in pdf_files:
+            if not os.path.exists(pdf_file):
+                logger.warning(f"警告: 文件不存在: {pdf_file}")
+                continue
+
+            try:
+                src = stack.enter_context(pikepdf.open(pdf_file))
+                merged.pages.extend(src.pages)
+                logger.info(f"✓ 已添加: {os.path.basename(pdf_file)}")
+            except Exception as e:
+                logger.error(f"✗ 無法處理: {os.path.basename(pdf_file)} - {e}")
+
+        merged.save(output_path, linearize=False,
+                    object_stream_mode=pikepdf.ObjectStreamMode.generate)
+
+    logger.info(f"合併完成: {output_path}")
+    return True
+
+
 def _merge_pdfs_with_extras(pdf_files, output_path, add_toc, add_page_numbers):
     """
     合併 PDF 並添加目錄和/或頁碼
@@ -785,7 +815,7 @@ def add_image_watermark_to_pdf(input_path, output_path, watermark_image_path,
 
             # 調整透明度
             if opacity < 1.0:
-                alpha = watermark_img.split()[3]
+                alpha = watermark_img.getchannel('A')
                 alpha = alpha.point(lambda p: int(p * opacity))
                 watermark_img.putalpha(alpha)
 
@@ -857,6 +887,27 @@ def extract_page(pdf_path, page_number, output_path):
         bool: 是否成功
     """
     try:
+        if HAS_PIKEPDF:
+            # 優先使用 pikepdf：只複製該頁的物件圖，不重新編碼內容
+            import pikepdf
+            with pikepdf.open(pdf_path) as src:
+                total_pages = len(src.pages)
+                if page_number < 1 or page_number > total_pages:
+                    logger.error(f"頁碼超出範圍: {page_number} (總頁數: {total_pages})")
+                    return False
+
+                # 新文件也需關閉，否則檔案代碼保留到垃圾回收，Windows 上輸出檔會一直被鎖定
+                with pikepdf.new() as dst:
+                    dst.pages.append(src.pages[page_number - 1])
+                    dst.save(
+                        output_path,
+                        linearize=False,
+                        object_stream_mode=pikepdf.ObjectStreamMode.generate
+                    )
+
+            logger.info(f"已提取第 {page_number} 頁至: {output_path}")
+            return True
+
         reader = pypdf.PdfReader(pdf_path)
         total_pages = len(reader.pages)
         
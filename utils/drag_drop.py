@@ -3,10 +3,14 @@
 提供拖放檔案和資料夾的功能
 """
 import os
+from natsort import natsort_keygen
 from PyQt5.QtCore import Qt, pyqtSignal
 from PyQt5.QtWidgets import QListWidget
 from PyQt5.QtGui import QDragEnterEvent, QDropEvent
 
+# 預先建立的自然排序鍵，避免每次排序都重新產生
+_NAT_KEY = natsort_keygen()
+
 
 class DragDropListWidget(QListWidget):
     """支援拖放的清單小工具"""
@@ -120,8 +124,10 @@ class DragDropListWidget(QListWidget):
         skipped_files = []
 
         try:
+            # 依自然排序走訪，拖入資料夾後的檔案順序與檔案總管一致
             for root, dirs, files in os.walk(directory):
-                for filename in files:
+                dirs.sort(key=_NAT_KEY)
+                for filename in sorted(files, key=_NAT_KEY):
                     file_path = os.path.join(root, filename)
                     if self._is_valid_file(file_path):
                         valid_files.append(file_path)
@@ -155,26 +161,23 @@ class DragDropListWidget(QListWidget):
         duplicates = []
         skipped = []
 
+        # 以集合比對重複，並一次插入所有新項目，避免逐筆掃描清單與逐筆重新排版
+        existing = set(self.get_all_files())
         for file_path in files:
             if not self._is_valid_file(file_path):
                 skipped.append(file_path)
                 continue
 
-            if not self._is_file_in_list(file_path):
-                self.addItem(file_path)
+            if file_path not in existing:
+                existing.add(file_path)
                 added.append(file_path)
             else:
                 duplicates.append(file_path)
 
+        if added:
+            self.addItems(added)
         return added, duplicates, skipped
 
-    def _is_file_in_list(self, file_path):
-        """檢查檔案是否已在清單中"""
-        for i in range(self.count()):
-            if self.item(i).text() == file_path:
-                return True
-        return False
-
     def get_all_files(self):
         """取得清單中的所有檔案路徑"""
         return [self.item(i).text() for i in range(self.count())]
@@ -226,7 +229,7 @@ class DropZoneWidget(QListWidget):
 
     def add_files(self, files):
         """新增檔案"""
-        self._drag_drop_list.add_files(files)
+        return self._drag_drop_list.add_files(files)
 
     def get_all_files(self):
         """取得所有檔案"""
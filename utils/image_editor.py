@@ -9,9 +9,10 @@ from PyQt5.QtWidgets import (
     QPushButton, QComboBox, QSpinBox, QGroupBox,
     QMessageBox, QButtonGroup, QRadioButton
 )
-from PyQt5.QtGui import QPixmap, QImage
 from PyQt5.QtCore import Qt
 
+from .preview_widget import pil_to_qpixmap
+
 
 class ImageEditorDialog(QDialog):
     """圖片編輯對話框"""
@@ -150,30 +151,7 @@ class ImageEditorDialog(QDialog):
         preview_image.thumbnail((680, 380), Image.Resampling.LANCZOS)
 
         # 轉換為 QPixmap
-        if preview_image.mode == "RGB":
-            qimage = QImage(
-                preview_image.tobytes(),
-                preview_image.width,
-                preview_image.height,
-                QImage.Format_RGB888
-            )
-        elif preview_image.mode == "RGBA":
-            qimage = QImage(
-                preview_image.tobytes(),
-                preview_image.width,
-                preview_image.height,
-                QImage.Format_RGBA8888
-            )
-        else:
-            preview_image = preview_image.convert("RGB")
-            qimage = QImage(
-                preview_image.tobytes(),
-                preview_image.width,
-                preview_image.height,
-                QImage.Format_RGB888
-            )
-
-        pixmap = QPixmap.fromImage(qimage)
+        pixmap = pil_to_qpixmap(preview_image)
         self.preview_label.setPixmap(pixmap)
 
     def _save(self):
@@ -298,7 +276,9 @@ class BatchImageEditorDialog(QDialog):
 
         for file_path in self.file_paths:
             try:
-                img = Image.open(file_path)
+                # 先解碼並關閉檔案，覆寫原檔時不會仍持有讀取中的檔案代碼
+                with Image.open(file_path) as img:
+                    img.load()
 
                 # 套用旋轉
                 if self.rotate_90_cw.isChecked():
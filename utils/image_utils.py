@@ -1,7 +1,53 @@
 """
 圖片處理工具函數
 """
-from PIL import Image
+import os
+import shutil
+import struct
+import subprocess
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+
+import numpy as np
+import PIL
+from PIL import GifImagePlugin, Image, ImageChops
+
+from .config import Config
+
+# 選用：OpenCV 的縮放以 SIMD 最佳化，速度明顯快於 Pillow
+try:
+    import cv2
+    HAS_CV2 = True
+except ImportError:
+    HAS_CV2 = False
+
+# OpenCV 可直接處理的 8 位元影像模式
+_CV2_MODES = {"L", "RGB", "RGBA"}
+
+# 選用：PyTurboJPEG 直接呼叫 libjpeg-turbo，JPEG 轉 JPEG 時略過 Pillow
+try:
+    from turbojpeg import TurboJPEG, TJFLAG_PROGRESSIVE, TJPF_BGR, TJPF_GRAY, TJSAMP_420, TJSAMP_GRAY
+    HAS_TURBOJPEG = True
+except ImportError:
+    HAS_TURBOJPEG = False
+
+# Pillow-SIMD 與 Pillow 同名安裝，只能由版本字尾 (如 9.5.0.post1) 辨識
+HAS_PILLOW_SIMD = ".post" in PIL.__version__
+
+_JPEG_EXTENSIONS = {".jpg", ".jpeg"}
+_JPEG_QUALITY = 75  # 與 Pillow 預設品質相同
+
+
+def get_image_backends():
+    """
+    列出目前啟用的影像加速套件，供使用者確認選用套件是否安裝成功
+
+    Returns:
+        list: 套件名稱，例如 ["OpenCV", "Pillow-SIMD"]
+    """
+    flags = [("OpenCV", HAS_CV2), ("Pillow-SIMD", HAS_PILLOW_SIMD), ("libjpeg-turbo", HAS_TURBOJPEG)]
+    return [name for name, enabled in flags if enabled]
 
 
 def get_resample_filter():
@@ -19,55 +65,898 @@ def get_resample_filter():
 
 # 取得全域的重採樣濾鏡
 resample_filter = get_resample_filter()
+_resample = resample_filter
+
+# 縮小倍率超過此值時，先以整數倍 reduce() 縮小再做 LANCZOS，大幅減少取樣運算
+_REDUCING_GAP = 3.0
+
+try:
+    _BILINEAR = Image.Resampling.BILINEAR
+except AttributeError:
+    _BILINEAR = Image.BILINEAR
+
+try:
+    _DITHER_FS, _DITHER_NONE = Image.Dither.FLOYDSTEINBERG, Image.Dither.NONE
+except AttributeError:
+    _DITHER_FS, _DITHER_NONE = Image.FLOYDSTEINBERG, Image.NONE
+
+# GIF 影格最後會量化為調色盤，LANCZOS 多保留的細節幾乎都被抹去，預設改用較快的 BILINEAR
+_GIF_RESAMPLE = _BILINEAR
+
+if HAS_CV2:
+    # 放大時對應的 OpenCV 內插方式（縮小一律使用 INTER_AREA）
+    _CV2_UPSCALE = {_resample: cv2.INTER_LANCZOS4, _BILINEAR: cv2.INTER_LINEAR}
+    # JPEG 縮小解碼的倍率與對應旗標，由大到小
+    _CV2_REDUCED_FLAGS = [(8, cv2.IMREAD_REDUCED_COLOR_8), (4, cv2.IMREAD_REDUCED_COLOR_4),
+                          (2, cv2.IMREAD_REDUCED_COLOR_2)]
+
+
+def get_gif_resample_filter(quality):
+    """
+    依 GIF 縮放品質選項取得重採樣濾鏡
+
+    Args:
+        quality: Config.GIF_RESAMPLE_OPTIONS 中的選項
+
+    Returns:
+        適用的縮放濾鏡
+    """
+    if quality == Config.GIF_RESAMPLE_QUALITY:
+        return _resample
+    return _GIF_RESAMPLE
+
+
+def fit_gif_size(size, max_edge=None):
+    """
+    將 GIF 影格尺寸等比例限制在最長邊以內
+
+    影格越小，載入時 JPEG draft 可直接以更低解析度解碼，縮放與量化也越快
+
+    Args:
+        size: 原始影格尺寸 (width, height)
+        max_edge: 最長邊上限，預設為 Config.GIF_MAX_EDGE，0 或 None 表示不限制
+
+    Returns:
+        tuple: 限制後的尺寸 (width, height)
+    """
+    if max_edge is None:
+        max_edge = Config.GIF_MAX_EDGE
+    width, height = size
+    longest = max(width, height)
+    if not max_edge or longest <= max_edge:
+        return (width, height)
+    scale = max_edge / longest
+    return (max(1, round(width * scale)), max(1, round(height * scale)))
 
 
-def resize_with_padding(img, target_size, bg_color=(255, 255, 255)):
+def _gif_dither():
+    """依 Config.GIF_DITHER 決定量化至共用調色盤時是否抖色"""
+    return _DITHER_FS if Config.GIF_DITHER else _DITHER_NONE
+
+
+def _image_size(img):
+    """取得 PIL Image 或 (h, w, 3) 陣列的 (width, height)"""
+    if isinstance(img, np.ndarray):
+        return img.shape[1], img.shape[0]
+    return img.size
+
+
+def _downscale(img, size, resample=None):
+    """
+    縮放圖片
+
+    已安裝 OpenCV 時縮小用 INTER_AREA、放大用對應的內插方式；
+    否則以 Pillow 處理，縮小時啟用 reducing_gap，先整數倍縮小再精細重採樣。
+    resample 未指定時使用 LANCZOS。img 也可以是 _load_frame 解碼的 RGB 陣列，
+    縮放完才轉為 PIL Image，省去原尺寸圖片在 Pillow 與 NumPy 之間的複製
+    """
+    array = img if isinstance(img, np.ndarray) else None
+    width, height = _image_size(img)
+    if (width, height) == tuple(size):
+        # 尺寸相同時不重新取樣（cv2.resize 不會自行略過）
+        return img if array is None else Image.fromarray(array)
+    if resample is None:
+        resample = _resample
+    shrinking = size[0] < width and size[1] < height
+    if HAS_CV2 and (array is not None or img.mode in _CV2_MODES):
+        interpolation = cv2.INTER_AREA if shrinking else _CV2_UPSCALE.get(resample, cv2.INTER_LANCZOS4)
+        source = array if array is not None else np.asarray(img)
+        return Image.fromarray(cv2.resize(source, tuple(size), interpolation=interpolation))
+    if array is not None:
+        img = Image.fromarray(array)
+    if shrinking:
+        return img.resize(size, resample=resample, reducing_gap=_REDUCING_GAP)
+    return img.resize(size, resample=resample)
+
+
+def _pool_size(task_count):
+    """依工作數量與 CPU 核心數決定執行緒池大小"""
+    return max(1, min(task_count, os.cpu_count() or 1))
+
+
+@lru_cache(maxsize=256)
+def _padding_layout(src_size, target_size):
+    """計算保持比例補白的縮放尺寸與置中位置，同尺寸的圖片共用結果"""
+    src_width, src_height = src_size
+    target_width, target_height = target_size
+    ratio = min(target_width / src_width, target_height / src_height)
+    new_width = int(src_width * ratio)
+    new_height = int(src_height * ratio)
+    paste_x = (target_width - new_width) // 2
+    paste_y = (target_height - new_height) // 2
+    return new_width, new_height, paste_x, paste_y
+
+
+def resize_with_padding(img, target_size, bg_color=(255, 255, 255), resample=None):
     """
     以保持原始比例縮放圖片，並將縮放後的圖片置中補足目標尺寸
 
     Args:
-        img: PIL Image 物件
+        img: PIL Image 物件，或 _load_frame 解碼的 RGB 陣列
         target_size: 目標尺寸 (width, height)
         bg_color: 背景顏色，預設為白色 (255, 255, 255)
+        resample: 重採樣濾鏡，預設為 LANCZOS
 
     Returns:
         PIL Image 物件，已調整至目標尺寸並保持原始比例
     """
+    if _image_size(img) == tuple(target_size):
+        # 已是目標尺寸，不需縮放也不需補白
+        return Image.fromarray(img) if isinstance(img, np.ndarray) else img.convert("RGB")
+
     target_width, target_height = target_size
-    ratio = min(target_width / img.width, target_height / img.height)
-    new_width = int(img.width * ratio)
-    new_height = int(img.height * ratio)
+    new_width, new_height, paste_x, paste_y = _padding_layout(_image_size(img), target_size)
 
     # 縮放圖片
-    resized_img = img.resize((new_width, new_height), resample=resample_filter)
+    resized_img = _downscale(img, (new_width, new_height), resample)
 
-    # 建立新圖片並貼上縮放後的圖片（置中）
-    new_img = Image.new("RGB", (target_width, target_height), bg_color)
-    paste_x = (target_width - new_width) // 2
-    paste_y = (target_height - new_height) // 2
-    new_img.paste(resized_img, (paste_x, paste_y))
+    # 以 NumPy 填滿背景並切片寫入縮放後的圖片（置中），省去 Image.new + paste 的逐通道複製
+    canvas = np.empty((target_height, target_width, 3), dtype=np.uint8)
+    canvas[...] = bg_color
+    canvas[paste_y:paste_y + new_height, paste_x:paste_x + new_width] = np.asarray(resized_img.convert("RGB"))
+
+    return Image.fromarray(canvas)
+
+
+def is_padding_strategy(strategy):
+    """
+    判斷縮放策略是否為保持比例補白
+
+    批次處理時可在迴圈外呼叫一次，再將結果 (bool) 傳給 resize_image，
+    省去每張圖片的字串比對
+
+    Args:
+        strategy: 縮放策略名稱或布林值
 
-    return new_img
+    Returns:
+        bool: 是否保持比例補白
+    """
+    if isinstance(strategy, bool):
+        return strategy
+    return strategy == Config.RESIZE_STRATEGY_PADDING
 
 
-def resize_image(img, target_size, strategy):
+def resize_image(img, target_size, strategy, resample=None):
     """
     根據縮放策略調整圖片大小
 
     Args:
         img: PIL Image 物件
         target_size: 目標尺寸 (width, height)
-        strategy: 縮放策略
-                 - "保持比例補白": 保持原比例縮放並補白
-                 - "直接縮放": 直接縮放至目標尺寸（可能變形）
+        strategy: 縮放策略，可傳入 is_padding_strategy() 的結果 (bool)
+                 - "保持比例補白" / True: 保持原比例縮放並補白
+                 - "直接縮放" / False: 直接縮放至目標尺寸（可能變形）
+        resample: 重採樣濾鏡，預設為 LANCZOS
 
     Returns:
         PIL Image 物件，已調整至目標尺寸
     """
-    if strategy == "保持比例補白":
-        return resize_with_padding(img, target_size)
-    else:
-        return img.resize(target_size, resample=resample_filter)
+    if strategy is True or (strategy is not False and is_padding_strategy(strategy)):
+        return resize_with_padding(img, target_size, resample=resample)
+    return _downscale(img, target_size, resample)
+
+
+def resize_images(images, target_size, strategy):
+    """
+    批次調整多張圖片至相同尺寸
+
+    依來源尺寸排序後處理，相同尺寸的圖片連續縮放並共用版面計算；
+    Pillow 縮放時會釋放 GIL，因此以執行緒池並行處理。回傳順序與輸入相同
+
+    Args:
+        images: PIL Image 物件列表
+        target_size: 目標尺寸 (width, height)
+        strategy: 縮放策略名稱或 is_padding_strategy() 的結果
+
+    Returns:
+        list: 已調整尺寸的 PIL Image 物件
+    """
+    pad = is_padding_strategy(strategy)
+    order = sorted(range(len(images)), key=lambda i: images[i].size)
+    results = [None] * len(images)
+
+    with ThreadPoolExecutor(max_workers=_pool_size(len(images))) as pool:
+        resized = pool.map(lambda i: resize_image(images[i], target_size, pad), order)
+        for i, img in zip(order, resized):
+            results[i] = img
+    return results
+
+
+def _map_ordered(func, items):
+    """
+    以執行緒池並行套用 func，並依輸入順序逐一產出結果
+
+    排隊中的工作上限為執行緒數的兩倍，前一項較慢時其他執行緒仍可繼續處理後續項目；
+    已產出的結果不再保留，記憶體用量不隨項目數增加
+    """
+    workers = _pool_size(len(items))
+    window = workers * 2
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        try:
+            for item in items:
+                pending.append(pool.submit(func, item))
+                if len(pending) >= window:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def iter_resized_images(sources, target_size, strategy, loader=None, resample=None):
+    """
+    逐張載入並縮放圖片，依輸入順序產出
+
+    與 resize_images 不同，不需事先載入所有圖片，也不保留已產出的結果，
+    可直接交給 compose_grid 逐格寫入
+
+    Args:
+        sources: 圖片路徑列表，也可混入已載入的 PIL Image 物件
+        target_size: 目標尺寸 (width, height)
+        strategy: 縮放策略（同 resize_image）
+        loader: 載入圖片的函數 loader(path, draft_size)，預設開啟檔案解碼（JPEG 以 draft 縮小解碼）
+        resample: 重採樣濾鏡，預設為 LANCZOS
+
+    Yields:
+        已調整尺寸的 PIL Image 物件
+    """
+    pad = is_padding_strategy(strategy)
+    loader = loader or partial(_load_frame, pad=pad)
+    return _map_ordered(lambda source: resize_image(loader(source, target_size), target_size, pad, resample),
+                        sources)
+
+
+@lru_cache(maxsize=32)
+def _grid_layout(rows, cols, cell_size, gap):
+    """預先計算網格畫布尺寸與每格的切片位置，同一組網格設定共用結果"""
+    cell_w, cell_h = cell_size
+    canvas_shape = (rows * cell_h + (rows + 1) * gap, cols * cell_w + (cols + 1) * gap, 3)
+    cells = []
+    for row in range(rows):
+        y = gap + row * (cell_h + gap)
+        for col in range(cols):
+            x = gap + col * (cell_w + gap)
+            cells.append((slice(y, y + cell_h), slice(x, x + cell_w)))
+    return canvas_shape, tuple(cells)
+
+
+def compose_grid(tiles, rows, cols, cell_size, gap, bg_color=(255, 255, 255)):
+    """
+    將相同尺寸的圖片依序排成網格
+
+    以 NumPy 預先配置畫布，每格以切片寫入，省去逐張 paste 的暫存配置
+
+    Args:
+        tiles: PIL Image 物件列表或可迭代物件，尺寸皆為 cell_size，超過 rows * cols 的部分忽略
+        rows: 行數
+        cols: 列數
+        cell_size: 每格尺寸 (width, height)
+        gap: 圖片間距與外框寬度
+        bg_color: 背景顏色
+
+    Returns:
+        PIL Image 物件 (RGB)
+    """
+    canvas_shape, cells = _grid_layout(rows, cols, tuple(cell_size), gap)
+    canvas = np.empty(canvas_shape, dtype=np.uint8)
+    canvas[...] = bg_color
+
+    for cell, tile in zip(cells, tiles):
+        if tile.mode != "RGB":
+            tile = tile.convert("RGB")
+        canvas[cell] = np.asarray(tile)
+
+    return Image.fromarray(canvas)
+
+
+def build_shared_palette(frames, colors=Config.GIF_PALETTE_COLORS, sample_size=(64, 64)):
+    """
+    以所有影格的縮圖建立一份共用調色盤
+
+    Args:
+        frames: PIL Image 物件的可迭代物件
+        colors: 調色盤顏色數
+        sample_size: 取樣縮圖的最大尺寸
+
+    Returns:
+        PIL Image 物件 (P 模式)，可作為 quantize 的 palette
+    """
+    thumbs = []
+    for frame in frames:
+        thumb = frame.convert("RGB")
+        thumb.thumbnail(sample_size)
+        thumbs.append(thumb)
+
+    montage = Image.new("RGB", (max(t.width for t in thumbs), sum(t.height for t in thumbs)))
+    y = 0
+    for thumb in thumbs:
+        montage.paste(thumb, (0, y))
+        y += thumb.height
+
+    return montage.quantize(colors=colors)
+
+
+def _iter_draft_thumbnails(files, sample_size):
+    """逐一開啟檔案並以 draft 縮小解碼（JPEG 以 DCT 縮放），只保留縮圖"""
+    for path in files:
+        if isinstance(path, Image.Image):
+            yield path
+            continue
+        with Image.open(path) as img:
+            img.draft("RGB", sample_size)
+            yield img.convert("RGB")
+
+
+def build_file_palette(files, colors=Config.GIF_PALETTE_COLORS, sample_size=(64, 64)):
+    """
+    直接從圖片檔建立共用調色盤，不需先完整解碼所有圖片
+
+    Args:
+        files: 圖片路徑列表，也可混入已載入的 PIL Image 物件
+        colors: 調色盤顏色數
+        sample_size: 取樣縮圖的最大尺寸
+
+    Returns:
+        PIL Image 物件 (P 模式)，可作為 quantize 的 palette
+    """
+    return build_shared_palette(_iter_draft_thumbnails(files, sample_size), colors, sample_size)
+
+
+def _load_image(path, draft_size=None, pad=False):
+    """
+    開啟並完整解碼圖片後關閉檔案；已是 PIL Image 時直接回傳
+
+    指定 draft_size 時，JPEG 以 draft 在 DCT 階段縮小解碼（結果不小於 draft_size）；
+    pad 為 True 時只需不小於保持比例縮放後的尺寸，長寬比不同時可用更小的比例解碼
+    """
+    if isinstance(path, Image.Image):
+        return path
+    with Image.open(path) as img:
+        if draft_size is not None:
+            if pad:
+                new_width, new_height, _, _ = _padding_layout(img.size, tuple(draft_size))
+                draft_size = (max(1, new_width), max(1, new_height))
+            img.draft(img.mode, draft_size)
+        img.load()
+        return img
+
+
+def _decode_jpeg_cv2(path, draft_size=None):
+    """
+    以 OpenCV 將 JPEG 直接解碼為 RGB 陣列，失敗時回傳 None
+
+    與 Pillow 的 draft 相同，以 IMREAD_REDUCED_* 在 DCT 階段縮小 1/2~1/8 解碼（結果不小於 draft_size）；
+    不套用 EXIF 方向，與 Pillow 開啟的結果一致
+    """
+    flags = cv2.IMREAD_COLOR
+    if draft_size is not None:
+        width, height = get_image_size(path)
+        scale = min(width // max(1, draft_size[0]), height // max(1, draft_size[1]))
+        flags = next((flag for factor, flag in _CV2_REDUCED_FLAGS if scale >= factor), cv2.IMREAD_COLOR)
+    try:
+        # 以 fromfile + imdecode 讀取，Windows 上的中文路徑也能開啟
+        bgr = cv2.imdecode(np.fromfile(path, dtype=np.uint8), flags | cv2.IMREAD_IGNORE_ORIENTATION)
+    except (OSError, cv2.error):
+        return None
+    if bgr is None:
+        return None
+    return cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB)
+
+
+def _load_frame(path, draft_size=None, pad=False):
+    """
+    iter_resized_images 與 iter_gif_frames 的預設載入器
+
+    已安裝 OpenCV 時 JPEG 直接解碼為 RGB 陣列，交由 _downscale 縮放後才轉為 PIL Image，
+    不必先建立原尺寸的 PIL Image 再複製成陣列；其他格式與 _load_image 相同
+    """
+    if HAS_CV2 and isinstance(path, str) and os.path.splitext(path)[1].lower() in _JPEG_EXTENSIONS:
+        if draft_size is not None and pad:
+            width, height = get_image_size(path)
+            new_width, new_height, _, _ = _padding_layout((width, height), tuple(draft_size))
+            draft_size = (max(1, new_width), max(1, new_height))
+        frame = _decode_jpeg_cv2(path, draft_size)
+        if frame is not None:
+            return frame
+    return _load_image(path, draft_size, pad)
+
+
+def iter_gif_frames(files, target_size, strategy, palette, loader=None, resample=None):
+    """
+    逐張載入、縮放並量化 GIF 影格
+
+    以執行緒池並行處理（見 _map_ordered），已完成的影格只保留量化後的 P 模式結果，
+    記憶體用量不隨圖片數增加
+
+    Args:
+        files: 圖片路徑列表，也可混入已載入的 PIL Image 物件
+        target_size: 影格尺寸 (width, height)
+        strategy: 縮放策略（同 resize_image）
+        palette: 共用調色盤（P 模式 PIL Image）
+        loader: 載入圖片的函數 loader(path, draft_size)，draft_size 為影格尺寸，
+                載入結果只需不小於此尺寸；預設開啟檔案解碼（JPEG 以 draft 縮小解碼）
+        resample: 重採樣濾鏡，預設為 BILINEAR（見 get_gif_resample_filter）
+
+    Yields:
+        P 模式的 PIL Image 物件，順序與 files 相同
+    """
+    pad = is_padding_strategy(strategy)
+    loader = loader or partial(_load_frame, pad=pad)
+    if resample is None:
+        resample = _GIF_RESAMPLE
+    dither = _gif_dither()
+
+    def make_frame(path):
+        frame = resize_image(loader(path, target_size), target_size, pad, resample)
+        return frame.convert("RGB").quantize(palette=palette, dither=dither)
+
+    yield from _map_ordered(make_frame, files)
+
+
+def quantize_frames(frames, colors=Config.GIF_PALETTE_COLORS):
+    """
+    將所有影格量化至同一份調色盤 (P 模式)
+
+    Args:
+        frames: PIL Image 物件列表
+        colors: 調色盤顏色數
+
+    Returns:
+        list: P 模式的 PIL Image 物件
+    """
+    palette = build_shared_palette(frames, colors)
+    dither = _gif_dither()
+    with ThreadPoolExecutor(max_workers=_pool_size(len(frames))) as pool:
+        return list(pool.map(lambda frame: frame.convert("RGB").quantize(palette=palette, dither=dither), frames))
+
+
+def _as_image(frame):
+    """numpy 陣列轉為 PIL Image；已是 PIL Image 時直接回傳"""
+    return Image.fromarray(frame) if isinstance(frame, np.ndarray) else frame
+
+
+def save_gif(frames, output_path, duration, loop=0, colors=Config.GIF_PALETTE_COLORS):
+    """
+    儲存 GIF 動畫
+
+    先將影格量化至共用調色盤，再以 optimize=False 寫出，
+    省去 Pillow 逐幀重新量化與最佳化的成本。
+    量化與寫出逐張進行（見 _map_ordered），不會同時保留所有 P 模式影格
+
+    Args:
+        frames: PIL Image 物件列表，或形狀為 (N, h, w, 3) 的 uint8 陣列
+        output_path: 輸出路徑
+        duration: 每幀顯示時間（毫秒）
+        loop: 循環次數，0 為無限循環
+        colors: 調色盤顏色數
+    """
+    palette = build_shared_palette((_as_image(frame) for frame in frames), colors)
+    dither = _gif_dither()
+
+    def quantize(frame):
+        return _as_image(frame).convert("RGB").quantize(palette=palette, dither=dither)
+
+    write_gif(_map_ordered(quantize, frames), output_path, duration, loop)
+
+
+def _gif_delta_bbox(previous, frame):
+    """
+    取得與前一影格不同的區域
+
+    兩者共用調色盤時直接比較索引值；調色盤不同時回傳整張影格範圍
+
+    Returns:
+        tuple 或 None: 差異範圍 (left, upper, right, lower)，完全相同時為 None
+    """
+    if previous.getpalette() != frame.getpalette():
+        return (0, 0) + frame.size
+    return ImageChops.subtract_modulo(frame, previous).getbbox()
+
+
+def write_gif(frames_p, output_path, duration, loop=0):
+    """
+    將已量化的影格寫出為 GIF
+
+    每收到一張影格即編碼寫入檔案，只保留前一張影格供比較，
+    影格來源（如 iter_gif_frames 的執行緒池）可同時準備後續影格。
+    與 Pillow 的 save_all 相同，只寫出與前一張不同的區域，完全相同的影格併入前一張的顯示時間；
+    影格調色盤與第一張相同時不另寫局部色盤
+
+    Args:
+        frames_p: P 模式的 PIL Image 物件（列表或可迭代物件）
+        output_path: 輸出路徑
+        duration: 每幀顯示時間（毫秒）
+        loop: 循環次數，0 為無限循環
+
+    Returns:
+        bool: 是否有影格寫出
+    """
+    frames_p = iter(frames_p)
+    first = next(frames_p, None)
+    if first is None:
+        return False
+
+    with open(output_path, "wb") as fp:
+        header, _ = GifImagePlugin.getheader(first, info={"loop": loop, "duration": duration})
+        fp.writelines(header)
+        palette = first.getpalette()
+
+        # 待寫出的影格 (影像, 差異範圍, 顯示時間)，等下一張確認不是重複影格後才寫出
+        pending = [first, None, duration]
+        previous = first
+        for frame in frames_p:
+            bbox = _gif_delta_bbox(previous, frame)
+            if bbox is None:
+                pending[2] += duration
+                continue
+            _write_gif_frame(fp, *pending, palette)
+            pending = [frame, bbox, duration]
+            previous = frame
+        _write_gif_frame(fp, *pending, palette)
+        fp.write(b";")
+    return True
+
+
+def _write_gif_frame(fp, frame, bbox, duration, palette):
+    """寫出單一影格，bbox 為 None 時寫出整張影格"""
+    params = {"duration": duration}
+    if frame.getpalette() != palette:
+        params["include_color_table"] = True
+    offset = (0, 0)
+    if bbox is not None and bbox != (0, 0) + frame.size:
+        frame = frame.crop(bbox)
+        offset = bbox[:2]
+    fp.writelines(GifImagePlugin.getdata(frame, offset, **params))
+
+
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+# JPEG SOF 標記 (排除 DHT 0xC4、JPG 0xC8、DAC 0xCC)
+_JPEG_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+
+def optimize_gif(path, lossy=Config.GIF_GIFSICLE_LOSSY):
+    """
+    以 gifsicle 就地最佳化 GIF（-O3，可加上有損壓縮）
+
+    未安裝 gifsicle 或執行失敗時保留原檔
+
+    Args:
+        path: GIF 檔案路徑
+        lossy: --lossy 強度，0 或 None 表示只做無損最佳化
+
+    Returns:
+        bool: 是否已最佳化
+    """
+    gifsicle = shutil.which("gifsicle")
+    if not gifsicle:
+        return False
+    args = [gifsicle, "--batch", "-O3"]
+    if lossy:
+        args.append(f"--lossy={lossy}")
+    try:
+        result = subprocess.run(args + [path], capture_output=True)
+    except OSError:
+        return False
+    return result.returncode == 0
+
+
+def _read_jpeg_size(f):
+    """從 JPEG 檔頭的 SOF 標記讀取尺寸，找不到時返回 None"""
+    f.seek(2)
+    while True:
+        byte = f.read(1)
+        while byte and byte != b"\xff":
+            byte = f.read(1)
+        while byte == b"\xff":
+            byte = f.read(1)
+        if not byte:
+            return None
+
+        marker = byte[0]
+        if marker == 0x01 or 0xD0 <= marker <= 0xD8:
+            # 無長度欄位的獨立標記
+            continue
+        if marker in (0xD9, 0xDA):
+            # 影像結束或掃描開始前仍未出現 SOF
+            return None
+
+        length_bytes = f.read(2)
+        if len(length_bytes) < 2:
+            return None
+        length = struct.unpack(">H", length_bytes)[0]
+
+        if marker in _JPEG_SOF_MARKERS:
+            data = f.read(5)
+            if len(data) < 5:
+                return None
+            height, width = struct.unpack(">HH", data[1:5])
+            return width, height
+
+        f.seek(length - 2, 1)
+
+
+def _read_webp_size(head):
+    """從 WebP 的 VP8/VP8L/VP8X 區塊標頭讀取尺寸，無法辨識時返回 None"""
+    chunk = head[12:16]
+    if chunk == b"VP8X":
+        width = int.from_bytes(head[24:27], "little") + 1
+        height = int.from_bytes(head[27:30], "little") + 1
+        return width, height
+    if chunk == b"VP8 " and head[23:26] == b"\x9d\x01\x2a":
+        width, height = struct.unpack("<HH", head[26:30])
+        return width & 0x3FFF, height & 0x3FFF
+    if chunk == b"VP8L" and head[20:21] == b"\x2f":
+        bits = int.from_bytes(head[21:25], "little")
+        return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+    return None
+
+
+def get_image_size(file_path):
+    """
+    只讀取檔頭取得圖片尺寸，不解碼像素資料
+
+    PNG 讀取 IHDR，JPEG 掃描 SOF 標記，GIF/BMP/WebP 讀取固定位置的尺寸欄位；
+    其他格式交給 PIL 解析檔頭
+
+    Args:
+        file_path: 圖片檔案路徑
+
+    Returns:
+        (width, height)
+    """
+    with open(file_path, "rb") as f:
+        head = f.read(30)
+        if head[:8] == _PNG_SIGNATURE and head[12:16] == b"IHDR":
+            return struct.unpack(">II", head[16:24])
+        if head[:6] in (b"GIF87a", b"GIF89a"):
+            return struct.unpack("<HH", head[6:10])
+        if head[:2] == b"BM" and len(head) >= 26 and struct.unpack("<I", head[14:18])[0] >= 40:
+            # BITMAPINFOHEADER 以上；高度為負值表示由上而下儲存
+            width, height = struct.unpack("<ii", head[18:26])
+            return width, abs(height)
+        if head[:4] == b"RIFF" and head[8:12] == b"WEBP" and len(head) >= 30:
+            size = _read_webp_size(head)
+            if size:
+                return size
+        if head[:2] == b"\xff\xd8":
+            size = _read_jpeg_size(f)
+            if size:
+                return size
+
+    with Image.open(file_path) as img:
+        return img.size
+
+
+@lru_cache(maxsize=1)
+def _get_turbo_jpeg():
+    """載入 libjpeg-turbo，找不到動態函式庫時回傳 None"""
+    if not HAS_TURBOJPEG:
+        return None
+    try:
+        return TurboJPEG()
+    except (OSError, RuntimeError):
+        return None
+
+
+def _turbo_jpeg_flags(options):
+    """
+    將 Config.CONVERT_SAVE_OPTIONS['JPEG'] 對應為 TurboJPEG 編碼旗標
+
+    libjpeg-turbo 的漸進式編碼一律使用最佳化 Huffman 表；只要求 optimize 而非漸進式，
+    或含有其他無法對應的選項時回傳 None，交由 Pillow 編碼，輸出不因是否安裝加速模組而改變
+    """
+    if set(options) - {'optimize', 'progressive'}:
+        return None
+    if options.get('progressive'):
+        return TJFLAG_PROGRESSIVE
+    if options.get('optimize'):
+        return None
+    return 0
+
+
+def _turbo_jpeg_transcode(file_path):
+    """
+    以 libjpeg-turbo 解碼 JPEG 後依 CONVERT_SAVE_OPTIONS 重新編碼
+
+    Returns:
+        bytes or None: 編碼結果；未安裝、選項無法對應或 libjpeg-turbo 無法處理
+                       （例如 CMYK、檔案截斷）時回傳 None，由呼叫端改用 Pillow
+    """
+    turbo = _get_turbo_jpeg()
+    if turbo is None:
+        return None
+    flags = _turbo_jpeg_flags(Config.CONVERT_SAVE_OPTIONS.get('JPEG', {}))
+    if flags is None:
+        return None
+
+    with open(file_path, "rb") as f:
+        data = f.read()
+    try:
+        if turbo.decode_header(data)[2] == TJSAMP_GRAY:
+            # 灰階來源維持單通道，不擴展為 3 通道 4:2:0（與 Pillow 儲存 L 模式相同）
+            pixel_format, subsample = TJPF_GRAY, TJSAMP_GRAY
+        else:
+            pixel_format, subsample = TJPF_BGR, TJSAMP_420
+        pixels = turbo.decode(data, pixel_format=pixel_format)
+        return turbo.encode(pixels, quality=_JPEG_QUALITY, pixel_format=pixel_format,
+                            jpeg_subsample=subsample, flags=flags)
+    except Exception:
+        return None
+
+
+def _to_jpeg_mode(img):
+    """
+    轉為 JPEG 可儲存的模式
+
+    含透明度或調色盤的圖片以白色背景合成，以透明度為遮罩貼上（LA 與 P 先轉為 RGBA 才有 A 通道）；
+    L、RGB、CMYK 維持原樣，其他模式（如 16 位元）轉為 RGB
+    """
+    if img.mode in ('RGBA', 'LA', 'P'):
+        background = Image.new('RGB', img.size, (255, 255, 255))
+        if img.mode != 'RGBA':
+            img = img.convert('RGBA')
+        # 只取出 A 通道，不必像 split() 一次產生四張通道圖
+        background.paste(img, mask=img.getchannel('A'))
+        return background
+    if img.mode not in ('L', 'RGB', 'CMYK'):
+        return img.convert('RGB')
+    return img
+
+
+def convert_image_file(file_path, output_format, output_folder=None, max_size=None):
+    """
+    轉換單一圖片檔案的格式
+
+    為模組層級函式，可直接交給 ProcessPoolExecutor 於子行程執行
+
+    Args:
+        file_path: 來源圖片路徑
+        output_format: 輸出格式副檔名 (例如 'png'、'jpg')
+        output_folder: 輸出資料夾，None 或空字串表示與來源相同資料夾
+        max_size: 輸出尺寸上限 (width, height)，保持比例縮小；None 表示維持原尺寸
+
+    Returns:
+        (bool, str): (是否成功, 錯誤訊息)
+    """
+    try:
+        base = os.path.splitext(os.path.basename(file_path))[0]
+        folder = output_folder or os.path.dirname(file_path)
+        save_path = os.path.join(folder, f"{base}.{output_format}")
+
+        fmt = output_format.upper()
+        if fmt == "JPG":
+            fmt = "JPEG"
+
+        # JPEG 轉 JPEG：以 libjpeg-turbo 直接解碼再編碼，無法處理時改由 Pillow 轉換
+        if max_size is None and fmt == "JPEG" and os.path.splitext(file_path)[1].lower() in _JPEG_EXTENSIONS:
+            encoded = _turbo_jpeg_transcode(file_path)
+            if encoded is not None:
+                with open(save_path, "wb") as f:
+                    f.write(encoded)
+                return True, ""
+
+        # 解碼後立即關閉來源檔，編碼（漸進式 JPEG、PNG 最佳化可能較久）時不佔用檔案代碼
+        with Image.open(file_path) as img:
+            if max_size is not None and (img.width > max_size[0] or img.height > max_size[1]):
+                # JPEG 以 draft 在 DCT 階段先縮小 1/2~1/8 解碼，再縮至目標尺寸
+                img.draft(img.mode, max_size)
+                img.thumbnail(max_size, _resample, reducing_gap=_REDUCING_GAP)
+            img.load()
+
+        if fmt == "JPEG":
+            img = _to_jpeg_mode(img)
+        img.save(save_path, format=fmt, **Config.CONVERT_SAVE_OPTIONS.get(fmt, {}))
+        return True, ""
+    except Exception as e:
+        return False, str(e)
+
+
+def scan_file_sizes(file_paths):
+    """
+    以每個資料夾一次 os.scandir 取得多個檔案的大小，取代逐檔 os.path.getsize
+
+    Args:
+        file_paths: 檔案路徑列表
+
+    Returns:
+        dict: {檔案路徑: 位元組數}，讀不到的檔案不會出現在結果中
+    """
+    by_dir = {}
+    for path in file_paths:
+        by_dir.setdefault(os.path.dirname(path), {})[os.path.basename(path)] = path
+
+    sizes = {}
+    for folder, names in by_dir.items():
+        try:
+            with os.scandir(folder or '.') as entries:
+                for entry in entries:
+                    path = names.get(entry.name)
+                    if path is not None:
+                        try:
+                            sizes[path] = entry.stat().st_size
+                        except OSError:
+                            pass
+        except OSError:
+            continue
+    return sizes
+
+
+def compress_image_file(file_path, quality, output_format, output_folder=None, orig_size=None):
+    """
+    壓縮單一圖片檔案，輸出為「原檔名_compressed.副檔名」
+
+    為模組層級函式，可直接交給 ProcessPoolExecutor 於子行程執行
+
+    Args:
+        file_path: 來源圖片路徑
+        quality: JPEG / WebP 品質 (1-100)
+        output_format: 輸出格式副檔名 (例如 'jpg'、'png'、'webp')
+        output_folder: 輸出資料夾，None 或空字串表示與來源相同資料夾
+        orig_size: 預先取得的原始大小 (見 scan_file_sizes)，None 時自行 stat
+
+    Returns:
+        (bool, int, int, str): (是否成功, 原始大小, 壓縮後大小, 錯誤訊息)
+    """
+    try:
+        if orig_size is None:
+            orig_size = os.path.getsize(file_path)
+
+        # 解碼後立即關閉檔案，大批次時不累積未釋放的檔案代碼
+        with Image.open(file_path) as img:
+            img.load()
+
+        fmt = output_format.lower()
+        # 如果是 PNG 且目標是 JPG，需要轉換模式
+        if fmt in ('jpg', 'jpeg'):
+            img = _to_jpeg_mode(img)
+
+        base = os.path.splitext(os.path.basename(file_path))[0]
+        folder = output_folder or os.path.dirname(file_path)
+        save_path = os.path.join(folder, f"{base}_compressed.{output_format}")
+
+        if fmt in ('jpg', 'jpeg'):
+            save_kwargs = {'format': 'JPEG', 'quality': quality, 'optimize': True}
+        elif fmt == 'png':
+            save_kwargs = {'format': 'PNG', 'optimize': True, 'compress_level': 9}
+        elif fmt == 'webp':
+            save_kwargs = {'format': 'WEBP', 'quality': quality}
+        else:
+            save_format = Image.registered_extensions().get(f".{fmt}")
+            if save_format is None:
+                raise ValueError(f"不支援的輸出格式：{output_format}")
+            save_kwargs = {'format': save_format, 'quality': quality, 'optimize': True}
+
+        # 壓縮保存；寫入後直接對已開啟的檔案 fstat 取得大小，不必再 stat 一次路徑
+        with open(save_path, 'wb') as fp:
+            img.save(fp, **save_kwargs)
+            fp.flush()
+            comp_size = os.fstat(fp.fileno()).st_size
+
+        return True, orig_size, comp_size, ""
+    except Exception as e:
+        return False, 0, 0, str(e)
 
 
 def validate_image_file(file_path):
@@ -2,6 +2,7 @@
 現代化 UI 樣式管理模組 (Redesigned)
 提供專業、現代感的深色和淺色主題 (類似 VS Code / Modern Web 風格)
 """
+from functools import lru_cache
 
 class ModernStyle:
     """現代化樣式管理類別"""
@@ -48,7 +49,9 @@ class ModernStyle:
         'danger': '#E74C3C',
     }
 
+    # 樣式表內容只取決於主題，快取後重複取得時回傳同一個字串物件
     @classmethod
+    @lru_cache(maxsize=None)
     def get_stylesheet(cls, theme_name="light"):
         colors = cls.DARK_THEME if theme_name == "dark" else cls.LIGHT_THEME
         
@@ -332,7 +335,14 @@ class ModernStyle:
         return cls.get_stylesheet("light")
 
     @classmethod
-    def get_card_style(cls, theme="light"):
+    @lru_cache(maxsize=None)
+    def get_window_stylesheet(cls, theme="light"):
+        """主題樣式表加上卡片群組框樣式，由主視窗一次套用並向下層疊"""
+        return cls.get_stylesheet(theme) + cls.get_card_style(theme, 'QGroupBox[card="true"]')
+
+    @classmethod
+    @lru_cache(maxsize=None)
+    def get_card_style(cls, theme="light", selector="QGroupBox"):
         """Return the card-like group box stylesheet for the given theme."""
         colors = cls.DARK_THEME if theme == "dark" else cls.LIGHT_THEME
         
@@ -347,7 +357,7 @@ class ModernStyle:
             title_color = colors['primary']
 
         return f"""
-            QGroupBox {{
+            {selector} {{
                 background-color: {colors['surface']};
                 border: 1px solid {border_color};
                 border-radius: 8px;
@@ -358,7 +368,7 @@ class ModernStyle:
                 padding-right: 12px;
             }}
 
-            QGroupBox::title {{
+            {selector}::title {{
                 subcontrol-origin: margin;
                 subcontrol-position: top left;
                 left: 12px;
@@ -2,7 +2,6 @@
 import os
 import fitz  # PyMuPDF
 from pypdf import PdfReader, PdfWriter
-from natsort import natsorted
 
 class PDFToolKit:
     """PDF 進階工具：拆分與格式轉換"""
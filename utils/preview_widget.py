@@ -3,16 +3,51 @@
 提供縮圖預覽、拖放排序、詳細資訊顯示等功能
 """
 import os
+from natsort import natsort_keygen
 from PyQt5.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
     QScrollArea, QGridLayout, QDialog, QFrame, QSizePolicy
 )
-from PyQt5.QtGui import QPixmap, QImage, QPainter, QDragEnterEvent, QDropEvent, QTransform
+from PyQt5.QtGui import QPixmap, QPixmapCache, QImage, QPainter, QDragEnterEvent, QDropEvent, QTransform
 from PyQt5.QtCore import Qt, pyqtSignal, QSize
 from PIL import Image
 
 from .config import Config
 
+# 預先建立的自然排序鍵，避免每次排序都重新產生
+_NAT_KEY = natsort_keygen()
+
+# QPixmapCache 的容量 (KB)，約可容納數百張 150px 縮圖
+THUMBNAIL_CACHE_LIMIT_KB = 64 * 1024
+
+# 縮圖對應的資訊文字，鍵值與 QPixmapCache 相同
+_thumbnail_info = {}
+
+
+def pil_to_qpixmap(img):
+    """
+    將 PIL 圖片轉為 QPixmap
+
+    直接包裝 tobytes() 的緩衝區並指定每列位元組數，只有一次複製；
+    未指定時 Qt 會假設每列 4 位元組對齊，寬度非 4 倍數的 RGB 圖片會歪斜
+
+    Args:
+        img: PIL Image 物件
+
+    Returns:
+        QPixmap 物件
+    """
+    if img.mode == "RGBA":
+        fmt, channels = QImage.Format_RGBA8888, 4
+    else:
+        if img.mode != "RGB":
+            img = img.convert("RGB")
+        fmt, channels = QImage.Format_RGB888, 3
+    data = img.tobytes()
+    # QPixmap.fromImage 會複製像素，data 只需在此函數內保持存活
+    qimage = QImage(data, img.width, img.height, img.width * channels, fmt)
+    return QPixmap.fromImage(qimage)
+
 
 class ImageThumbnail(QFrame):
     """單個圖片縮圖小工具"""
@@ -113,35 +148,36 @@ class ImageThumbnail(QFrame):
         """)
 
     def _load_thumbnail(self):
-        """載入縮圖"""
+        """載入縮圖（依路徑、修改時間與尺寸快取於 QPixmapCache）"""
         try:
-            # 使用 PIL 載入圖片
-            img = Image.open(self.file_path)
-
-            # 取得圖片資訊
-            width, height = img.size
-            file_size = os.path.getsize(self.file_path)
-            file_size_kb = file_size / 1024
-            ext = os.path.splitext(self.file_path)[1].replace('.', '').upper() or "IMG"
-
-            # 顯示資訊
-            info_text = f"{width}x{height} · {file_size_kb:.1f}KB · {ext}"
-            self.info_label.setText(info_text)
-
-            # 建立縮圖
-            img.thumbnail((self.thumbnail_size, self.thumbnail_size), Image.Resampling.LANCZOS)
+            stat = os.stat(self.file_path)
+            cache_key = f"thumb:{self.file_path}:{stat.st_mtime_ns}:{self.thumbnail_size}"
+            pixmap = QPixmapCache.find(cache_key)
+            if pixmap is not None and cache_key in _thumbnail_info:
+                self.info_label.setText(_thumbnail_info[cache_key])
+                self.image_label.setPixmap(pixmap)
+                return
+
+            # 使用 PIL 載入圖片，縮圖完成即關閉檔案
+            with Image.open(self.file_path) as img:
+                # 取得圖片資訊
+                width, height = img.size
+                file_size_kb = stat.st_size / 1024
+                ext = os.path.splitext(self.file_path)[1].replace('.', '').upper() or "IMG"
+
+                # 顯示資訊
+                info_text = f"{width}x{height} · {file_size_kb:.1f}KB · {ext}"
+                self.info_label.setText(info_text)
+
+                # 建立縮圖：JPEG 先以 draft 在 DCT 階段縮小解碼，省去完整解碼
+                img.draft(img.mode, (self.thumbnail_size * 2, self.thumbnail_size * 2))
+                img.thumbnail((self.thumbnail_size, self.thumbnail_size), Image.Resampling.BILINEAR)
 
             # 轉換為 QPixmap
-            if img.mode == "RGB":
-                qimage = QImage(img.tobytes(), img.width, img.height, QImage.Format_RGB888)
-            elif img.mode == "RGBA":
-                qimage = QImage(img.tobytes(), img.width, img.height, QImage.Format_RGBA8888)
-            else:
-                img = img.convert("RGB")
-                qimage = QImage(img.tobytes(), img.width, img.height, QImage.Format_RGB888)
-
-            pixmap = QPixmap.fromImage(qimage)
+            pixmap = pil_to_qpixmap(img)
             self.image_label.setPixmap(pixmap)
+            QPixmapCache.insert(cache_key, pixmap)
+            _thumbnail_info[cache_key] = info_text
 
         except Exception as e:
             print(f"載入縮圖失敗：{e}")
@@ -198,6 +234,8 @@ class ImagePreviewGrid(QWidget):
 
     def __init__(self, parent=None):
         super().__init__(parent)
+        if QPixmapCache.cacheLimit() < THUMBNAIL_CACHE_LIMIT_KB:
+            QPixmapCache.setCacheLimit(THUMBNAIL_CACHE_LIMIT_KB)
         self.thumbnails = []  # 儲存縮圖小工具
         self.files = []  # 儲存檔案路徑
         self.setAcceptDrops(True)
@@ -257,12 +295,15 @@ class ImagePreviewGrid(QWidget):
         added = []
         duplicates = []
         skipped = list(skipped_files or [])
+        # 以集合判斷重複，加入數千張圖片時不必每張都線性搜尋清單
+        existing = set(self.files)
 
         for file_path in file_paths:
-            if file_path in self.files:
+            if file_path in existing:
                 duplicates.append(file_path)
                 continue
 
+            existing.add(file_path)
             self.files.append(file_path)
             self._add_thumbnail(file_path)
             added.append(file_path)
@@ -418,10 +459,13 @@ class ImagePreviewGrid(QWidget):
         processed = 0
 
         try:
-            for root, _, filenames in os.walk(directory):
-                for name in filenames:
+            # os.walk 已區分檔案與資料夾，只需比對副檔名，不必再逐檔 stat；
+            # 依自然排序走訪，拖入資料夾後的圖片順序與檔案總管一致
+            for root, dirs, filenames in os.walk(directory):
+                dirs.sort(key=_NAT_KEY)
+                for name in sorted(filenames, key=_NAT_KEY):
                     file_path = os.path.join(root, name)
-                    if self._is_supported_file(file_path):
+                    if os.path.splitext(name)[1].lower() in self._image_extensions:
                         valid_files.append(file_path)
                     else:
                         skipped_files.append(file_path)
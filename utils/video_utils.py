@@ -0,0 +1,785 @@
+"""
+影片處理工具函數
+以 ffmpeg 直接處理可免去 MoviePy 逐幀解碼再編碼的流程
+"""
+import importlib.util
+import itertools
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+import logging
+from functools import lru_cache
+
+import numpy as np
+from PIL import Image
+
+from .config import Config
+
+logger = logging.getLogger(__name__)
+
+# imageio-ffmpeg 隨 MoviePy 一併安裝，內含可攜式 ffmpeg 執行檔
+try:
+    import imageio_ffmpeg
+    HAS_IMAGEIO_FFMPEG = True
+except ImportError:
+    HAS_IMAGEIO_FFMPEG = False
+
+_VIDEO_STREAM_RE = re.compile(r"Stream #\d+:\d+.*?: Video: (\w+)[^,]*, (\w+)")
+_AUDIO_STREAM_RE = re.compile(r"Stream #\d+:\d+.*?: Audio: (\w+)[^,]*, (\d+) Hz, ([\w.]+)")
+_RESOLUTION_RE = re.compile(r", (\d{2,5})x(\d{2,5})")
+_FPS_RE = re.compile(r", ([\d.]+) (?:fps|tbr)")
+_DURATION_RE = re.compile(r"Duration: (\d+):(\d+):([\d.]+)")
+
+# 選用：PyAV 直接讀取容器資訊，不需另外啟動 ffmpeg 行程
+# 匯入時會載入 FFmpeg 函式庫，啟動時只確認是否安裝，實際使用時才匯入
+HAS_PYAV = importlib.util.find_spec("av") is not None
+
+# NVENC 硬體編碼參數
+NVENC_VIDEO_ARGS = ["-c:v", "h264_nvenc", "-preset", "p4", "-b:v", "8M"]
+# Intel Quick Sync 硬體編碼參數（位元率與 NVENC 相同）
+QSV_VIDEO_ARGS = ["-c:v", "h264_qsv", "-preset", "medium", "-b:v", "8M"]
+# 取樣間隔超過此秒數才以 seek 跳到下一個取樣點，較短時往下解碼比跳回關鍵影格快
+_SEEK_MIN_GAP = 5.0
+# ffmpeg 失敗時記錄的 stderr 長度上限（損毀影片可能輸出數百 KB 的解碼錯誤）
+_STDERR_TAIL_BYTES = 4096
+
+
+def get_ffmpeg_binary():
+    """
+    取得 ffmpeg 執行檔路徑
+
+    Returns:
+        str or None: ffmpeg 路徑，找不到時回傳 None
+    """
+    if HAS_IMAGEIO_FFMPEG:
+        try:
+            return imageio_ffmpeg.get_ffmpeg_exe()
+        except Exception:
+            pass
+    return shutil.which("ffmpeg")
+
+
+@lru_cache(maxsize=8)
+def has_encoder(name, ffmpeg=None):
+    """
+    檢查 ffmpeg 是否支援指定的編碼器（例如 h264_nvenc）
+
+    只代表 ffmpeg 編譯時包含該編碼器，實際是否有 GPU 仍需執行時確認
+    """
+    ffmpeg = ffmpeg or get_ffmpeg_binary()
+    if not ffmpeg:
+        return False
+    try:
+        result = subprocess.run(
+            [ffmpeg, "-hide_banner", "-encoders"],
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, timeout=30
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return False
+    return re.search(rf"^\s*\S+\s+{re.escape(name)}\s", result.stdout.decode("utf-8", errors="replace"),
+                     re.MULTILINE) is not None
+
+
+@lru_cache(maxsize=8)
+def can_hw_encode(name, ffmpeg=None):
+    """
+    以 1 幀測試編碼確認硬體編碼器實際可用
+
+    靜態編譯的 ffmpeg 通常同時包含 NVENC 與 QSV，has_encoder 無法判斷是否有對應的 GPU；
+    測試只需啟動一次 ffmpeg，結果會快取
+    """
+    ffmpeg = ffmpeg or get_ffmpeg_binary()
+    if not ffmpeg or not has_encoder(name, ffmpeg):
+        return False
+    try:
+        result = subprocess.run(
+            [ffmpeg, "-hide_banner", "-loglevel", "error", "-f", "lavfi",
+             "-i", "color=c=black:s=256x256:d=0.1", "-frames:v", "1", "-c:v", name, "-f", "null", "-"],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=30
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return False
+    return result.returncode == 0
+
+
+def _probe_with_pyav(file_path):
+    """以 PyAV 讀取影片資訊，欄位格式與 ffmpeg 輸出解析結果一致"""
+    import av
+
+    with av.open(file_path) as container:
+        if not container.streams.video:
+            return None
+        video = container.streams.video[0].codec_context
+        rate = container.streams.video[0].average_rate
+        info = {
+            "video_codec": video.name,
+            "pix_fmt": video.pix_fmt,
+            "width": video.width,
+            "height": video.height,
+            "fps": f"{float(rate):g}" if rate else None,
+            "audio_codec": None,
+            "sample_rate": None,
+            "channels": None,
+            "duration": container.duration / av.time_base if container.duration else 0.0,
+        }
+        if container.streams.audio:
+            audio = container.streams.audio[0].codec_context
+            info.update(audio_codec=audio.name, sample_rate=str(audio.sample_rate),
+                        channels=audio.layout.name)
+        return info
+
+
+def probe_video_info(file_path, ffmpeg=None):
+    """
+    讀取影片的串流格式與長度（只解析檔頭，不解碼畫面）
+
+    同一次合併會多次查詢（格式檢查、進度總長度、濾鏡參數），
+    結果依 (路徑, 修改時間, 大小) 快取，每個檔案只實際讀取一次
+
+    Args:
+        file_path: 影片路徑
+        ffmpeg: ffmpeg 路徑，預設自動尋找
+
+    Returns:
+        dict or None: video_codec、pix_fmt、width、height、fps、
+                      audio_codec、sample_rate、channels、duration（秒）；
+                      無法解析時回傳 None
+    """
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+    info = _probe_video_info_cached(file_path, stat.st_mtime_ns, stat.st_size, ffmpeg)
+    return dict(info) if info else None
+
+
+@lru_cache(maxsize=256)
+def _probe_video_info_cached(file_path, mtime_ns, size, ffmpeg):
+    """probe_video_info 的實作，mtime_ns 與 size 只作為快取鍵"""
+    if HAS_PYAV:
+        try:
+            return _probe_with_pyav(file_path)
+        except Exception:
+            pass
+
+    ffmpeg = ffmpeg or get_ffmpeg_binary()
+    if not ffmpeg:
+        return None
+
+    try:
+        result = subprocess.run(
+            [ffmpeg, "-hide_banner", "-i", file_path],
+            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, timeout=30
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+
+    output = result.stderr.decode("utf-8", errors="replace")
+    info = {"audio_codec": None, "sample_rate": None, "channels": None, "duration": 0.0}
+    for line in output.splitlines():
+        if "video_codec" not in info:
+            match = _VIDEO_STREAM_RE.search(line)
+            if match:
+                resolution = _RESOLUTION_RE.search(line)
+                fps = _FPS_RE.search(line)
+                if not resolution:
+                    return None
+                info.update(video_codec=match.group(1), pix_fmt=match.group(2),
+                            width=int(resolution.group(1)), height=int(resolution.group(2)),
+                            fps=fps.group(1) if fps else None)
+                continue
+        if info["audio_codec"] is None:
+            match = _AUDIO_STREAM_RE.search(line)
+            if match:
+                info.update(audio_codec=match.group(1), sample_rate=match.group(2), channels=match.group(3))
+                continue
+        match = _DURATION_RE.search(line)
+        if match:
+            hours, minutes, seconds = match.groups()
+            info["duration"] = int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+
+    if "video_codec" not in info:
+        return None
+    return info
+
+
+def _stream_signature(info):
+    """串接時必須一致的串流格式欄位"""
+    return (info["video_codec"], info["pix_fmt"], info["width"], info["height"], info["fps"],
+            info["audio_codec"], info["sample_rate"], info["channels"])
+
+
+def probe_stream_signature(file_path, ffmpeg=None):
+    """
+    讀取影片的串流格式（只解析檔頭，不解碼畫面）
+
+    Returns:
+        tuple or None: (視訊編碼, 像素格式, 寬, 高, fps, 音訊編碼, 取樣率, 聲道)，
+                       無法解析時回傳 None
+    """
+    info = probe_video_info(file_path, ffmpeg)
+    return _stream_signature(info) if info else None
+
+
+def can_stream_concat(files, ffmpeg=None):
+    """
+    判斷多個影片能否以 concat demuxer 直接串接（不重新編碼）
+
+    所有影片的容器、編碼、解析度、像素格式、fps 與音訊格式都必須一致
+
+    Args:
+        files: 影片路徑列表
+        ffmpeg: ffmpeg 路徑，預設自動尋找
+
+    Returns:
+        bool: 是否可直接串接
+    """
+    if len(files) < 2:
+        return False
+
+    extensions = {os.path.splitext(f)[1].lower() for f in files}
+    if len(extensions) != 1:
+        return False
+
+    ffmpeg = ffmpeg or get_ffmpeg_binary()
+    if not ffmpeg:
+        return False
+
+    first = probe_stream_signature(files[0], ffmpeg)
+    if first is None:
+        return False
+    return all(probe_stream_signature(f, ffmpeg) == first for f in files[1:])
+
+
+def _write_concat_list(files):
+    """建立 concat demuxer 使用的清單檔，回傳路徑"""
+    fd, list_path = tempfile.mkstemp(suffix=".txt", prefix="concat_")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        for file in files:
+            # concat 清單以單引號包住路徑，路徑內的單引號需跳脫
+            escaped = os.path.abspath(file).replace("\\", "/").replace("'", "'\\''")
+            f.write(f"file '{escaped}'\n")
+    return list_path
+
+
+def run_ffmpeg(args, is_cancelled=None, on_progress=None, total_duration=0, ffmpeg=None):
+    """
+    執行 ffmpeg 並由 -progress 輸出回報進度
+
+    Args:
+        args: ffmpeg 參數（不含執行檔本身）
+        is_cancelled: 回傳是否取消的函數，取消時終止 ffmpeg
+        on_progress: 進度回呼，參數為 0~1 的比例
+        total_duration: 輸出總長度（秒），用於換算進度
+        ffmpeg: ffmpeg 路徑，預設自動尋找
+
+    Returns:
+        bool: 是否成功（取消或失敗都回傳 False）
+    """
+    ffmpeg = ffmpeg or get_ffmpeg_binary()
+    if not ffmpeg:
+        return False
+
+    # stderr 寫入暫存檔而非管線：損毀的影片會輸出大量解碼錯誤，管線緩衝區填滿後
+    # ffmpeg 會卡在寫入 stderr，這裡的 stdout 迴圈也就永遠等不到下一行（也無法取消）
+    with tempfile.TemporaryFile() as stderr_file:
+        try:
+            process = subprocess.Popen(
+                [ffmpeg, "-y", "-hide_banner", "-loglevel", "error", "-nostats",
+                 "-progress", "pipe:1"] + list(args),
+                stdout=subprocess.PIPE, stderr=stderr_file
+            )
+        except OSError as e:
+            logger.warning("無法執行 ffmpeg：%s", e)
+            return False
+
+        with process.stdout:
+            # ffmpeg 約每 0.5 秒輸出一段 key=value 進度，逐行讀取時一併檢查取消
+            for raw in process.stdout:
+                if is_cancelled and is_cancelled():
+                    process.terminate()
+                    process.wait()
+                    return False
+                key, _, value = raw.decode("ascii", errors="replace").strip().partition("=")
+                if key == "out_time_us" and on_progress and total_duration > 0 and value.isdigit():
+                    on_progress(min(int(value) / 1_000_000 / total_duration, 1.0))
+
+        process.wait()
+        if is_cancelled and is_cancelled():
+            return False
+        if process.returncode != 0:
+            logger.warning("ffmpeg 執行失敗：%s", _read_stderr_tail(stderr_file))
+            return False
+        return True
+
+
+def _read_stderr_tail(stderr_file, limit=_STDERR_TAIL_BYTES):
+    """讀回寫入暫存檔的 ffmpeg stderr，只保留最後 limit 位元組（錯誤原因通常在最後）"""
+    size = stderr_file.seek(0, os.SEEK_END)
+    stderr_file.seek(max(0, size - limit))
+    return stderr_file.read().decode("utf-8", errors="replace").strip()
+
+
+def _frame_converter(width):
+    """
+    建立將 PyAV 影格轉為 RGB PIL 圖片的函式，依 width 等比例縮放並套用顯示旋轉
+
+    同一串流的影格尺寸與旋轉角度相同，縮放後尺寸只在第一張影格（或解析度改變時）計算一次
+    """
+    cached = {}  # (寬, 高) -> (reformat 尺寸或 None, 旋轉角度)
+
+    def convert(frame):
+        key = (frame.width, frame.height)
+        if key not in cached:
+            cached.clear()
+            rotation = getattr(frame, "rotation", 0)
+            size = None
+            if width and width > 0:
+                # 以 swscale 在轉為 RGB 的同時縮放（與 ffmpeg 路徑相同的 Lanczos），
+                # 不必先產生原尺寸的 RGB 圖片；旋轉 90 度時寬高對調
+                quarter_turn = rotation % 180 == 90
+                shown_w, shown_h = key[::-1] if quarter_turn else key
+                size = (int(width), max(1, round(width * shown_h / shown_w)))
+                if quarter_turn:
+                    size = size[::-1]
+            cached[key] = (size, rotation)
+        size, rotation = cached[key]
+
+        if size:
+            frame = frame.reformat(width=size[0], height=size[1], format="rgb24", interpolation="LANCZOS")
+        img = frame.to_image()
+        if rotation:
+            # 與 ffmpeg 自動旋轉的結果一致（rotation 為逆時針角度）
+            img = img.rotate(rotation, expand=True)
+        return img
+
+    return convert
+
+
+def _iter_sampled_frames_pyav(container, interval, width):
+    """iter_sampled_frames 的 PyAV 實作：在行程內解碼，取樣點相距較遠時直接跳到關鍵影格"""
+    stream = container.streams.video[0]
+    stream.thread_type = "AUTO"
+    offset = float(stream.start_time * stream.time_base) if stream.start_time else 0.0
+
+    to_image = _frame_converter(width)
+    frames = container.decode(stream)
+    target = 0.0
+    position = None  # 上一個取出影格的時間（秒）
+    while True:
+        # 間隔短時繼續往下解碼即可；間隔長時跳過中間影格，只解碼取樣點所在的 GOP
+        if position is not None and target - position > _SEEK_MIN_GAP:
+            container.seek(int((target + offset) / stream.time_base), stream=stream)
+            frames = container.decode(stream)
+        frame = next((f for f in frames if f.time is not None and f.time - offset >= target), None)
+        if frame is None:
+            return
+        position = frame.time - offset
+
+        yield to_image(frame)
+        target += interval
+
+
+def iter_sampled_frames(video_path, interval, width=0, ffmpeg=None):
+    """
+    每隔 interval 秒取一幀，依序產出 PIL 圖片
+
+    取樣點為 0、interval、2×interval…秒，每個取樣點取第一個不早於該時間的影格。
+    取樣間隔較長且已安裝 PyAV 時在行程內解碼，以 seek 跳過中間影格；
+    否則以單一 ffmpeg 行程解碼一次，縮放也交由 ffmpeg 以 Lanczos 完成，
+    每幀以 PPM 輸出，檔頭帶有實際尺寸，旋轉過的影片也能正確讀取。
+    提前結束迭代（例如使用者取消）時會關閉影片或終止 ffmpeg
+
+    Args:
+        video_path: 影片路徑
+        interval: 取樣間隔（秒）
+        width: 輸出寬度，高度依比例計算；0 表示維持原尺寸
+        ffmpeg: ffmpeg 路徑，預設自動尋找
+
+    Yields:
+        PIL.Image: RGB 影格
+
+    Raises:
+        RuntimeError: 找不到 ffmpeg 或 ffmpeg 執行失敗
+    """
+    ffmpeg = ffmpeg or get_ffmpeg_binary()
+    # 每幀都要解碼時 ffmpeg 較 PyAV 快，只有能以 seek 跳過影格時才改用 PyAV
+    if HAS_PYAV and (interval > _SEEK_MIN_GAP or not ffmpeg):
+        import av
+
+        try:
+            container = av.open(video_path)
+        except Exception:
+            container = None
+        if container is not None:
+            with container:
+                if container.streams.video:
+                    yield from _iter_sampled_frames_pyav(container, interval, width)
+                    return
+
+    if not ffmpeg:
+        raise RuntimeError("找不到 ffmpeg")
+
+    filters = f"select='gte(t,selected_n*{interval:g})'"
+    if width and width > 0:
+        filters += f",scale={int(width)}:-1:flags=lanczos"
+    yield from _iter_ppm_frames(["-i", video_path, "-vf", filters, "-vsync", "vfr"], ffmpeg)
+
+
+def _iter_ppm_frames(input_args, ffmpeg):
+    """執行 ffmpeg 將影格以 PPM 串流輸出並逐張讀回，檔頭帶有實際尺寸，旋轉過的影片也能正確讀取"""
+    # stderr 同 run_ffmpeg 寫入暫存檔，避免損毀影片的大量解碼錯誤塞滿管線使 ffmpeg 停住
+    stderr_file = tempfile.TemporaryFile()
+    process = subprocess.Popen(
+        [ffmpeg, "-hide_banner", "-loglevel", "error", "-nostats"] + input_args
+        + ["-an", "-f", "image2pipe", "-c:v", "ppm", "-"],
+        stdout=subprocess.PIPE, stderr=stderr_file
+    )
+    try:
+        while True:
+            # ppm 編碼器的檔頭固定為 "P6\n寬 高\n255\n"
+            if not process.stdout.readline():
+                break
+            size = tuple(int(v) for v in process.stdout.readline().split())
+            process.stdout.readline()
+            data = process.stdout.read(size[0] * size[1] * 3)
+            if len(data) < size[0] * size[1] * 3:
+                break
+            yield Image.frombytes("RGB", size, data)
+        process.wait()
+        if process.returncode != 0:
+            raise RuntimeError(_read_stderr_tail(stderr_file) or "ffmpeg 執行失敗")
+    finally:
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+        process.stdout.close()
+        stderr_file.close()
+
+
+def _iter_clip_frames_pyav(container, start, end, fps, width):
+    """iter_clip_frames 的 PyAV 實作：跳到起始點所在的關鍵影格後依序解碼"""
+    stream = container.streams.video[0]
+    stream.thread_type = "AUTO"
+    offset = float(stream.start_time * stream.time_base) if stream.start_time else 0.0
+    if start > 0:
+        container.seek(int((start + offset) / stream.time_base), stream=stream)
+
+    to_image = _frame_converter(width)
+    # 最後一張影格顯示到下一張影格的時間為止，影片結束時以此判斷結尾還要補幾幀
+    frame_time = float(1 / stream.average_rate) if stream.average_rate else 0.0
+    index = 0
+    target = start
+    img = None
+    stop = end
+    for frame in container.decode(stream):
+        if frame.time is None:
+            continue
+        position = frame.time - offset
+        if position < target:
+            continue
+        if position >= end:
+            break
+        img = to_image(frame)
+        stop = min(end, position + frame_time)
+        # 影片 fps 低於輸出 fps 時，同一張影格涵蓋多個輸出時間點
+        while target <= position and target < end:
+            yield img
+            index += 1
+            target = start + index / fps
+    else:
+        end = stop
+
+    # 片段結尾剩下的時間點沿用最後一張影格，幀數與 ffmpeg 的 fps 濾鏡一致
+    while img is not None and target < end:
+        yield img
+        index += 1
+        target = start + index / fps
+
+
+def iter_clip_frames(video_path, start, end, fps, width=0, ffmpeg=None):
+    """
+    依固定 fps 產出影片片段 [start, end) 的影格
+
+    輸出時間點為 start、start + 1/fps…，每個時間點取第一個不早於該時間的影格。
+    已安裝 PyAV 時在行程內解碼，縮放由 swscale 在轉為 RGB 時一併完成（Lanczos），
+    不另外啟動 ffmpeg 行程；否則以單一 ffmpeg 行程的 fps 與 scale 濾鏡處理。
+    提前結束迭代（例如使用者取消）時會關閉影片或終止 ffmpeg
+
+    Args:
+        video_path: 影片路徑
+        start: 起始時間（秒）
+        end: 結束時間（秒）
+        fps: 每秒輸出幀數
+        width: 輸出寬度，高度依比例計算；0 表示維持原尺寸
+        ffmpeg: ffmpeg 路徑，預設自動尋找
+
+    Yields:
+        PIL.Image: RGB 影格
+
+    Raises:
+        RuntimeError: 找不到 ffmpeg 或 ffmpeg 執行失敗
+    """
+    if HAS_PYAV:
+        import av
+
+        try:
+            container = av.open(video_path)
+        except Exception:
+            container = None
+        if container is not None:
+            with container:
+                if container.streams.video:
+                    yield from _iter_clip_frames_pyav(container, start, end, fps, width)
+                    return
+
+    ffmpeg = ffmpeg or get_ffmpeg_binary()
+    if not ffmpeg:
+        raise RuntimeError("找不到 ffmpeg")
+
+    filters = f"fps={fps:g}"
+    if width and width > 0:
+        filters += f",scale={int(width)}:-1:flags=lanczos"
+    yield from _iter_ppm_frames(["-ss", f"{start:.3f}", "-i", video_path, "-t", f"{end - start:.3f}",
+                                 "-vf", filters], ffmpeg)
+
+
+def write_gif_ffmpeg(frames, output_path, duration, loop=0, ffmpeg=None):
+    """
+    以 ffmpeg 的 palettegen/paletteuse 將影格編碼為 GIF
+
+    影格以 rgb24 原始資料逐張送入 ffmpeg，由 palettegen 統計所有影格的顏色
+    建立整個動畫專屬的調色盤，paletteuse 以 Bayer 抖色（Config.GIF_DITHER 關閉時不抖色）
+    量化並只寫出變動的矩形；抖色圖樣固定，相鄰影格相同處不會因誤差擴散而改變，檔案較小。
+    palettegen 的 stats_mode=diff 會漏掉只出現在後續影格的顏色，因此統計全部影格
+
+    Args:
+        frames: 相同尺寸的 RGB 影格（PIL Image 或 (h, w, 3) uint8 陣列）的可迭代物件
+        output_path: 輸出路徑
+        duration: 每幀顯示時間（毫秒）
+        loop: 循環次數，0 為無限循環
+        ffmpeg: ffmpeg 路徑，預設自動尋找
+
+    Returns:
+        bool: 是否成功；找不到 ffmpeg、沒有影格、影格尺寸不一或 ffmpeg 失敗時回傳 False
+    """
+    ffmpeg = ffmpeg or get_ffmpeg_binary()
+    if not ffmpeg:
+        return False
+
+    frames = iter(frames)
+    first = next(frames, None)
+    if first is None:
+        return False
+    shape = np.asarray(first.convert("RGB") if isinstance(first, Image.Image) else first).shape
+
+    dither = "bayer:bayer_scale=5" if Config.GIF_DITHER else "none"
+    # stderr 寫入暫存檔：送影格時不會讀 stderr，錯誤訊息一多就會塞滿管線讓 ffmpeg 停住
+    with tempfile.TemporaryFile() as stderr_file:
+        try:
+            process = subprocess.Popen(
+                [ffmpeg, "-y", "-hide_banner", "-loglevel", "error", "-nostats",
+                 "-f", "rawvideo", "-pix_fmt", "rgb24", "-s", f"{shape[1]}x{shape[0]}",
+                 "-framerate", f"1000/{int(duration)}", "-i", "-",
+                 "-vf", f"split[a][b];[a]palettegen=stats_mode=full[p];"
+                        f"[b][p]paletteuse=dither={dither}:diff_mode=rectangle",
+                 "-loop", str(loop), "-f", "gif", output_path],
+                stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=stderr_file, bufsize=0
+            )
+        except OSError as e:
+            logger.warning("無法執行 ffmpeg：%s", e)
+            return False
+
+        try:
+            for frame in itertools.chain([first], frames):
+                if isinstance(frame, Image.Image):
+                    frame = frame.convert("RGB")
+                data = np.ascontiguousarray(frame, dtype=np.uint8)
+                if data.shape != shape:
+                    logger.warning("GIF 影格尺寸不一致，改用 Pillow 編碼")
+                    process.kill()
+                    return False
+                process.stdin.write(data)
+            process.stdin.close()
+        except BrokenPipeError:
+            pass
+        finally:
+            if not process.stdin.closed:
+                process.stdin.close()
+            process.wait()
+
+        if process.returncode != 0:
+            logger.warning("ffmpeg 編碼 GIF 失敗：%s", _read_stderr_tail(stderr_file))
+            return False
+        return True
+
+
+def concat_videos_copy(files, output_path, is_cancelled=None, on_progress=None, ffmpeg=None):
+    """
+    以 ffmpeg concat demuxer 串接影片，直接複製串流而不重新編碼
+
+    Args:
+        files: 影片路徑列表（依播放順序）
+        output_path: 輸出路徑
+        is_cancelled: 回傳是否取消的函數，取消時終止 ffmpeg
+        on_progress: 進度回呼，參數為 0~1 的比例
+        ffmpeg: ffmpeg 路徑，預設自動尋找
+
+    Returns:
+        bool: 是否成功（取消或失敗都回傳 False）
+    """
+    ffmpeg = ffmpeg or get_ffmpeg_binary()
+    if not ffmpeg:
+        return False
+
+    total_duration = 0
+    if on_progress:
+        infos = [probe_video_info(f, ffmpeg) for f in files]
+        total_duration = sum(info["duration"] for info in infos if info)
+
+    list_path = _write_concat_list(files)
+    try:
+        return run_ffmpeg(
+            ["-f", "concat", "-safe", "0", "-i", list_path, "-c", "copy",
+             "-movflags", "+faststart", output_path],
+            is_cancelled, on_progress, total_duration, ffmpeg
+        )
+    finally:
+        try:
+            os.remove(list_path)
+        except OSError:
+            pass
+
+
+def _concat_reencode(files, output_path, video_args, hwaccel_args, is_cancelled, on_progress, ffmpeg):
+    """
+    重新編碼合併影片
+
+    格式一致時以 concat demuxer 讀取；格式不一致時以 concat 濾鏡將各影片縮放補黑邊至
+    最大尺寸、統一 fps 與音訊格式後合併（與 MoviePy 的 compose 相同），缺少音軌的影片補上靜音
+    """
+    infos = [probe_video_info(f, ffmpeg) for f in files]
+    if not all(infos):
+        return False
+    has_audio = [info["audio_codec"] is not None for info in infos]
+    total_duration = sum(info["duration"] for info in infos)
+    audio_args = ["-c:a", Config.AUDIO_CODEC] if any(has_audio) else ["-an"]
+    output_args = video_args + audio_args + ["-movflags", "+faststart", output_path]
+
+    signatures = {_stream_signature(info) for info in infos}
+    if len(signatures) == 1:
+        list_path = _write_concat_list(files)
+        try:
+            return run_ffmpeg(
+                hwaccel_args + ["-f", "concat", "-safe", "0", "-i", list_path] + output_args,
+                is_cancelled, on_progress, total_duration, ffmpeg
+            )
+        finally:
+            try:
+                os.remove(list_path)
+            except OSError:
+                pass
+
+    # 濾鏡在 CPU 上執行，硬體解碼時不保留 CUDA 輸出格式
+    decode_args = ["-hwaccel", "cuda"] if hwaccel_args else []
+    width = max(info["width"] for info in infos)
+    height = max(info["height"] for info in infos)
+    fps = max(float(info["fps"] or 30) for info in infos)
+    inputs = []
+    for file in files:
+        inputs += decode_args + ["-i", file]
+    input_count = len(files)
+
+    filters = []
+    labels = []
+    for i, info in enumerate(infos):
+        filters.append(
+            f"[{i}:v:0]scale={width}:{height}:force_original_aspect_ratio=decrease,"
+            f"pad={width}:{height}:(ow-iw)/2:(oh-ih)/2,setsar=1,fps={fps},format=yuv420p[v{i}]"
+        )
+        labels.append(f"[v{i}]")
+        if any(has_audio):
+            if has_audio[i]:
+                source = f"[{i}:a:0]"
+            else:
+                # 缺少音軌的影片以 anullsrc 補上等長的靜音
+                inputs += ["-f", "lavfi", "-t", f"{info['duration']:.3f}",
+                           "-i", "anullsrc=r=44100:cl=stereo"]
+                source = f"[{input_count}:a:0]"
+                input_count += 1
+            filters.append(f"{source}aformat=sample_rates=44100:channel_layouts=stereo[a{i}]")
+            labels.append(f"[a{i}]")
+    audio_count = 1 if any(has_audio) else 0
+    outputs = "[v][a]" if audio_count else "[v]"
+    filters.append(f"{''.join(labels)}concat=n={len(files)}:v=1:a={audio_count}{outputs}")
+
+    maps = ["-map", "[v]"] + (["-map", "[a]"] if audio_count else [])
+    return run_ffmpeg(
+        inputs + ["-filter_complex", ";".join(filters)] + maps + output_args,
+        is_cancelled, on_progress, total_duration, ffmpeg
+    )
+
+
+def concat_videos_reencode(files, output_path, is_cancelled=None, on_progress=None, ffmpeg=None):
+    """
+    以 ffmpeg 重新編碼合併影片（CPU 編碼，使用 Config 的編碼器與 preset）
+
+    Args:
+        files: 影片路徑列表（依播放順序）
+        output_path: 輸出路徑
+        is_cancelled: 回傳是否取消的函數，取消時終止 ffmpeg
+        on_progress: 進度回呼，參數為 0~1 的比例
+        ffmpeg: ffmpeg 路徑，預設自動尋找
+
+    Returns:
+        bool: 是否成功
+    """
+    ffmpeg = ffmpeg or get_ffmpeg_binary()
+    if not ffmpeg:
+        return False
+    video_args = ["-c:v", Config.VIDEO_CODEC, "-preset", Config.FFMPEG_PRESET, "-threads", "0"]
+    return _concat_reencode(files, output_path, video_args, [], is_cancelled, on_progress, ffmpeg)
+
+
+def concat_videos_nvenc(files, output_path, is_cancelled=None, on_progress=None, ffmpeg=None):
+    """
+    以 NVIDIA NVENC 硬體編碼合併影片（CUDA 解碼）
+
+    Args:
+        files: 影片路徑列表（依播放順序）
+        output_path: 輸出路徑
+        is_cancelled: 回傳是否取消的函數，取消時終止 ffmpeg
+        on_progress: 進度回呼，參數為 0~1 的比例
+        ffmpeg: ffmpeg 路徑，預設自動尋找
+
+    Returns:
+        bool: 是否成功；NVENC 無法使用或無法解析影片時回傳 False
+    """
+    ffmpeg = ffmpeg or get_ffmpeg_binary()
+    if not ffmpeg or not can_hw_encode("h264_nvenc", ffmpeg):
+        return False
+    return _concat_reencode(files, output_path, NVENC_VIDEO_ARGS,
+                            ["-hwaccel", "cuda", "-hwaccel_output_format", "cuda"],
+                            is_cancelled, on_progress, ffmpeg)
+
+
+def concat_videos_qsv(files, output_path, is_cancelled=None, on_progress=None, ffmpeg=None):
+    """
+    以 Intel Quick Sync 硬體編碼合併影片（CPU 解碼，ffmpeg 自動轉換為 NV12 後上傳）
+
+    Args:
+        files: 影片路徑列表（依播放順序）
+        output_path: 輸出路徑
+        is_cancelled: 回傳是否取消的函數，取消時終止 ffmpeg
+        on_progress: 進度回呼，參數為 0~1 的比例
+        ffmpeg: ffmpeg 路徑，預設自動尋找
+
+    Returns:
+        bool: 是否成功；QSV 無法使用或無法解析影片時回傳 False
+    """
+    ffmpeg = ffmpeg or get_ffmpeg_binary()
+    if not ffmpeg or not can_hw_encode("h264_qsv", ffmpeg):
+        return False
+    return _concat_reencode(files, output_path, QSV_VIDEO_ARGS, [], is_cancelled, on_progress, ffmpeg)
@@ -312,7 +312,7 @@ class WatermarkDialog(QDialog):
         # 轉回 RGB（如果需要）
         if result.mode == 'RGBA':
             rgb_img = Image.new('RGB', result.size, (255, 255, 255))
-            rgb_img.paste(result, mask=result.split()[3])
+            rgb_img.paste(result, mask=result.getchannel('A'))
             return rgb_img
 
         return result
@@ -340,7 +340,7 @@ class WatermarkDialog(QDialog):
         # 調整透明度
         opacity = self.opacity_slider.value() / 100
         if opacity < 1.0:
-            alpha = watermark.split()[3]
+            alpha = watermark.getchannel('A')
             alpha = alpha.point(lambda p: int(p * opacity))
             watermark.putalpha(alpha)
 
@@ -356,7 +356,7 @@ class WatermarkDialog(QDialog):
         # 轉回 RGB
         if img.mode == 'RGBA':
             rgb_img = Image.new('RGB', img.size, (255, 255, 255))
-            rgb_img.paste(img, mask=img.split()[3])
+            rgb_img.paste(img, mask=img.getchannel('A'))
             return rgb_img
 
         return img
@@ -400,8 +400,9 @@ class WatermarkDialog(QDialog):
             progress.setLabelText(f"正在處理: {os.path.basename(file_path)}")
 
             try:
-                # 載入圖片
-                img = Image.open(file_path)
+                # 載入圖片（解碼後即關閉檔案，覆寫原檔時不會仍持有檔案代碼）
+                with Image.open(file_path) as img:
+                    img.load()
 
                 # 套用浮水印
                 if is_text_tab:
@@ -6,8 +6,12 @@ for p in sys.path:
     print(f"  - {p}")
 
 import os
-from moviepy import VideoFileClip, concatenate_videoclips # type: ignore
-from natsort import natsorted # For natural sorting of filenames
+from utils.video_utils import can_stream_concat, concat_videos_copy, concat_videos_reencode
+from natsort import natsort_keygen # For natural sorting of filenames
+
+# 自然排序鍵函數只需建立一次
+_NAT_KEY = natsort_keygen()
+
 def merge_videos_from_folder(folder_path, output_filename, video_extensions=None):
     """
     Merges multiple video files from a specified folder into a single video file.
@@ -38,42 +42,28 @@ def merge_videos_from_folder(folder_path, output_filename, video_extensions=None
         print(f"支援的副檔名為：{', '.join(video_extensions)}")
         return
 
-    # 使用 natsorted 進行自然排序，確保檔案順序符合預期 (例如 video1.mp4, video2.mp4, video10.mp4)
-    video_files = natsorted(video_files)
+    # 自然排序，確保檔案順序符合預期 (例如 video1.mp4, video2.mp4, video10.mp4)
+    video_files.sort(key=_NAT_KEY)
 
     print("將合併以下影片檔案 (依此順序)：")
     for vf in video_files:
         print(f" - {os.path.basename(vf)}")
 
-    clips = []
-    for video_file in video_files:
-        try:
-            clip = VideoFileClip(video_file)
-            clips.append(clip)
-        except Exception as e:
-            print(f"警告：讀取影片 '{video_file}' 時發生錯誤，將跳過此檔案：{e}")
-            # 確保即使發生錯誤，之前成功載入的 clip 也被關閉
-            for loaded_clip in clips:
-                loaded_clip.close() # 釋放資源
-            return # 或者選擇 continue 跳過這個檔案，但要小心 clips 列表
-
-    if not clips:
-        print("沒有任何影片可以成功載入並合併。")
-        return
+    # 所有影片格式一致時直接串接串流，不重新編碼，速度只受磁碟限制且畫質無損
+    if can_stream_concat(video_files):
+        print(f"\n影片格式一致，直接串接（不重新編碼）...")
+        if concat_videos_copy(video_files, output_filename):
+            print(f"\n影片成功合併並儲存為 '{output_filename}'")
+            return
+        print("直接串接失敗，改為重新編碼合併...")
 
-    try:
-        print(f"\n開始合併影片...")
-        final_clip = concatenate_videoclips(clips, method="compose") # "compose" 通常效果較好
-        final_clip.write_videofile(output_filename, codec="libx264", audio_codec="aac")
+    # 格式不一致時交給單一 ffmpeg 行程重新編碼：以 concat 濾鏡統一尺寸、fps 與音訊後合併，
+    # 不再為每個檔案各開一個 MoviePy 片段（各自一個 ffmpeg 讀取行程）再以 compose 合成
+    print(f"\n開始重新編碼合併影片...")
+    if concat_videos_reencode(video_files, output_filename):
         print(f"\n影片成功合併並儲存為 '{output_filename}'")
-    except Exception as e:
-        print(f"合併影片或寫入檔案時發生錯誤：{e}")
-    finally:
-        # 確保所有 clip 都被關閉以釋放資源
-        for clip in clips:
-            clip.close()
-        if 'final_clip' in locals() and final_clip:
-            final_clip.close()
+    else:
+        print("合併影片或寫入檔案時發生錯誤：ffmpeg 無法處理這些影片")
 
 if __name__ == "__main__":
     # --- 使用者設定 ---